@@ -18,20 +18,41 @@ a = Analysis(
         'src.core.audio_recorder',
         'src.core.hotkey_manager',
         'src.core.text_processor',
+        'src.core.chunking',
+        'src.core.dictation_queue',
+        'src.core.dispatcher',
+        'src.core.tracing',
+        'src.core.text_output',
+        'src.core.pipeline',
+        'src.core.dictation_service',
+        'src.core.recording_archive',
+        'src.core.history',
+        'src.core.language_id',
+        'src.core.vocabulary',
         'src.providers',
+        'src.providers.http_client',
+        'src.providers.registry',
         'src.providers.transcription',
         'src.providers.transcription.base',
+        'src.providers.transcription.openai_compat',
         'src.providers.transcription.groq_whisper',
         'src.providers.transcription.openai_whisper',
         'src.providers.transcription.deepgram',
         'src.providers.llm',
         'src.providers.llm.base',
+        'src.providers.llm.alignment',
+        'src.providers.llm.prompts',
         'src.providers.llm.ollama',
+        'src.providers.llm.punct',
+        'src.providers.llm.openai_compat',
         'src.providers.llm.openai_llm',
         'src.providers.llm.groq_llm',
         'src.ui',
         'src.ui.system_tray',
         'src.ui.settings_window',
+        'src.ui.history_window',
+        'src.ui.recording_widget',
+        'src.ui.level_meter',
         # UI libraries
         'pystray',
         'pystray._win32',
@@ -50,6 +71,11 @@ a = Analysis(
         'numpy',
         'numpy.core',
         'numpy.core._multiarray_umath',
+        # Local punctuation model (llm provider "punct")
+        'onnxruntime',
+        'onnxruntime.capi',
+        'onnxruntime.capi._pybind_state',
+        'tokenizers',
         # Input libraries
         'keyboard',
         'keyboard._winreg',
@@ -58,7 +84,6 @@ a = Analysis(
         'pynput.keyboard',
         'pynput.keyboard._win32',
         'pyperclip',
-        'pyautogui',
         # Network
         'requests',
         'urllib3',
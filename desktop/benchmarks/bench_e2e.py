@@ -0,0 +1,267 @@
+"""
+End-to-end benchmark: the tests/fixtures recordings through the full TextProcessor pipeline.
+
+For each fixture recording, transcribes and formats it (no clipboard or
+paste) with the configured providers and reports:
+- WER of the raw transcript and of the formatted text against the
+  reference (both normalized: no punctuation, lowercase)
+- Per-stage latency p50/p95 from the dictation traces (transcription,
+  upload, ttfb, llm...)
+- Bytes sent to the providers per dictation
+
+Results can be saved as a JSON baseline; a later run compared against it
+exits with status 1 if latency or WER regressed beyond the thresholds.
+
+Usage (from desktop/):
+    # Local stand-in APIs (no network, no API keys)
+    python -m benchmarks.bench_e2e --mock --save-baseline benchmarks/baselines/e2e_mock.json
+    python -m benchmarks.bench_e2e --mock --baseline benchmarks/baselines/e2e_mock.json
+
+    # Providers from the app config (or another config file)
+    python -m benchmarks.bench_e2e --repeat 5 --json results.json
+    python -m benchmarks.bench_e2e --config my_config.json --baseline baseline.json --max-latency-regression 0.3
+"""
+import argparse
+import copy
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from benchmarks.fixtures import FIXTURES, load_audio, load_reference, to_raw_transcript
+from src.core.tracing import Trace, summarize, use_trace
+
+# Stages compared against the baseline ('total' is the whole dictation)
+COMPARED_STAGES = ['total', 'transcription', 'llm']
+
+
+def word_errors(reference: str, hypothesis: str) -> tuple:
+    """
+    Word-level edit distance after normalization.
+
+    Returns:
+        (substitutions + deletions + insertions, reference word count)
+    """
+    ref = to_raw_transcript(reference).split()
+    hyp = to_raw_transcript(hypothesis).split()
+
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i] + [0] * len(hyp)
+        for j, hyp_word in enumerate(hyp, 1):
+            current[j] = min(
+                previous[j] + 1,  # Deletion
+                current[j - 1] + 1,  # Insertion
+                previous[j - 1] + (ref_word != hyp_word)  # Substitution / match
+            )
+        previous = current
+    return previous[-1], len(ref)
+
+
+def wer(reference: str, hypothesis: str) -> float:
+    """Word error rate of hypothesis against reference"""
+    errors, words = word_errors(reference, hypothesis)
+    return errors / words if words else float(bool(errors))
+
+
+def mock_config(server, config: dict = None) -> dict:
+    """Config pointing both providers at a MockServer (Groq-compatible endpoints)"""
+    from src.core.config_manager import ConfigManager
+
+    config = copy.deepcopy(config or {})
+    key = ConfigManager.encrypt_api_key('mock')
+    config.setdefault('transcription', {}).update(provider='groq', api_key_encrypted=key, base_url=server.groq_base_url)
+    config.setdefault('llm', {}).update(provider='groq', api_key_encrypted=key, base_url=server.groq_base_url,
+                                        model='llama-3.1-8b-instant')
+    return config
+
+
+def mock_server(latency: float = 0.0, jitter: float = 0.0, seed: int = 0):
+    """MockServer that 'transcribes' each fixture as its reference transcript"""
+    from tests.mock_server import MockServer
+
+    transcripts = {len(load_audio(language)): to_raw_transcript(load_reference(language)) for language in FIXTURES}
+    return MockServer(
+        latency=latency, jitter=jitter, seed=seed,
+        transcript=lambda audio, fields: transcripts.get(len(audio), "")
+    )
+
+
+def run_fixture(processor, language: str, repeat: int = 3) -> dict:
+    """
+    Transcribe and format one fixture `repeat` times.
+
+    Returns:
+        WER, bytes sent, error count and the traces (as dicts) of the runs
+    """
+    audio_data = load_audio(language)
+    reference = load_reference(language)
+    traces, raw_wers, wers, bytes_sent, errors = [], [], [], [], 0
+
+    for _ in range(repeat):
+        trace = Trace(
+            fixture=language,
+            transcription_provider=processor.config.get('transcription', {}).get('provider', ''),
+            llm_provider=processor.config.get('llm', {}).get('provider', '')
+        )
+        with use_trace(trace):
+            try:
+                raw_text = processor.transcribe(audio_data)
+                text = processor.post_process(raw_text)
+            except Exception as e:
+                errors += 1
+                print(f"  {language}: error: {e}", file=sys.stderr)
+                continue
+
+        raw_wers.append(wer(reference, raw_text))
+        wers.append(wer(reference, text))
+        # One ttfb span per HTTP request, carrying the request body size
+        bytes_sent.append(sum(record.get('attrs', {}).get('bytes', 0)
+                              for record in trace.spans if record['name'] == 'ttfb'))
+        traces.append(trace.to_dict())
+
+    return {
+        'runs': len(traces),
+        'errors': errors,
+        'raw_wer': statistics.mean(raw_wers) if raw_wers else None,
+        'wer': statistics.mean(wers) if wers else None,
+        'bytes_sent': statistics.mean(bytes_sent) if bytes_sent else None,
+        'traces': traces,
+    }
+
+
+def evaluate(processor, languages: list = None, repeat: int = 3, warm_up: bool = True) -> dict:
+    """
+    Run every fixture through the processor.
+
+    Returns:
+        {'fixtures': {language: {runs, errors, raw_wer, wer, bytes_sent, stages}}}
+        where stages maps stage name to {'count', 'p50', 'p95', 'p99'} in ms
+    """
+    if warm_up:
+        processor.llm_provider.warm_up()
+
+    results = {'time': time.time(), 'repeat': repeat, 'fixtures': {}}
+    for language in languages or FIXTURES:
+        result = run_fixture(processor, language, repeat)
+        stages = summarize(result.pop('traces'), by='fixture').get(language, {})
+        result['stages'] = stages
+        results['fixtures'][language] = result
+    return results
+
+
+def compare(results: dict, baseline: dict, max_latency_regression: float = 0.2, min_latency_ms: float = 50,
+            max_wer_increase: float = 0.02) -> list:
+    """
+    Regressions of results against a baseline.
+
+    Args:
+        results: Output of evaluate
+        baseline: Output of an earlier evaluate
+        max_latency_regression: Allowed relative p50 increase (0.2 = +20%)
+        min_latency_ms: Allowed absolute p50 increase, so tiny stages don't fail on noise
+        max_wer_increase: Allowed absolute WER increase
+
+    Returns:
+        Failure messages (empty if nothing regressed)
+    """
+    failures = []
+    for language, result in results['fixtures'].items():
+        base = baseline.get('fixtures', {}).get(language)
+        if not base:
+            continue
+        if result['errors'] > base.get('errors', 0):
+            failures.append(f"{language}: {result['errors']} errors (baseline {base.get('errors', 0)})")
+
+        for metric in ('raw_wer', 'wer'):
+            if result[metric] is None or base.get(metric) is None:
+                continue
+            if result[metric] > base[metric] + max_wer_increase:
+                failures.append(f"{language}: {metric} {result[metric]:.3f} (baseline {base[metric]:.3f})")
+
+        for stage in COMPARED_STAGES:
+            current = result['stages'].get(stage, {}).get('p50')
+            previous = base.get('stages', {}).get(stage, {}).get('p50')
+            if current is None or previous is None:
+                continue
+            limit = max(previous * (1 + max_latency_regression), previous + min_latency_ms)
+            if current > limit:
+                failures.append(f"{language}: {stage} p50 {current:.0f} ms (baseline {previous:.0f} ms, limit {limit:.0f} ms)")
+    return failures
+
+
+def print_results(results: dict):
+    for language, result in results['fixtures'].items():
+        print(f"\n{language}: {result['runs']} runs, {result['errors']} errors")
+        if not result['runs']:
+            continue
+        print(f"  WER raw {result['raw_wer']:.3f}, formatted {result['wer']:.3f}, "
+              f"{result['bytes_sent'] / 1024:.1f} KiB sent per dictation")
+        print(f"  {'stage':<18} {'p50 ms':>9} {'p95 ms':>9}")
+        for name, stats in sorted(result['stages'].items(), key=lambda item: -item[1]['p50']):
+            print(f"  {name:<18} {stats['p50']:>9.1f} {stats['p95']:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end benchmark on the fixture recordings")
+    parser.add_argument('--config', help="Config file (default: the app config)")
+    parser.add_argument('--mock', action='store_true', help="Use local stand-in APIs instead of real providers")
+    parser.add_argument('--mock-latency', type=float, default=0.05, help="Stand-in API latency in seconds")
+    parser.add_argument('--languages', nargs='+', help="Fixture languages (default: all)")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per fixture")
+    parser.add_argument('--json', help="Write results to this JSON file")
+    parser.add_argument('--save-baseline', help="Write results as a baseline to this JSON file")
+    parser.add_argument('--baseline', help="Compare against this baseline and fail on regressions")
+    parser.add_argument('--max-latency-regression', type=float, default=0.2,
+                        help="Allowed relative p50 latency increase (default 0.2 = +20%%)")
+    parser.add_argument('--min-latency-ms', type=float, default=50, help="Allowed absolute p50 increase in ms")
+    parser.add_argument('--max-wer-increase', type=float, default=0.02, help="Allowed absolute WER increase")
+    args = parser.parse_args()
+
+    from src.core.config_manager import ConfigManager
+    from src.core.text_processor import TextProcessor
+
+    if args.config:
+        with open(args.config, encoding='utf-8') as f:
+            config = json.load(f)
+    else:
+        config = ConfigManager().load()
+
+    server = None
+    if args.mock:
+        server = mock_server(latency=args.mock_latency).start()
+        config = mock_config(server, config)
+
+    try:
+        processor = TextProcessor(config)
+        results = evaluate(processor, args.languages, args.repeat)
+    finally:
+        if server:
+            server.stop()
+    results['providers'] = {
+        'transcription': config.get('transcription', {}).get('provider'),
+        'llm': f"{config.get('llm', {}).get('provider')}:{config.get('llm', {}).get('model')}",
+        'mock': args.mock,
+    }
+    print_results(results)
+
+    for path in (args.json, args.save_baseline):
+        if path:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2)
+
+    failures = []
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        failures = compare(results, baseline, args.max_latency_regression, args.min_latency_ms, args.max_wer_increase)
+        print(f"\nCompared with {args.baseline}: {len(failures)} regressions")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Language identification benchmark on the tests/fixtures transcripts.
+
+Each reference sentence is turned into utterances of the first N words
+(short takes are where Whisper's own detection fails) and dictated in
+sessions of one language, then the other (a language switch). Reports:
+- Text detection accuracy per utterance length (prompts.detect_language),
+  with 'unknown' when the text has no decisive function words
+- Pinned-language accuracy: the language LanguageIdentifier requests for
+  each take from the previous ones, and how often it abstains ('auto')
+- Latency per call of the detection and of the per-take decision
+
+Usage (from desktop/):
+    python -m benchmarks.bench_language
+    python -m benchmarks.bench_language --words 2 3 5 --json language.json
+"""
+import argparse
+import json
+from typing import Optional
+
+from benchmarks.fixtures import FIXTURES, load_audio, sentence_samples
+from benchmarks.microbench import measure
+from src.core.language_id import LanguageIdentifier
+from src.providers.llm.prompts import detect_language
+
+DEFAULT_WORDS = [2, 3, 5, 0]  # 0 = whole sentence
+
+
+def utterances(max_words: int) -> list:
+    """(language, text) for every fixture sentence cut to max_words words (0 = whole)"""
+    result = []
+    for sample in sentence_samples():
+        words = sample['raw'].split()
+        result.append((sample['language'], ' '.join(words[:max_words] if max_words else words)))
+    return result
+
+
+def detection_accuracy(samples: list) -> dict:
+    """Share of texts detected correctly, wrongly, or not at all"""
+    correct = wrong = unknown = 0
+    for language, text in samples:
+        detected = detect_language(text)
+        if detected is None:
+            unknown += 1
+        elif detected == language:
+            correct += 1
+        else:
+            wrong += 1
+    total = len(samples) or 1
+    return {'correct': correct / total, 'wrong': wrong / total, 'unknown': unknown / total}
+
+
+def session_accuracy(samples: list, identifier: Optional[LanguageIdentifier] = None) -> dict:
+    """
+    Dictate samples in order and score the language requested for each take.
+
+    Every take is treated as short (pinnable); its transcript is then
+    observed as if transcribed correctly.
+
+    Returns:
+        {'pinned_correct', 'pinned_wrong', 'auto'} as shares of the takes
+    """
+    identifier = identifier or LanguageIdentifier(max_pin_seconds=0)
+    correct = wrong = auto = 0
+    for language, text in samples:
+        requested = identifier.choose(b'', 'auto')
+        if requested == 'auto':
+            auto += 1
+        elif requested == language:
+            correct += 1
+        else:
+            wrong += 1
+        identifier.observe(text, pinned=None if requested == 'auto' else requested)
+    total = len(samples) or 1
+    return {'pinned_correct': correct / total, 'pinned_wrong': wrong / total, 'auto': auto / total}
+
+
+def sessions(samples: list, takes: int = 6) -> list:
+    """Repeat each language's samples to `takes` takes, languages one after the other"""
+    ordered = []
+    for language in FIXTURES:
+        own = [sample for sample in samples if sample[0] == language]
+        ordered.extend(own[n % len(own)] for n in range(takes))
+    return ordered
+
+
+def evaluate(words: list = DEFAULT_WORDS, repeat: int = 5, min_time: float = 0.1) -> dict:
+    """
+    Run the benchmark.
+
+    Args:
+        words: Utterance lengths in words (0 = whole sentence)
+        repeat: Timing rounds for the latency measurements
+        min_time: Minimum seconds per timing round
+
+    Returns:
+        {'lengths': {N: {detection..., session...}}, 'latency': {name: ns_per_op}}
+    """
+    results = {'lengths': {}, 'latency': {}}
+    for max_words in words:
+        samples = utterances(max_words)
+        results['lengths'][max_words] = {
+            **detection_accuracy(samples),
+            **session_accuracy(sessions(samples))
+        }
+
+    sentence = utterances(0)[0][1]
+    audio = load_audio('it')
+    identifier = LanguageIdentifier()
+    identifier.seed([sentence] * identifier.window)
+    results['latency'] = {
+        'detect_language': measure(lambda: detect_language(sentence), repeat=repeat, min_time=min_time)['ns_per_op'],
+        'choose (WAV header)': measure(lambda: identifier.choose(audio), repeat=repeat, min_time=min_time)['ns_per_op'],
+    }
+    return results
+
+
+def print_results(results: dict):
+    print(f"{'words':>6} {'detected':>9} {'wrong':>7} {'unknown':>8} {'pinned':>8} {'pin wrong':>10} {'auto':>6}")
+    for max_words, result in results['lengths'].items():
+        label = max_words or 'all'
+        print(f"{label:>6} {result['correct']:>9.0%} {result['wrong']:>7.0%} {result['unknown']:>8.0%} "
+              f"{result['pinned_correct']:>8.0%} {result['pinned_wrong']:>10.0%} {result['auto']:>6.0%}")
+    print()
+    for name, ns in results['latency'].items():
+        print(f"{name:<22} {ns / 1000:>8.1f} us/op")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--words', type=int, nargs='+', default=DEFAULT_WORDS,
+                        help="Utterance lengths in words (0 = whole sentence)")
+    parser.add_argument('--repeat', type=int, default=5, help="Timing rounds for the latency measurements")
+    parser.add_argument('--json', help="Write the results to this file")
+    args = parser.parse_args()
+
+    results = evaluate(args.words, repeat=args.repeat)
+    print_results(results)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+"""
+Compare system prompt variants on the fixture transcripts.
+
+Reports per variant: system prompt tokens, prompt tokens per request,
+LLM latency and validation pass rate.
+
+Usage (from desktop/):
+    python -m benchmarks.bench_prompts --tokens-only
+    python -m benchmarks.bench_prompts --provider ollama --model llama3.2:3b
+    python -m benchmarks.bench_prompts --provider groq --api-key-env GROQ_API_KEY
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+from benchmarks.fixtures import sentence_samples
+from src.providers.llm import OllamaProvider, OpenAILLMProvider, GroqLLMProvider, OpenAICompatibleLLMProvider
+from src.providers.llm.prompts import PROMPT_VARIANTS, count_tokens, detect_language, get_system_prompt
+
+
+def create_provider(args, variant: str):
+    """Create the LLM provider under test for a prompt variant"""
+    api_key = os.environ.get(args.api_key_env, '') if args.api_key_env else ''
+    options = {'temperature': 0.3, 'max_tokens': 500, 'prompt_variant': variant}
+
+    if args.provider == 'ollama':
+        return OllamaProvider(model=args.model or 'llama3.2:3b', ollama_url=args.url or 'http://localhost:11434', **options)
+    elif args.provider == 'openai':
+        return OpenAILLMProvider(api_key=api_key, model=args.model or 'gpt-4o-mini', **options)
+    elif args.provider == 'groq':
+        return GroqLLMProvider(api_key=api_key, model=args.model or 'llama-3.1-8b-instant', **options)
+    elif args.provider == 'openai_compatible':
+        return OpenAICompatibleLLMProvider(api_key=api_key, model=args.model, base_url=args.url, **options)
+    raise ValueError(f"Unknown LLM provider: {args.provider}")
+
+
+def measure_tokens(samples: list) -> dict:
+    """Estimated prompt tokens per variant, without calling any LLM"""
+    results = {}
+    for variant in PROMPT_VARIANTS:
+        prompt_tokens = [
+            count_tokens(get_system_prompt(variant, detect_language(sample['raw']))) + count_tokens(sample['raw'])
+            for sample in samples
+        ]
+        results[variant] = {
+            'system_tokens': {language: count_tokens(get_system_prompt(variant, language)) for language in ('it', 'en')},
+            'mean_prompt_tokens': statistics.mean(prompt_tokens),
+        }
+    return results
+
+
+def measure_variant(provider, samples: list, repeat: int) -> dict:
+    """Run every sample through the provider and collect latency and validation results"""
+    validations = []
+    original_validate = provider.validate_output
+
+    def recording_validate(input_text, output_text):
+        result = original_validate(input_text, output_text)
+        validations.append(result[0])
+        return result
+
+    provider.validate_output = recording_validate
+    provider.warm_up()
+
+    latencies = []
+    prompt_tokens = []
+    errors = 0
+    for _ in range(repeat):
+        for sample in samples:
+            start = time.perf_counter()
+            try:
+                provider.process(sample['raw'])
+            except Exception as e:
+                errors += 1
+                print(f"  error: {e}", file=sys.stderr)
+                continue
+            latencies.append(time.perf_counter() - start)
+            prompt_tokens.append(provider.last_usage.get('prompt_tokens', 0))
+
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'latency_mean_s': statistics.mean(latencies) if latencies else None,
+        'latency_p50_s': statistics.median(latencies) if latencies else None,
+        'latency_max_s': max(latencies) if latencies else None,
+        'mean_prompt_tokens': statistics.mean(prompt_tokens) if prompt_tokens else None,
+        'validation_pass_rate': sum(validations) / len(validations) if validations else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark system prompt variants")
+    parser.add_argument('--provider', choices=['ollama', 'openai', 'groq', 'openai_compatible'], default='ollama')
+    parser.add_argument('--model', help="Model name (provider default if omitted)")
+    parser.add_argument('--url', help="Ollama URL or OpenAI-compatible base URL")
+    parser.add_argument('--api-key-env', help="Environment variable holding the API key")
+    parser.add_argument('--variants', nargs='+', default=list(PROMPT_VARIANTS), choices=list(PROMPT_VARIANTS))
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--tokens-only', action='store_true', help="Only report token counts (no LLM calls)")
+    parser.add_argument('--json', help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    samples = sentence_samples()
+    results = {'samples': len(samples), 'tokens': measure_tokens(samples), 'runs': {}}
+
+    print(f"{'variant':<10} {'sys it':>7} {'sys en':>7} {'prompt':>7}")
+    for variant, tokens in results['tokens'].items():
+        print(f"{variant:<10} {tokens['system_tokens']['it']:>7} {tokens['system_tokens']['en']:>7} "
+              f"{tokens['mean_prompt_tokens']:>7.0f}")
+
+    if not args.tokens_only:
+        print(f"\n{args.provider} ({len(samples)} samples x {args.repeat})")
+        print(f"{'variant':<10} {'mean s':>7} {'p50 s':>7} {'max s':>7} {'tokens':>7} {'valid':>6} {'errors':>6}")
+        for variant in args.variants:
+            run = measure_variant(create_provider(args, variant), samples, args.repeat)
+            results['runs'][variant] = run
+            if run['requests']:
+                print(f"{variant:<10} {run['latency_mean_s']:>7.2f} {run['latency_p50_s']:>7.2f} "
+                      f"{run['latency_max_s']:>7.2f} {run['mean_prompt_tokens']:>7.0f} "
+                      f"{run['validation_pass_rate']:>6.0%} {run['errors']:>6}")
+            else:
+                print(f"{variant:<10} {'-':>7} {'-':>7} {'-':>7} {'-':>7} {'-':>6} {run['errors']:>6}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
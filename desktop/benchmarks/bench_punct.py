@@ -0,0 +1,124 @@
+"""
+Compare the local punctuation model with an LLM provider on the fixture transcripts.
+
+Reports per provider: latency, punctuation precision/recall/F1 against the
+reference transcripts, and capitalization accuracy.
+
+Usage (from desktop/):
+    python -m benchmarks.bench_punct --model-path models/punct
+    python -m benchmarks.bench_punct --model-path models/punct --ollama-model llama3.2:3b
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+from benchmarks.fixtures import sentence_samples
+from src.providers.llm import OllamaProvider, PunctuationProvider
+from src.providers.llm.alignment import align_words, word_key
+
+_MARKS = '.,;:!?'
+
+
+def _trailing_mark(word: str) -> str:
+    """Punctuation after a word ('' if none); '!' counts as '.'"""
+    stripped = word.rstrip('"»)\'')
+    mark = stripped[-1:] if stripped[-1:] in _MARKS else ''
+    return '.' if mark == '!' else mark
+
+
+def score(reference: str, output: str) -> dict:
+    """
+    Punctuation and casing agreement between a reference and a formatted text.
+
+    Words are aligned first, so a response that rewords some words is scored
+    only on the words it kept.
+    """
+    ref_words, out_words = reference.split(), output.split()
+    pairs = align_words([word_key(w) for w in ref_words], [word_key(w) for w in out_words])
+
+    true_pos = false_pos = false_neg = case_ok = matched = 0
+    for i, j in pairs:
+        if i is None or j is None or word_key(ref_words[i]) != word_key(out_words[j]):
+            continue
+        matched += 1
+        expected, predicted = _trailing_mark(ref_words[i]), _trailing_mark(out_words[j])
+        if expected and expected == predicted:
+            true_pos += 1
+        else:
+            false_pos += bool(predicted)
+            false_neg += bool(expected)
+        case_ok += ref_words[i].lstrip('"«(\'')[:1].isupper() == out_words[j].lstrip('"«(\'')[:1].isupper()
+
+    return {'tp': true_pos, 'fp': false_pos, 'fn': false_neg, 'case_ok': case_ok, 'matched': matched}
+
+
+def run(provider, samples: list) -> dict:
+    """Format every sample and aggregate latency and quality"""
+    provider.warm_up()
+    latencies, totals, errors = [], {'tp': 0, 'fp': 0, 'fn': 0, 'case_ok': 0, 'matched': 0}, 0
+
+    for sample in samples:
+        start = time.perf_counter()
+        try:
+            output = provider.process(sample['raw'])
+        except Exception as e:
+            errors += 1
+            print(f"  error: {e}", file=sys.stderr)
+            continue
+        latencies.append(time.perf_counter() - start)
+        for name, value in score(sample['reference'], output).items():
+            totals[name] += value
+
+    precision = totals['tp'] / (totals['tp'] + totals['fp']) if totals['tp'] + totals['fp'] else 0.0
+    recall = totals['tp'] / (totals['tp'] + totals['fn']) if totals['tp'] + totals['fn'] else 0.0
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'latency_mean_s': statistics.mean(latencies) if latencies else None,
+        'latency_p50_s': statistics.median(latencies) if latencies else None,
+        'latency_max_s': max(latencies) if latencies else None,
+        'precision': precision,
+        'recall': recall,
+        'f1': 2 * precision * recall / (precision + recall) if precision + recall else 0.0,
+        'case_accuracy': totals['case_ok'] / totals['matched'] if totals['matched'] else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the punctuation model against an LLM")
+    parser.add_argument('--model-path', default='models/punct', help="Punctuation model directory")
+    parser.add_argument('--threads', type=int, help="ONNX Runtime intra-op threads")
+    parser.add_argument('--ollama-model', help="Also run this Ollama model for comparison")
+    parser.add_argument('--ollama-url', default='http://localhost:11434')
+    parser.add_argument('--languages', nargs='+', help="Fixture languages (default: all)")
+    parser.add_argument('--json', help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    samples = sentence_samples(args.languages)
+    providers = {'punct': PunctuationProvider(model_path=os.path.abspath(args.model_path), threads=args.threads)}
+    if args.ollama_model:
+        providers[f"ollama:{args.ollama_model}"] = OllamaProvider(model=args.ollama_model, ollama_url=args.ollama_url)
+
+    results = {'samples': len(samples), 'runs': {}}
+    print(f"{len(samples)} samples")
+    print(f"{'provider':<24} {'mean s':>7} {'p50 s':>7} {'max s':>7} {'P':>5} {'R':>5} {'F1':>5} {'case':>5} {'errors':>6}")
+    for name, provider in providers.items():
+        result = run(provider, samples)
+        results['runs'][name] = result
+        if result['requests']:
+            print(f"{name:<24} {result['latency_mean_s']:>7.3f} {result['latency_p50_s']:>7.3f} "
+                  f"{result['latency_max_s']:>7.3f} {result['precision']:>5.2f} {result['recall']:>5.2f} "
+                  f"{result['f1']:>5.2f} {result['case_accuracy']:>5.0%} {result['errors']:>6}")
+        else:
+            print(f"{name:<24} {'-':>7} {'-':>7} {'-':>7} {'-':>5} {'-':>5} {'-':>5} {'-':>5} {result['errors']:>6}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
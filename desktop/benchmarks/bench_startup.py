@@ -0,0 +1,137 @@
+"""
+Startup time: import-time breakdown and wall-clock until the tray is ready.
+
+- Import profile: `python -X importtime -c "import src.main"`, summed per
+  top-level package, plus a check that heavy modules (numpy, sounddevice,
+  requests, tkinter...) are not imported before the tray is up
+- Tray ready: launches the app with VOICE_DICTATION_STARTUP_PROBE set, which
+  makes it print a marker and exit as soon as the tray icon is visible
+  (needs a desktop session)
+
+Exits with status 1 if a heavy module is imported at startup or a limit is
+exceeded, so it can guard against regressions.
+
+Usage (from desktop/):
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --tray --repeat 5 --max-tray-s 1.5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+DESKTOP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must only be imported after the tray and hotkey are up
+HEAVY_MODULES = [
+    'numpy', 'sounddevice', 'scipy', 'requests', 'urllib3', 'tkinter',
+    'pyperclip', 'onnxruntime', 'tokenizers',
+]
+
+TRAY_MARKER = '[startup] tray_ready'
+
+
+def import_profile(module: str = 'src.main') -> list:
+    """
+    Run `-X importtime` on a module import.
+
+    Returns:
+        List of (self_us, cumulative_us, module name) for every imported module
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=DESKTOP_DIR, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        entries.append((int(self_us), int(cumulative_us), name.strip()))
+    return entries
+
+
+def by_package(entries: list) -> list:
+    """Total self time per top-level package, largest first"""
+    totals = {}
+    for self_us, _, name in entries:
+        package = name.split('.')[0]
+        totals[package] = totals.get(package, 0) + self_us
+    return sorted(totals.items(), key=lambda item: -item[1])
+
+
+def imported_modules(entries: list) -> set:
+    return {name for _, _, name in entries}
+
+
+def tray_ready_time(timeout: float = 60) -> float:
+    """Seconds from process start until the app reports the tray as visible"""
+    env = dict(os.environ, VOICE_DICTATION_STARTUP_PROBE='1')
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'src.main'], cwd=DESKTOP_DIR, env=env,
+        stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True
+    )
+    try:
+        for line in process.stdout:
+            if line.startswith(TRAY_MARKER):
+                return time.perf_counter() - start
+        raise RuntimeError("App exited before the tray was ready")
+    finally:
+        if process.poll() is None:
+            process.kill()
+        process.wait(timeout)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark application startup")
+    parser.add_argument('--module', default='src.main', help="Module whose import is profiled")
+    parser.add_argument('--top', type=int, default=15, help="Packages to list")
+    parser.add_argument('--max-import-ms', type=float, help="Fail if importing the module takes longer")
+    parser.add_argument('--tray', action='store_true', help="Also measure wall-clock to tray ready")
+    parser.add_argument('--repeat', type=int, default=3, help="Tray-ready runs")
+    parser.add_argument('--max-tray-s', type=float, help="Fail if median tray-ready time is higher")
+    parser.add_argument('--json', help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    failures = []
+    entries = import_profile(args.module)
+    total_ms = max(cumulative for _, cumulative, _ in entries) / 1000
+    heavy = sorted(m for m in imported_modules(entries) if m in HEAVY_MODULES)
+    results = {'import_ms': total_ms, 'packages': dict(by_package(entries)), 'heavy_imports': heavy}
+
+    print(f"import {args.module}: {total_ms:.1f} ms ({len(entries)} modules)")
+    print(f"{'package':<24} {'self ms':>8}")
+    for package, self_us in by_package(entries)[:args.top]:
+        print(f"{package:<24} {self_us / 1000:>8.1f}")
+
+    if heavy:
+        failures.append(f"heavy modules imported at startup: {', '.join(heavy)}")
+    if args.max_import_ms and total_ms > args.max_import_ms:
+        failures.append(f"import took {total_ms:.1f} ms (limit {args.max_import_ms} ms)")
+
+    if args.tray:
+        times = [tray_ready_time() for _ in range(args.repeat)]
+        results['tray_ready_s'] = times
+        median = statistics.median(times)
+        print(f"\ntray ready: median {median:.2f}s, min {min(times):.2f}s, max {max(times):.2f}s ({args.repeat} runs)")
+        if args.max_tray_s and median > args.max_tray_s:
+            failures.append(f"tray ready after {median:.2f}s (limit {args.max_tray_s}s)")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Access to the recordings and reference transcripts in tests/fixtures"""
+import re
+from pathlib import Path
+
+FIXTURES_DIR = Path(__file__).resolve().parent.parent / 'tests' / 'fixtures'
+
+# language -> (audio file, reference transcript)
+FIXTURES = {
+    'en': ('esempio inglese.wav', 'esempio inglese trascrizione.txt'),
+    'it': ('esempio italiano.wav', 'esempio italiano trascrizione.txt'),
+}
+
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
+# Punctuation, except separators inside numbers ("1,500", "3.5")
+_PUNCTUATION_RE = re.compile(r"(?<!\d)[^\w\s']|[^\w\s'](?!\d)", re.UNICODE)
+
+
+def load_audio(language: str) -> bytes:
+    """Return the WAV bytes of a fixture recording"""
+    return (FIXTURES_DIR / FIXTURES[language][0]).read_bytes()
+
+
+def load_reference(language: str) -> str:
+    """Return the reference transcript of a fixture recording"""
+    return (FIXTURES_DIR / FIXTURES[language][1]).read_text(encoding='utf-8').strip()
+
+
+def to_raw_transcript(text: str) -> str:
+    """Strip punctuation and casing, approximating unformatted speech-to-text output"""
+    return ' '.join(_PUNCTUATION_RE.sub(' ', text).lower().split())
+
+
+def sentence_samples(languages=None) -> list:
+    """
+    Split the reference transcripts into per-sentence formatting samples.
+
+    Returns:
+        List of dicts with 'language', 'raw' (unformatted) and 'reference' text
+    """
+    samples = []
+    for language in languages or FIXTURES:
+        for sentence in _SENTENCE_SPLIT_RE.split(load_reference(language)):
+            raw = to_raw_transcript(sentence)
+            if raw:
+                samples.append({'language': language, 'raw': raw, 'reference': sentence})
+    return samples
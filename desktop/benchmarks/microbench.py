@@ -0,0 +1,312 @@
+"""
+Microbenchmarks for the audio and text hot paths.
+
+Each benchmark runs a function on a synthetic input of realistic size
+(100 ms audio blocks, a 10 minute take, long transcripts) and reports:
+- ns/op: best of several timing rounds (timeit autorange)
+- peak KiB/op: peak traced memory during one call (tracemalloc)
+- blocks/op: memory blocks still allocated after one call
+
+Benchmarks needing sounddevice/numpy are skipped when those can't be imported.
+
+Usage (from desktop/):
+    python -m benchmarks.microbench
+    python -m benchmarks.microbench validate_output --json micro.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import logging
+import time
+import timeit
+import tracemalloc
+from typing import Callable, Optional
+
+from benchmarks.fixtures import load_reference, to_raw_transcript
+from src.core.chunking import chunk_text
+from src.providers.llm.alignment import salvage_output
+from src.providers.llm.base import ASSISTANT_PHRASES, FILLER_WORDS, LLMProvider
+
+SAMPLE_RATE = 16000
+BLOCK_SAMPLES = 1600  # 100 ms, the AudioRecorder stream block size
+TAKE_SECONDS = 600  # 10 minute take
+TEXT_CASES = ['short', 'fixtures', 'long', 'answer']  # See _transcripts
+
+# name -> factory returning (function, per-call setup or None)
+BENCHMARKS = {}
+
+
+def benchmark(name: str):
+    """Register a benchmark factory under name"""
+    def register(factory: Callable):
+        BENCHMARKS[name] = factory
+        return factory
+    return register
+
+
+class Skip(Exception):
+    """Raised by a factory when a benchmark can't run here"""
+
+
+def measure(function: Callable, setup: Optional[Callable] = None, repeat: int = 5, min_time: float = 0.2) -> dict:
+    """
+    Time and profile the allocations of function.
+
+    Args:
+        function: Called with setup()'s result, or with no argument
+        setup: Builds a fresh input before each call (not timed)
+        repeat: Timing rounds; the best one is reported
+        min_time: Minimum seconds per timing round
+
+    Returns:
+        {'ns_per_op', 'ops', 'peak_kib', 'blocks'}
+    """
+    if setup is None:
+        timer = timeit.Timer(function)
+        number, _ = timer.autorange()
+        number = max(number, int(number * min_time / 0.2))
+        best = min(timer.repeat(repeat=repeat, number=number)) / number
+    else:
+        # Inputs are consumed: time calls one at a time, each on a fresh input
+        number, timings, deadline = 0, [], time.perf_counter() + min_time * repeat
+        while number < repeat or time.perf_counter() < deadline:
+            argument = setup()
+            start = time.perf_counter()
+            function(argument)
+            timings.append(time.perf_counter() - start)
+            number += 1
+        best = min(timings)
+
+    argument = setup() if setup else None
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot()
+        result = function(argument) if setup else function()
+        after = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    blocks = sum(stat.count_diff for stat in after.compare_to(snapshot, 'filename'))
+
+    return {'ns_per_op': best * 1e9, 'ops': number, 'peak_kib': (peak - before) / 1024, 'blocks': blocks}
+
+
+def _recorder(gain: float = 1.0):
+    """AudioRecorder without an audio device (nothing is opened)"""
+    try:
+        from src.core.audio_recorder import AudioRecorder
+    except (ImportError, OSError) as e:
+        raise Skip(f"audio stack unavailable: {e}")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        return AudioRecorder(sample_rate=SAMPLE_RATE, max_gain=gain)
+
+
+def _numpy():
+    try:
+        import numpy as np
+    except ImportError:
+        raise Skip("numpy unavailable")
+    return np
+
+
+def _speech_block(np, samples: int = BLOCK_SAMPLES):
+    """int16 block shaped like the sounddevice callback input: a tone plus noise"""
+    rng = np.random.default_rng(0)
+    t = np.arange(samples) / SAMPLE_RATE
+    signal = 3000 * np.sin(2 * np.pi * 220 * t) + rng.normal(0, 300, samples)
+    return signal.astype(np.int16).reshape(-1, 1)
+
+
+@benchmark('audio_callback')
+def bench_audio_callback():
+    recorder = _recorder()
+    block = _speech_block(_numpy())
+
+    def run():
+        recorder._audio_callback(block, BLOCK_SAMPLES, None, None)
+        recorder.audio_queue.get_nowait()
+    return run, None
+
+
+@benchmark('audio_callback (gain 2x)')
+def bench_audio_callback_gain():
+    recorder = _recorder(gain=2.0)
+    block = _speech_block(_numpy())
+
+    def run():
+        recorder._audio_callback(block, BLOCK_SAMPLES, None, None)
+        recorder.audio_queue.get_nowait()
+    return run, None
+
+
+@benchmark('to_wav_bytes (10 min)')
+def bench_to_wav_bytes():
+    recorder = _recorder()
+    np = _numpy()
+    take = np.tile(_speech_block(np).reshape(-1), TAKE_SECONDS * 10)
+    return (lambda: recorder._to_wav_bytes(take)), None
+
+
+@benchmark('stop_recording (10 min)')
+def bench_stop_recording():
+    recorder = _recorder()
+    block = _speech_block(_numpy())
+
+    def setup():
+        recorder.recording = [block.copy() for _ in range(TAKE_SECONDS * 10)]
+        recorder.is_recording = True
+        return recorder
+
+    def run(recorder):
+        with contextlib.redirect_stdout(io.StringIO()):
+            recorder.stop_recording()
+    return run, setup
+
+
+@benchmark('level_history (meter frame read)')
+def bench_level_history():
+    recorder = _recorder()
+    block = _speech_block(_numpy())
+    for _ in range(recorder.LEVEL_HISTORY):
+        recorder._audio_callback(block, BLOCK_SAMPLES, None, None)
+    return recorder.level_history, None
+
+
+@benchmark('level meter bars (frame)')
+def bench_level_meter_bars():
+    try:
+        from src.ui.level_meter import bar_heights
+    except ImportError as e:
+        raise Skip(f"tkinter unavailable: {e}")
+
+    peaks = [(n * 997) % 32767 for n in range(64)]
+    return (lambda: bar_heights(peaks, 44, 22)), None
+
+
+def _transcripts() -> dict:
+    """(raw, formatted) transcript pairs: short, both fixtures, 10x fixtures, an answer"""
+    reference = load_reference('it') + ' ' + load_reference('en')
+    short_ref = "Penso che dovremmo provare con la nuova versione."
+    return {
+        'short': (to_raw_transcript(short_ref), short_ref),
+        'fixtures': (to_raw_transcript(reference), reference),
+        'long': (' '.join([to_raw_transcript(reference)] * 10), ' '.join([reference] * 10)),
+        'answer': ("come si configura git", "Apri il terminale ed esegui git config."),
+    }
+
+
+def _validator():
+    class _Provider(LLMProvider):
+        def process(self, text: str) -> str:
+            pass
+
+    logging.getLogger('src.providers.llm.base').setLevel(logging.ERROR)
+    return _Provider()
+
+
+def legacy_validate_output(input_text: str, output_text: str) -> tuple:
+    """
+    Previous implementation: str.replace per filler, substring scan per phrase.
+
+    It stops at the first (often false-positive) substring hit, so its timing
+    is only comparable with validate_output where both verdicts agree.
+    """
+    input_clean = input_text.lower()
+    for word in FILLER_WORDS:
+        input_clean = input_clean.replace(word, '')
+    input_clean = ' '.join(input_clean.split())
+    output_clean = output_text.lower().strip()
+
+    if len(output_clean.split()) > len(input_clean.split()) * 2:
+        return False, "too long"
+    for phrase in ASSISTANT_PHRASES:
+        if phrase in output_clean:
+            return False, phrase
+    for pattern in ['```', '- ', '* ', '1.', '2.', '3.']:
+        if pattern in output_text:
+            return False, pattern
+    return True, "OK"
+
+
+def _register_validation_benchmarks():
+    for case in TEXT_CASES:
+        def validate(case=case):
+            raw, formatted = _transcripts()[case]
+            provider = _validator()
+            return (lambda: provider.validate_output(raw, formatted)), None
+
+        def legacy(case=case):
+            raw, formatted = _transcripts()[case]
+            return (lambda: legacy_validate_output(raw, formatted)), None
+
+        benchmark(f'validate_output ({case})')(validate)
+        benchmark(f'validate_output legacy ({case})')(legacy)
+
+
+_register_validation_benchmarks()
+
+
+@benchmark('salvage_output (2000 words)')
+def bench_salvage_output():
+    words = ' '.join(f"parola{i}" for i in range(2000))
+    formatted = words.capitalize() + '.'
+    return (lambda: salvage_output(words, formatted)), None
+
+
+@benchmark('chunk_text (long)')
+def bench_chunk_text():
+    raw, _ = _transcripts()['long']
+    return (lambda: chunk_text(raw, 120)), None
+
+
+def run(names: Optional[list] = None, repeat: int = 5, min_time: float = 0.2) -> dict:
+    """
+    Run benchmarks.
+
+    Args:
+        names: Substrings selecting benchmarks (default: all)
+
+    Returns:
+        {name: measure() result, or {'skipped': reason}}
+    """
+    results = {}
+    for name, factory in BENCHMARKS.items():
+        if names and not any(selected in name for selected in names):
+            continue
+        try:
+            function, setup = factory()
+        except Skip as e:
+            results[name] = {'skipped': str(e)}
+            continue
+        results[name] = measure(function, setup, repeat=repeat, min_time=min_time)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmarks for audio and text hot paths")
+    parser.add_argument('names', nargs='*', help="Run only benchmarks whose name contains one of these")
+    parser.add_argument('--repeat', type=int, default=5, help="Timing rounds per benchmark")
+    parser.add_argument('--min-time', type=float, default=0.2, help="Minimum seconds per timing round")
+    parser.add_argument('--json', help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    results = run(args.names, args.repeat, args.min_time)
+    print(f"{'benchmark':<34} {'ns/op':>14} {'peak KiB/op':>12} {'blocks/op':>10}")
+    for name, result in results.items():
+        if 'skipped' in result:
+            print(f"{name:<34} skipped: {result['skipped']}")
+            continue
+        print(f"{name:<34} {result['ns_per_op']:>14,.0f} {result['peak_kib']:>12.1f} {result['blocks']:>10}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
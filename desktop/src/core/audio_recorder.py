@@ -3,12 +3,18 @@ import numpy as np
 import io
 import struct
 import queue
+import threading
 import time
+from collections import deque
+
+from src.core.tracing import span
 
 
 class AudioRecorder:
     """Records audio from microphone"""
 
+    LEVEL_HISTORY = 64  # Blocks of level statistics kept for the level meter (~6 s)
+
     def __init__(self, sample_rate: int = 16000, device_index: int = -1, max_gain: float = 1.0):
         self.sample_rate = sample_rate
         self.device_index = device_index if device_index >= 0 else None
@@ -20,6 +26,11 @@ class AudioRecorder:
         self.last_audio_time = None  # Track last time audio was detected
         self.silence_threshold = 300  # Below this level is considered silence
         self.recent_audio_level = 0  # Track recent audio level for warnings
+        # (mean, peak) of each captured block after gain, computed in the callback for the level meter
+        self.levels = deque(maxlen=self.LEVEL_HISTORY)
+        self.blocks_captured = 0
+        # Guards the take buffer: a new take may start while the previous one is being detached
+        self._take_lock = threading.Lock()
 
         # Log ALL devices and select best one
         try:
@@ -49,28 +60,36 @@ class AudioRecorder:
 
         # Apply gain in real-time if needed
         if self.volume_multiplier != 1.0:
-            amplified = np.clip(indata * self.volume_multiplier, -32767, 32767).astype(np.int16)
-            self.audio_queue.put(amplified.copy())
+            block = np.clip(indata * self.volume_multiplier, -32767, 32767).astype(np.int16)
         else:
-            self.audio_queue.put(indata.copy())
+            block = indata.copy()
+        self.audio_queue.put(block)
+
+        # Level statistics of what is recorded (int32: abs(-32768) overflows int16)
+        magnitude = np.abs(block, dtype=np.int32)
+        mean = float(magnitude.mean())
+        self.levels.append((mean, int(magnitude.max())))
+        self.blocks_captured += 1
 
         # Check if audio or silence (use original indata for detection)
-        audio_level = np.abs(indata).mean()
+        audio_level = mean if self.volume_multiplier == 1.0 else np.abs(indata).mean()
         if audio_level > self.silence_threshold:
             self.last_audio_time = time.time()
 
     def start_recording(self):
-        """Start recording audio"""
-        self.recording = []
-        self.is_recording = True
-        self.last_audio_time = time.time()  # Initialize with current time
-
-        # Clear queue
-        while not self.audio_queue.empty():
-            try:
-                self.audio_queue.get_nowait()
-            except queue.Empty:
-                break
+        """Start recording audio into a fresh buffer"""
+        with self._take_lock:
+            self.recording = []
+            self.levels.clear()
+            self.is_recording = True
+            self.last_audio_time = time.time()  # Initialize with current time
+
+            # Clear queue
+            while not self.audio_queue.empty():
+                try:
+                    self.audio_queue.get_nowait()
+                except queue.Empty:
+                    break
 
         # Start continuous stream with error handling
         try:
@@ -125,29 +144,37 @@ class AudioRecorder:
         return time.time() - self.last_audio_time
 
     def stop_recording(self) -> bytes:
-        """Stop recording and return audio data as WAV bytes"""
-        self.is_recording = False
-
-        # Stop stream
-        if self.stream:
-            self.stream.stop()
-            self.stream.close()
-            self.stream = None
-            print("Audio stream stopped")
+        """
+        Stop recording and return audio data as WAV bytes.
+
+        The take's buffer is detached from the recorder before encoding, so the
+        next take can start right away without touching this one.
+        """
+        with span('buffer_ready'), self._take_lock:
+            self.is_recording = False
+
+            # Stop stream
+            if self.stream:
+                self.stream.stop()
+                self.stream.close()
+                self.stream = None
+                print("Audio stream stopped")
+
+            # Collect any remaining data from queue
+            while not self.audio_queue.empty():
+                try:
+                    chunk = self.audio_queue.get_nowait()
+                    self.recording.append(chunk)
+                except queue.Empty:
+                    break
 
-        # Collect any remaining data from queue
-        while not self.audio_queue.empty():
-            try:
-                chunk = self.audio_queue.get_nowait()
-                self.recording.append(chunk)
-            except queue.Empty:
-                break
+            take, self.recording = self.recording, []
 
-        if not self.recording:
+        if not take:
             raise Exception("No audio recorded")
 
         # Convert list of chunks to single array
-        audio_data = np.concatenate(self.recording, axis=0)
+        audio_data = np.concatenate(take, axis=0)
 
         # Log audio info (gain already applied in real-time by callback)
         duration = len(audio_data) / self.sample_rate
@@ -165,7 +192,8 @@ class AudioRecorder:
             print(f"WARNING: Audio level very low ({avg_level:.1f}) - increase volume multiplier in settings")
 
         # Convert to WAV bytes
-        wav_bytes = self._to_wav_bytes(audio_data)
+        with span('encode'):
+            wav_bytes = self._to_wav_bytes(audio_data)
         print(f"WAV file size: {len(wav_bytes)} bytes")
         return wav_bytes
 
@@ -177,24 +205,36 @@ class AudioRecorder:
         try:
             # Collect all available chunks from queue
             collected_any = False
-            while not self.audio_queue.empty():
-                try:
-                    chunk = self.audio_queue.get_nowait()
-                    self.recording.append(chunk)
-                    collected_any = True
-                except queue.Empty:
-                    break
+            with self._take_lock:
+                while self.is_recording and not self.audio_queue.empty():
+                    try:
+                        chunk = self.audio_queue.get_nowait()
+                        self.recording.append(chunk)
+                        collected_any = True
+                    except queue.Empty:
+                        break
+                chunk_count = len(self.recording)
+                last_chunk = self.recording[-1] if collected_any else None
 
             # Log audio level periodically and update recent level
-            if collected_any and len(self.recording) % 10 == 0:
-                last_chunk = self.recording[-1]
+            if collected_any and chunk_count % 10 == 0:
                 volume = np.abs(last_chunk).mean()
                 self.recent_audio_level = volume
-                print(f"Audio level: {volume:.1f} (chunks: {len(self.recording)})")
+                print(f"Audio level: {volume:.1f} (chunks: {chunk_count})")
 
         except Exception as e:
             raise Exception(f"Audio recording failed: {str(e)}")
 
+    def level_history(self) -> tuple:
+        """
+        Level statistics of the last blocks, for the level meter (safe from any thread).
+
+        Returns:
+            (blocks captured so far, ((mean, peak), ...) oldest first)
+        """
+        # deque.copy() runs without releasing the GIL, so it can't see a half-appended block
+        return self.blocks_captured, tuple(self.levels.copy())
+
     def get_recent_audio_level(self) -> float:
         """Get recent audio level for monitoring"""
         return self.recent_audio_level
@@ -0,0 +1,55 @@
+import re
+from typing import List
+
+# Sentence-like boundaries: after terminal punctuation, or after commas as a second choice
+_SENTENCE_RE = re.compile(r'(?<=[.!?;])\s+')
+_CLAUSE_RE = re.compile(r'(?<=[,:])\s+')
+
+
+def _split_long(segment: str, max_words: int) -> List[str]:
+    """Split a segment longer than max_words at clause boundaries, then by word count"""
+    pieces = []
+    for clause in _CLAUSE_RE.split(segment):
+        words = clause.split()
+        for start in range(0, len(words), max_words):
+            pieces.append(' '.join(words[start:start + max_words]))
+    return pieces
+
+
+def chunk_text(text: str, max_words: int) -> List[str]:
+    """
+    Split a transcript into chunks of at most max_words words.
+
+    Chunks end at sentence-like boundaries whenever possible, so each one can
+    be formatted independently. Sentences are packed greedily into chunks.
+
+    Args:
+        text: Transcript to split
+        max_words: Maximum words per chunk (0 or less = no splitting)
+
+    Returns:
+        List of chunks in order (a single chunk for short text)
+    """
+    text = text.strip()
+    if max_words <= 0 or len(text.split()) <= max_words:
+        return [text]
+
+    segments = []
+    for sentence in _SENTENCE_RE.split(text):
+        if len(sentence.split()) > max_words:
+            segments.extend(_split_long(sentence, max_words))
+        elif sentence:
+            segments.append(sentence)
+
+    chunks = []
+    current, current_words = [], 0
+    for segment in segments:
+        words = len(segment.split())
+        if current and current_words + words > max_words:
+            chunks.append(' '.join(current))
+            current, current_words = [], 0
+        current.append(segment)
+        current_words += words
+    if current:
+        chunks.append(' '.join(current))
+    return chunks
@@ -1,7 +1,11 @@
+import copy
 import json
 import os
 import sys
 import base64
+import tempfile
+import threading
+import time
 from pathlib import Path
 
 try:
@@ -23,14 +27,46 @@ def get_resource_path(relative_path):
 
 
 class ConfigManager:
-    """Manages configuration file with encrypted API keys"""
+    """
+    Manages configuration file with encrypted API keys.
+
+    save() writes the whole file at once (settings window). Runtime values
+    that change often (gain, last-used language, counters) go through
+    update(), which changes the config in memory and returns: a background
+    writer saves the whole config once changes settle, so callers never
+    wait for the disk. Every write goes to a temp file that replaces the
+    config atomically, so a crash mid-write can't leave a truncated config.
+
+    The config dict is shared with the app and serialized by the writer
+    thread: change it only through update() or save(), never in place.
+    """
 
     DEFAULT_CONFIG_PATH = os.path.join(os.getenv('APPDATA', '.'), 'VoiceDictation', 'config.json')
+    SAVE_DELAY = 1.0  # Seconds without updates before a background save
+    MAX_SAVE_DELAY = 5.0  # Upper bound while updates keep coming
 
-    def __init__(self, config_path: str = None):
+    def __init__(self, config_path: str = None, save_delay: float = SAVE_DELAY, max_save_delay: float = MAX_SAVE_DELAY):
+        """
+        Args:
+            config_path: Config file (default: AppData)
+            save_delay: Debounce window for update() saves, in seconds
+            max_save_delay: Longest an update() waits for its save, in seconds
+        """
         self.config_path = config_path or self.DEFAULT_CONFIG_PATH
         self.config = {}
         self.loaded_from = None  # Track where config was loaded from
+        self.save_delay = save_delay
+        self.max_save_delay = max_save_delay
+
+        self._dirty = set()  # Sections changed by update() since the last save (pending-changes flag, logged)
+        self._first_change = None
+        self._last_change = None
+        self._flush_requested = False
+        self._closed = False
+        self._writer = None
+        self._condition = threading.Condition()
+        self._write_lock = threading.Lock()  # Keeps snapshots and writes in the same order
+
         self._ensure_config_dir()
 
     def _ensure_config_dir(self):
@@ -43,43 +79,35 @@ class ConfigManager:
         2. AppData user folder (default)
         3. Project config folder (development)
         4. Template file
+
+        A file that can't be parsed is skipped (the next source is used) but
+        stays the save target, so the next save repairs it.
         """
-        # 1. Try config.json next to executable (portable mode)
+        # 1. Config.json next to executable (portable mode), saved to same location
         exe_dir = os.path.dirname(os.path.abspath(sys.executable if getattr(sys, 'frozen', False) else __file__))
         local_config = os.path.join(exe_dir, 'config.json')
-
-        if os.path.exists(local_config):
-            print(f"Loading config from: {local_config}")
-            with open(local_config, 'r') as f:
-                self.config = json.load(f)
-                self.loaded_from = local_config
-                self.config_path = local_config  # Save to same location
-                return self.config
-
-        # 2. Try AppData folder (default Windows location)
-        if os.path.exists(self.config_path):
-            print(f"Loading config from: {self.config_path}")
-            with open(self.config_path, 'r') as f:
-                self.config = json.load(f)
-                self.loaded_from = self.config_path
-                return self.config
-
-        # 3. Try project config folder (development)
+        # 2. AppData folder (default Windows location)
+        user_config = self.config_path
+        # 3. Project config folder (development), saved to same location
         project_config = os.path.join('config', 'config.json')
-        if os.path.exists(project_config):
-            print(f"Loading config from: {project_config}")
-            with open(project_config, 'r') as f:
-                self.config = json.load(f)
-                self.loaded_from = project_config
-                self.config_path = project_config  # Save to same location
+
+        for path in (local_config, user_config, project_config):
+            if not os.path.exists(path):
+                continue
+            self.config_path = path
+            print(f"Loading config from: {path}")
+            config = self._read(path)
+            if config is not None:
+                self.config = config
+                self.loaded_from = path
                 return self.config
 
         # 4. Load template as fallback
         template_path = get_resource_path(os.path.join('config', 'config.template.json'))
-        if os.path.exists(template_path):
+        config = self._read(template_path) if os.path.exists(template_path) else None
+        if config is not None:
             print(f"Loading template from: {template_path}")
-            with open(template_path, 'r') as f:
-                self.config = json.load(f)
+            self.config = config
         else:
             # Fallback to hardcoded defaults
             print(f"Warning: Template not found at {template_path}, using defaults")
@@ -87,17 +115,139 @@ class ConfigManager:
 
         return self.config
 
-    def save(self, config: dict = None):
-        """Save configuration to file"""
-        if config:
-            self.config = config
+    @staticmethod
+    def _read(path: str):
+        """Parse a config file (None if it is unreadable, truncated or not a JSON object)"""
+        try:
+            with open(path, 'r') as f:
+                config = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not read config {path}: {e}")
+            return None
+        if not isinstance(config, dict):
+            print(f"Warning: Config {path} is not a JSON object, ignoring it")
+            return None
+        return config
 
+    def save(self, config: dict = None):
+        """Save configuration to file now (replaces any pending update() save)"""
         print(f"Saving config to: {self.config_path}")
-        with open(self.config_path, 'w') as f:
-            json.dump(self.config, f, indent=2)
+        with self._write_lock:
+            with self._condition:
+                if config:
+                    self.config = config
+                self._dirty.clear()
+                snapshot = copy.deepcopy(self.config)
+            self._write(json.dumps(snapshot, indent=2))
         print(f"Config saved successfully")
 
-    def encrypt_api_key(self, api_key: str) -> str:
+    def update(self, section: str, **values):
+        """
+        Change values of a config section and save them in the background.
+
+        Cheap enough for hot paths: no I/O, the write happens once updates
+        pause for save_delay seconds (at most max_save_delay after the first).
+
+        Args:
+            section: Top-level section, e.g. 'audio'
+            **values: Keys to set, e.g. volume_gain=2.5
+        """
+        with self._condition:
+            self.config.setdefault(section, {}).update(values)
+            now = time.monotonic()
+            if not self._dirty:
+                self._first_change = now
+            self._last_change = now
+            self._dirty.add(section)
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_loop, name="config-writer", daemon=True)
+                self._writer.start()
+            self._condition.notify_all()
+
+    def dirty_sections(self) -> set:
+        """Sections updated but not saved yet (empty when nothing is pending)"""
+        with self._condition:
+            return set(self._dirty)
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """
+        Save pending updates now.
+
+        Returns:
+            True if nothing is left to save
+        """
+        with self._condition:
+            if not self._dirty:
+                return True
+            self._flush_requested = True
+            self._condition.notify_all()
+            saved = self._condition.wait_for(lambda: not self._dirty and not self._flush_requested, timeout)
+            self._flush_requested = False
+            return saved
+
+    def close(self, timeout: float = 5.0):
+        """Save pending updates and stop the background writer"""
+        self.flush(timeout)
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def _write_loop(self):
+        while True:
+            with self._condition:
+                # Wait for updates, then for them to settle
+                while not self._closed:
+                    if self._dirty:
+                        deadline = min(self._last_change + self.save_delay, self._first_change + self.max_save_delay)
+                        remaining = deadline - time.monotonic()
+                        if self._flush_requested or remaining <= 0:
+                            break
+                        self._condition.wait(remaining)
+                    elif self._flush_requested:
+                        self._flush_requested = False
+                        self._condition.notify_all()
+                    else:
+                        self._condition.wait()
+                if self._closed and not self._dirty:
+                    return
+
+            with self._write_lock:
+                with self._condition:
+                    sections, self._dirty = self._dirty, set()
+                    snapshot = copy.deepcopy(self.config) if sections else None
+                if snapshot is not None:
+                    try:
+                        # The whole config is written: the sections only say what changed
+                        self._write(json.dumps(snapshot, indent=2))
+                        print(f"Config saved ({', '.join(sorted(sections))})")
+                    except Exception as e:
+                        print(f"Warning: Could not save config: {e}")
+
+            with self._condition:
+                if not self._dirty:
+                    self._flush_requested = False
+                self._condition.notify_all()
+
+    def _write(self, data: str):
+        """Replace the config file atomically (temp file in the same folder + rename)"""
+        self._ensure_config_dir()
+        directory = os.path.dirname(os.path.abspath(self.config_path))
+        fd, temp_path = tempfile.mkstemp(prefix='.config-', suffix='.tmp', dir=directory)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.config_path)
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+
+    @staticmethod
+    def encrypt_api_key(api_key: str) -> str:
         """Encrypt API key using Windows DPAPI"""
         if not DPAPI_AVAILABLE:
             # Fallback: just base64 encode (not secure, but works for testing)
@@ -112,7 +262,8 @@ class ConfigManager:
         except Exception as e:
             raise Exception(f"Failed to encrypt API key: {str(e)}")
 
-    def decrypt_api_key(self, encrypted_key: str) -> str:
+    @staticmethod
+    def decrypt_api_key(encrypted_key: str) -> str:
         """Decrypt API key using Windows DPAPI or base64 fallback"""
         if not encrypted_key:
             return ""
@@ -149,15 +300,15 @@ class ConfigManager:
 
     def set_transcription_api_key(self, api_key: str):
         """Set and encrypt transcription API key"""
-        if 'transcription' not in self.config:
-            self.config['transcription'] = {}
-        self.config['transcription']['api_key_encrypted'] = self.encrypt_api_key(api_key)
+        encrypted = self.encrypt_api_key(api_key)
+        with self._condition:
+            self.config.setdefault('transcription', {})['api_key_encrypted'] = encrypted
 
     def set_llm_api_key(self, api_key: str):
         """Set and encrypt LLM API key"""
-        if 'llm' not in self.config:
-            self.config['llm'] = {}
-        self.config['llm']['api_key_encrypted'] = self.encrypt_api_key(api_key)
+        encrypted = self.encrypt_api_key(api_key)
+        with self._condition:
+            self.config.setdefault('llm', {})['api_key_encrypted'] = encrypted
 
     def _get_default_config(self) -> dict:
         """Get default configuration"""
@@ -179,8 +330,13 @@ class ConfigManager:
                 "api_key_encrypted": "",
                 "model": "llama-3.1-8b-instant",
                 "ollama_url": "http://localhost:11434",
+                "keep_alive": "30m",
+                "punct_model_path": "models/punct",
                 "temperature": 0.3,
-                "max_tokens": 500
+                "max_tokens": 500,
+                "prompt_variant": "full",
+                "chunk_words": 120,
+                "max_concurrency": 3
             },
             "audio": {
                 "device_index": -1,
@@ -188,6 +344,45 @@ class ConfigManager:
             },
             "behavior": {
                 "auto_paste": True,
+                "parallel_takes": 2,
+                "type_max_chars": 20,
+                "restore_clipboard": True,
                 "show_overlay": True
+            },
+            "tracing": {
+                "enabled": True,
+                "max_bytes": 1048576,
+                "backup_count": 5
+            },
+            "recordings": {
+                "enabled": True,
+                "max_files": 10,
+                "max_mb": 50,
+                "max_age_days": 7,
+                "compress": True
+            },
+            "vocabulary": {
+                "terms": [],
+                "replacements": {},
+                "prompt_hint": True
+            },
+            "language_id": {
+                "enabled": True,
+                "window": 5,
+                "min_agreement": 0.8,
+                "max_pin_seconds": 10,
+                "probe_every": 5
+            },
+            "history": {
+                "enabled": True,
+                "max_entries": 10000
+            },
+            "service": {
+                "enabled": False,
+                "port": 8768,
+                "max_workers": 2,
+                "max_queued": 8,
+                "timeout": 120,
+                "token": ""
             }
         }
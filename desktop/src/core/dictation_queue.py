@@ -0,0 +1,148 @@
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from src.core.tracing import Trace, use_trace
+
+
+class DictationJob:
+    """One recorded take moving through the pipeline"""
+
+    def __init__(self, seq: int, audio_data: bytes, context=None, trace: Optional[Trace] = None):
+        self.seq = seq
+        self.audio_data = audio_data
+        self.context = context  # Caller data for this take (e.g. its widget)
+        self.trace = trace  # Active while the job is processed and output
+        self.result = None
+        self.error = None
+        self.raw_text = None  # Transcript before formatting
+        self.audio_path = None  # Archived copy of the take, if any
+        self.output = None  # Delivers this job instead of the queue's output (see submit_text)
+
+
+class DictationQueue:
+    """
+    Processes takes concurrently and outputs them in recording order.
+
+    Each submitted take gets its own job: transcription and formatting of
+    several takes overlap on a small thread pool, while the output step
+    (clipboard + paste) runs one job at a time, strictly in submission order.
+    A take that finishes early waits for the ones recorded before it.
+    """
+
+    def __init__(
+        self,
+        process: Callable[[DictationJob], str],
+        output: Callable[[DictationJob], None],
+        max_workers: int = 2,
+        on_error: Optional[Callable[[DictationJob], None]] = None
+    ):
+        """
+        Args:
+            process: Turns a job's audio into text (runs concurrently)
+            output: Delivers a job's text (runs serially, in order)
+            max_workers: Takes processed at the same time
+            on_error: Called, in order, for jobs whose process or output failed
+        """
+        self.process = process
+        self.output = output
+        self.on_error = on_error
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="dictation")
+
+        self._seq = itertools.count()
+        self._next_output = 0
+        self._finished = {}  # seq -> job waiting for earlier takes
+        self._lock = threading.Lock()
+        self._output_lock = threading.Lock()
+        self._pending = 0
+
+    def submit(self, audio_data: bytes, context=None, trace: Optional[Trace] = None) -> DictationJob:
+        """
+        Queue a recorded take.
+
+        Args:
+            audio_data: WAV bytes of the take
+            context: Caller data passed along with the job
+            trace: Latency trace of the take
+
+        Returns:
+            The queued job
+        """
+        with self._lock:
+            job = DictationJob(next(self._seq), audio_data, context, trace)
+            self._pending += 1
+        self.executor.submit(self._run, job)
+        return job
+
+    def submit_text(self, text: str, output: Callable[['DictationJob'], None], context=None,
+                    trace: Optional[Trace] = None) -> DictationJob:
+        """
+        Queue text that needs no processing (e.g. re-inserted from the history).
+
+        It is output through the same serial, ordered step as the takes, after
+        every take submitted before it, so it never races their paste.
+
+        Args:
+            text: Text to deliver (job.result)
+            output: Delivers the job's text, called like the queue's output
+            context: Caller data passed along with the job
+            trace: Latency trace of the job
+
+        Returns:
+            The queued job
+        """
+        with self._lock:
+            job = DictationJob(next(self._seq), None, context, trace)
+            job.result = text
+            job.output = output
+            self._pending += 1
+            self._finished[job.seq] = job
+        self.executor.submit(self._drain)
+        return job
+
+    def pending(self) -> int:
+        """Takes submitted but not yet output"""
+        with self._lock:
+            return self._pending
+
+    def shutdown(self, wait: bool = True):
+        self.executor.shutdown(wait=wait)
+
+    def _run(self, job: DictationJob):
+        try:
+            with use_trace(job.trace):
+                job.result = self.process(job)
+        except Exception as e:
+            job.error = e
+
+        with self._lock:
+            self._finished[job.seq] = job
+
+        self._drain()
+
+    def _drain(self):
+        """Output every finished job whose predecessors have all been output"""
+        # One drainer at a time keeps outputs serial and ordered
+        with self._output_lock:
+            while True:
+                with self._lock:
+                    job = self._finished.pop(self._next_output, None)
+                    if job is None:
+                        return
+
+                if job.error is None:
+                    try:
+                        with use_trace(job.trace):
+                            (job.output or self.output)(job)
+                    except Exception as e:
+                        job.error = e
+                if job.error is not None and self.on_error:
+                    try:
+                        self.on_error(job)
+                    except Exception as e:
+                        print(f"Dictation error handler failed: {e}")
+
+                with self._lock:
+                    self._next_output += 1
+                    self._pending -= 1
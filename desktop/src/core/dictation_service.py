@@ -0,0 +1,263 @@
+"""
+Localhost HTTP service exposing the dictation pipeline to other tools.
+
+Editors and scripts on the same machine reuse the app's warm providers and
+pooled connections instead of spinning up their own:
+
+    curl --data-binary @take.wav -H "Content-Type: audio/wav" http://127.0.0.1:8768/transcribe
+    curl -H "Content-Type: application/json" -d '{"text": "ciao come stai"}' http://127.0.0.1:8768/format
+
+Endpoints:
+    POST /transcribe  WAV body → {"raw_text": ..., "text": ...} (?format=0 skips the LLM)
+    POST /format      {"text": ...} or text/plain body → {"text": ...}
+    GET  /health      → {"status": "ok", "active": n, "queued": n}
+
+Requests run on a small worker pool; beyond max_workers + max_queued
+requests in flight, new ones get 503 with Retry-After instead of piling up.
+Text is returned to the caller, never pasted.
+"""
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Optional
+from urllib.parse import parse_qs, urlparse
+
+from src.core.tracing import Trace, use_trace
+
+DEFAULT_PORT = 8768
+MAX_BODY_BYTES = 25 * 1024 * 1024  # Same limit as the hosted Whisper APIs
+
+
+class ServiceError(Exception):
+    """Request error answered with an HTTP status"""
+
+    def __init__(self, status: int, message: str, headers: Optional[dict] = None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+class DictationService:
+    """HTTP front end for TextProcessor, bound to localhost"""
+
+    def __init__(
+        self,
+        processor,
+        port: int = DEFAULT_PORT,
+        max_workers: int = 2,
+        max_queued: int = 8,
+        timeout: float = 120.0,
+        token: str = "",
+        on_trace: Optional[Callable[[Trace], None]] = None
+    ):
+        """
+        Args:
+            processor: TextProcessor (pipeline for /transcribe, post_process for /format)
+            port: Port on 127.0.0.1 (0 = any free port)
+            max_workers: Requests processed at the same time
+            max_queued: Requests waiting for a worker before new ones are refused
+            timeout: Seconds a request may take before 504
+            token: If set, required as "Authorization: Bearer <token>"
+            on_trace: Called with each finished request's trace
+        """
+        self.processor = processor
+        self.timeout = timeout
+        self.token = token
+        self.on_trace = on_trace
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="service")
+        self._slots = threading.BoundedSemaphore(max_workers + max_queued)
+        self._max_workers = max_workers
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', port), self._make_handler())
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = None
+
+    @classmethod
+    def from_config(cls, processor, service_config: dict, **kwargs) -> 'DictationService':
+        """Build from the 'service' config section"""
+        return cls(
+            processor,
+            port=service_config.get('port', DEFAULT_PORT),
+            max_workers=service_config.get('max_workers', 2),
+            max_queued=service_config.get('max_queued', 8),
+            timeout=service_config.get('timeout', 120.0),
+            token=service_config.get('token', ""),
+            **kwargs
+        )
+
+    def start(self) -> 'DictationService':
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True, name="dictation-service")
+        self._thread.start()
+        print(f"Dictation service listening on {self.url}")
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.executor.shutdown(wait=False)
+
+    def __enter__(self) -> 'DictationService':
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def status(self) -> dict:
+        with self._lock:
+            in_flight = self._in_flight
+        return {
+            'status': 'ok',
+            'active': min(in_flight, self._max_workers),
+            'queued': max(0, in_flight - self._max_workers),
+        }
+
+    def transcribe(self, audio_data: bytes, format_text: bool = True) -> dict:
+        """Transcribe (and optionally format) WAV audio through the processor's pipeline"""
+        raw_texts = []
+        pipeline = self.processor.pipeline(output=False, on_transcript=raw_texts.append)
+        if not format_text:
+            pipeline.remove('format')
+        results = list(pipeline.run([audio_data]))
+        if not results:
+            raise ServiceError(422, "No speech detected")
+        return {'raw_text': raw_texts[0], 'text': results[0]}
+
+    def format(self, text: str) -> dict:
+        """Format a transcript with the LLM"""
+        if not text.strip():
+            raise ServiceError(400, "Empty text")
+        return {'text': self.processor.post_process(text)}
+
+    def run(self, kind: str, function: Callable, *args) -> dict:
+        """
+        Run a request on the worker pool, within the concurrency limit.
+
+        Raises:
+            ServiceError: 503 if the service is saturated, 504 on timeout
+        """
+        if not self._slots.acquire(blocking=False):
+            raise ServiceError(503, "Service busy", {'Retry-After': '1'})
+
+        with self._lock:
+            self._in_flight += 1
+        trace = Trace(
+            source='service',
+            request=kind,
+            transcription_provider=self.processor.config.get('transcription', {}).get('provider', ''),
+            llm_provider=self.processor.config.get('llm', {}).get('provider', '')
+        )
+
+        def job():
+            with use_trace(trace):
+                return function(*args)
+
+        try:
+            future = self.executor.submit(job)
+        except Exception:
+            self._finish(trace)
+            raise
+        # The slot is held until the work itself finishes, even if the caller timed out
+        future.add_done_callback(lambda done: self._finish(trace, done))
+
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            raise ServiceError(504, f"Request took longer than {self.timeout}s")
+
+    def _finish(self, trace: Trace, future=None):
+        """Release a request's slot and report its trace"""
+        error = future.exception() if future else None
+        if error:
+            trace.attrs['error'] = str(error)[:200]
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
+        if self.on_trace:
+            self.on_trace(trace)
+
+    def _make_handler(self):
+        service = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def _send_json(self, data: dict, status: int = 200, headers: dict = None):
+                body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _check_access(self):
+                # Browsers send Origin on cross-site requests: web pages must not reach the service
+                if self.headers.get('Origin'):
+                    raise ServiceError(403, "Cross-origin requests are not allowed")
+                if service.token and self.headers.get('Authorization') != f"Bearer {service.token}":
+                    raise ServiceError(401, "Missing or invalid token")
+
+            def _read_body(self) -> bytes:
+                length = int(self.headers.get('Content-Length') or 0)
+                if length > MAX_BODY_BYTES:
+                    raise ServiceError(413, f"Body larger than {MAX_BODY_BYTES} bytes")
+                return self.rfile.read(length)
+
+            def _handle(self, respond: Callable[[], dict]):
+                try:
+                    self._check_access()
+                    self._send_json(respond())
+                except ServiceError as e:
+                    self.close_connection = True  # The request body may be unread
+                    self._send_json({'error': str(e)}, e.status, e.headers)
+                except Exception as e:
+                    print(f"Dictation service error: {e}")
+                    self.close_connection = True
+                    self._send_json({'error': str(e)}, 500)
+
+            def do_GET(self):
+                if urlparse(self.path).path == '/health':
+                    self._handle(service.status)
+                else:
+                    self._send_json({'error': 'Not found'}, 404)
+
+            def do_POST(self):
+                url = urlparse(self.path)
+                if url.path == '/transcribe':
+                    self._handle(lambda: self._transcribe(parse_qs(url.query)))
+                elif url.path == '/format':
+                    self._handle(self._format)
+                else:
+                    self.close_connection = True  # The request body is not read
+                    self._send_json({'error': 'Not found'}, 404)
+
+            def _transcribe(self, query: dict) -> dict:
+                audio_data = self._read_body()
+                if not audio_data:
+                    raise ServiceError(400, "Empty audio")
+                format_text = query.get('format', ['1'])[0] not in ('0', 'false')
+                return service.run('transcribe', service.transcribe, audio_data, format_text)
+
+            def _format(self) -> dict:
+                body = self._read_body()
+                if self.headers.get('Content-Type', '').startswith('application/json'):
+                    try:
+                        text = json.loads(body).get('text', '')
+                    except (ValueError, AttributeError):
+                        raise ServiceError(400, "Expected a JSON object with 'text'")
+                    if not isinstance(text, str):
+                        raise ServiceError(400, "'text' must be a string")
+                else:
+                    text = body.decode('utf-8', errors='replace')
+                return service.run('format', service.format, text)
+
+        return Handler
@@ -0,0 +1,170 @@
+"""
+Event dispatcher and state machine for the app controller.
+
+Hotkeys, the tray, audio ticks and finished background work all post events
+to one dispatcher thread, which handles them one at a time: the controller's
+state is only ever touched from that thread, so there are no flags to
+synchronize. Anything slow (file I/O, network tests, pasting from the
+history) runs on a small bounded worker pool and posts its result back.
+"""
+import heapq
+import itertools
+import threading
+import time
+import traceback
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
+
+
+class Timer:
+    """Handle of an event scheduled with Dispatcher.call_later"""
+
+    def __init__(self):
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class Dispatcher:
+    """Runs posted events serially on a dedicated thread, plus a bounded worker pool"""
+
+    def __init__(self, name: str = "dispatcher", max_workers: int = 2):
+        """
+        Args:
+            name: Thread name (workers are named '<name>-worker_N')
+            max_workers: Threads for run_in_worker
+        """
+        self.name = name
+        self.workers = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix=f"{name}-worker")
+        self._ready = deque()  # (function, args) due now
+        self._timers = []  # Heap of (due, seq, timer, function, args)
+        self._seq = itertools.count()
+        self._condition = threading.Condition()
+        self._running = False
+        self._thread = None
+
+    def start(self) -> 'Dispatcher':
+        with self._condition:
+            if self._running:
+                return self
+            self._running = True
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 2.0):
+        """Stop handling events (pending ones are dropped) and release the workers"""
+        with self._condition:
+            self._running = False
+            self._ready.clear()
+            self._timers.clear()
+            self._condition.notify()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self.workers.shutdown(wait=False)
+
+    def post(self, function: Callable, *args):
+        """Handle function(*args) on the dispatcher thread, after the events already posted"""
+        with self._condition:
+            self._ready.append((function, args))
+            self._condition.notify()
+
+    def call_later(self, delay: float, function: Callable, *args) -> Timer:
+        """
+        Handle function(*args) on the dispatcher thread after delay seconds.
+
+        Returns:
+            Timer whose cancel() drops the event if it hasn't run yet
+        """
+        timer = Timer()
+        with self._condition:
+            heapq.heappush(self._timers, (time.monotonic() + delay, next(self._seq), timer, function, args))
+            self._condition.notify()
+        return timer
+
+    def run_in_worker(self, function: Callable, *args, on_done: Optional[Callable[[Future], None]] = None) -> Future:
+        """
+        Run function(*args) on the worker pool.
+
+        Args:
+            on_done: Posted to the dispatcher with the finished Future
+
+        Returns:
+            Future of the call
+        """
+        future = self.workers.submit(function, *args)
+        if on_done:
+            future.add_done_callback(lambda done: self.post(on_done, done))
+        return future
+
+    def in_dispatcher(self) -> bool:
+        """True when called from the dispatcher thread"""
+        return threading.current_thread() is self._thread
+
+    def _next_event(self):
+        """Wait for the next due event (None once stopped)"""
+        with self._condition:
+            while self._running:
+                now = time.monotonic()
+                while self._timers and self._timers[0][0] <= now:
+                    _, _, timer, function, args = heapq.heappop(self._timers)
+                    if not timer.cancelled:
+                        self._ready.append((function, args))
+                if self._ready:
+                    return self._ready.popleft()
+                self._condition.wait(self._timers[0][0] - now if self._timers else None)
+            return None
+
+    def _run(self):
+        while True:
+            event = self._next_event()
+            if event is None:
+                return
+            function, args = event
+            try:
+                function(*args)
+            except Exception as e:
+                print(f"Dispatcher event {getattr(function, '__name__', function)} failed: {e}")
+                traceback.print_exc()
+
+
+class StateMachine:
+    """
+    Explicit states and the events allowed in each.
+
+    An event that has no transition from the current state is ignored
+    (e.g. a second stop while already idle), instead of half-running.
+    """
+
+    def __init__(self, initial: str, transitions: dict,
+                 on_change: Optional[Callable[[str, str, str], None]] = None):
+        """
+        Args:
+            initial: Starting state
+            transitions: {(state, event): next state}
+            on_change: Called with (old state, event, new state) after each transition
+        """
+        self.state = initial
+        self.transitions = transitions
+        self.on_change = on_change
+
+    def can(self, event: str) -> bool:
+        return (self.state, event) in self.transitions
+
+    def fire(self, event: str) -> bool:
+        """
+        Apply event.
+
+        Returns:
+            True if the state changed, False if the event isn't allowed now
+        """
+        new_state = self.transitions.get((self.state, event))
+        if new_state is None:
+            print(f"Ignored '{event}' while {self.state}")
+            return False
+        old_state, self.state = self.state, new_state
+        if self.on_change:
+            self.on_change(old_state, event, new_state)
+        return True
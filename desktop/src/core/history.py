@@ -0,0 +1,205 @@
+"""
+Dictation history in SQLite, with full-text search.
+
+Every dictation (raw transcript, formatted text, providers, stage timings,
+archived audio) is queued by add() and written by a background thread in
+batched transactions, so recording and pasting never wait for the disk.
+search() uses an FTS5 index (prefix matching on every word), falling back
+to LIKE where SQLite was built without FTS5.
+"""
+import json
+import queue
+import re
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS dictations (
+    id INTEGER PRIMARY KEY,
+    created REAL NOT NULL,
+    raw_text TEXT NOT NULL,
+    text TEXT NOT NULL,
+    transcription_provider TEXT,
+    llm_provider TEXT,
+    total_ms REAL,
+    timings TEXT,
+    audio_path TEXT,
+    trace_id TEXT
+);
+CREATE INDEX IF NOT EXISTS dictations_created ON dictations (created);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS dictations_fts USING fts5(
+    raw_text, text, content='dictations', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS dictations_ai AFTER INSERT ON dictations BEGIN
+    INSERT INTO dictations_fts (rowid, raw_text, text) VALUES (new.id, new.raw_text, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS dictations_ad AFTER DELETE ON dictations BEGIN
+    INSERT INTO dictations_fts (dictations_fts, rowid, raw_text, text) VALUES ('delete', old.id, old.raw_text, old.text);
+END;
+"""
+
+COLUMNS = ['id', 'created', 'raw_text', 'text', 'transcription_provider', 'llm_provider',
+           'total_ms', 'timings', 'audio_path', 'trace_id']
+
+_WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+_STOP = object()
+
+
+def fts_query(query: str) -> str:
+    """User input → FTS5 query: every word must match, as a prefix ('conf' finds 'configurazione')"""
+    return ' '.join(f'"{word}"*' for word in _WORD_RE.findall(query))
+
+
+class HistoryStore:
+    """SQLite dictation history with a batched background writer"""
+
+    def __init__(self, path: str, max_entries: int = 10000, batch_size: int = 20, flush_interval: float = 1.0):
+        """
+        Args:
+            path: Database file (':memory:' is not supported: reader and writer use separate connections)
+            max_entries: Oldest dictations beyond this are deleted (0 = no limit)
+            batch_size: Dictations written per transaction at most
+            flush_interval: Seconds the writer waits to batch more dictations
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        connection = self._connect()
+        try:
+            with connection:
+                connection.executescript(SCHEMA)
+                try:
+                    connection.executescript(FTS_SCHEMA)
+                    self.fts = True
+                except sqlite3.OperationalError as e:
+                    print(f"History full-text search unavailable ({e}), using LIKE")
+                    self.fts = False
+        finally:
+            connection.close()
+
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="history-writer")
+        self._thread.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=5)
+        connection.execute("PRAGMA journal_mode=WAL")  # Searches don't block the writer
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def add(self, raw_text: str, text: str, transcription_provider: str = "", llm_provider: str = "",
+            total_ms: Optional[float] = None, timings: Optional[dict] = None, audio_path: Optional[str] = None,
+            trace_id: Optional[str] = None, created: Optional[float] = None):
+        """Queue a dictation for storage (returns immediately)"""
+        self._queue.put((
+            created or time.time(), raw_text, text, transcription_provider, llm_provider,
+            total_ms, json.dumps(timings) if timings else None, audio_path, trace_id
+        ))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until queued dictations are written; False on timeout"""
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout: float = 2.0):
+        """Write queued dictations (up to timeout) and stop the writer"""
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def search(self, query: str = "", limit: int = 50) -> list:
+        """
+        Most recent dictations matching query (all words, prefix match); recent ones if empty.
+
+        Returns:
+            List of dicts with the dictations columns; 'timings' decoded
+        """
+        columns = ', '.join(f'd.{column}' for column in COLUMNS)
+        words = _WORD_RE.findall(query)
+        if not words:
+            sql, params = f"SELECT {columns} FROM dictations d ORDER BY d.created DESC LIMIT ?", [limit]
+        elif self.fts:
+            sql = (f"SELECT {columns} FROM dictations_fts f JOIN dictations d ON d.id = f.rowid "
+                   f"WHERE dictations_fts MATCH ? ORDER BY d.created DESC LIMIT ?")
+            params = [fts_query(query), limit]
+        else:
+            conditions = ' AND '.join("(d.text LIKE ? OR d.raw_text LIKE ?)" for _ in words)
+            sql = f"SELECT {columns} FROM dictations d WHERE {conditions} ORDER BY d.created DESC LIMIT ?"
+            params = [pattern for word in words for pattern in (f'%{word}%',) * 2] + [limit]
+
+        connection = self._connect()
+        try:
+            rows = connection.execute(sql, params).fetchall()
+        finally:
+            connection.close()
+        return [self._to_dict(row) for row in rows]
+
+    def get(self, dictation_id: int) -> Optional[dict]:
+        connection = self._connect()
+        try:
+            row = connection.execute(f"SELECT {', '.join(COLUMNS)} FROM dictations WHERE id = ?",
+                                     (dictation_id,)).fetchone()
+        finally:
+            connection.close()
+        return self._to_dict(row) if row else None
+
+    @staticmethod
+    def _to_dict(row: tuple) -> dict:
+        record = dict(zip(COLUMNS, row))
+        record['timings'] = json.loads(record['timings']) if record['timings'] else {}
+        return record
+
+    def _run(self):
+        connection = self._connect()
+        try:
+            while True:
+                batch, waiters, stop = [], [], False
+                item = self._queue.get()
+                deadline = time.monotonic() + self.flush_interval
+                while True:
+                    if item is _STOP:
+                        stop = True
+                    elif isinstance(item, threading.Event):
+                        waiters.append(item)
+                    else:
+                        batch.append(item)
+
+                    # Markers end the batch: flush() and close() must not wait for more dictations
+                    if stop or waiters or len(batch) >= self.batch_size:
+                        break
+                    try:
+                        item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                    except queue.Empty:
+                        break
+
+                if batch:
+                    try:
+                        self._write(connection, batch)
+                    except sqlite3.Error as e:
+                        print(f"Could not save dictation history: {e}")
+                for waiter in waiters:
+                    waiter.set()
+                if stop:
+                    return
+        finally:
+            connection.close()
+
+    def _write(self, connection: sqlite3.Connection, batch: list):
+        with connection:
+            connection.executemany(
+                f"INSERT INTO dictations ({', '.join(COLUMNS[1:])}) VALUES ({', '.join('?' * (len(COLUMNS) - 1))})",
+                batch
+            )
+            if self.max_entries:
+                connection.execute(
+                    "DELETE FROM dictations WHERE id <= (SELECT id FROM dictations ORDER BY id DESC LIMIT 1 OFFSET ?)",
+                    (self.max_entries,)
+                )
@@ -0,0 +1,136 @@
+"""
+Local language identification for transcription.
+
+With language 'auto', Whisper detects the language from the first seconds of
+audio, which costs time and is unreliable on short utterances (a short
+Italian take can come back as Spanish or English). People dictate in the
+same language most of the time, so the language of the last transcripts
+(function-word detection, see prompts.detect_language) is a cheap and
+accurate predictor of the next one.
+
+When the recent transcripts agree, short takes are transcribed with that
+language pinned. Long takes keep 'auto': Whisper detects long audio
+reliably. A transcript produced with the language pinned is no evidence for
+that language (Whisper writes what it is told to), so it only counts when
+it disagrees, and every few pinned takes one is sent with 'auto' to check
+the pin. Any transcript in another language drops the pin, so a switch
+made of short takes is followed too.
+"""
+import io
+import threading
+import wave
+from collections import Counter, deque
+from typing import Iterable, Optional
+
+from src.providers.llm.prompts import detect_language
+
+
+def wav_duration(audio_data: bytes) -> Optional[float]:
+    """Duration in seconds of WAV bytes (None if the header can't be read)"""
+    try:
+        with wave.open(io.BytesIO(audio_data), 'rb') as wav:
+            return wav.getnframes() / float(wav.getframerate())
+    except (wave.Error, EOFError, ZeroDivisionError):
+        return None
+
+
+class LanguageIdentifier:
+    """Chooses the transcription language from the languages of recent transcripts"""
+
+    def __init__(self, window: int = 5, min_agreement: float = 0.8, min_samples: int = 2,
+                 max_pin_seconds: float = 10.0, probe_every: int = 5):
+        """
+        Args:
+            window: Number of recent transcripts considered
+            min_agreement: Share of them that must be in the same language to pin it
+            min_samples: Transcripts needed before pinning
+            max_pin_seconds: Longer takes are left to the provider's detection (0 = always pin)
+            probe_every: After this many pinned takes in a row, the next one is sent with 'auto' (0 = never)
+        """
+        self.window = max(1, window)
+        self.min_agreement = min_agreement
+        self.min_samples = max(1, min_samples)
+        self.max_pin_seconds = max_pin_seconds
+        self.probe_every = probe_every
+        self._recent = deque(maxlen=self.window)
+        self._pinned_takes = 0  # Pinned takes since the last one sent with 'auto'
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, language_config: dict) -> 'LanguageIdentifier':
+        """Build from the 'language_id' config section"""
+        return cls(
+            window=language_config.get('window', 5),
+            min_agreement=language_config.get('min_agreement', 0.8),
+            min_samples=language_config.get('min_samples', 2),
+            max_pin_seconds=language_config.get('max_pin_seconds', 10.0),
+            probe_every=language_config.get('probe_every', 5)
+        )
+
+    def observe(self, text: str, pinned: Optional[str] = None) -> Optional[str]:
+        """
+        Record the language of a transcript.
+
+        Args:
+            text: Raw transcript
+            pinned: Language the take was transcribed with, if choose() pinned it
+
+        Returns:
+            Detected language, or None if the text is too short to tell
+        """
+        language = detect_language(text)
+        if not language or language == pinned:
+            return language  # A pinned transcript confirming its own pin proves nothing
+        with self._lock:
+            current = self._pinned(self._recent)
+            if current and language != current:
+                self._recent.clear()  # The speaker switched: drop the pin
+            self._recent.append(language)
+        return language
+
+    def seed(self, texts: Iterable[str]):
+        """Observe past transcripts (e.g. from the history), oldest first"""
+        for text in texts:
+            self.observe(text)
+
+    def pinned(self) -> Optional[str]:
+        """Language of the recent transcripts, if they agree enough"""
+        with self._lock:
+            return self._pinned(self._recent)
+
+    def _pinned(self, recent) -> Optional[str]:
+        if len(recent) < self.min_samples:
+            return None
+        language, count = Counter(recent).most_common(1)[0]
+        return language if count / len(recent) >= self.min_agreement else None
+
+    def choose(self, audio_data: bytes, configured: str = 'auto') -> str:
+        """
+        Language to request for a take.
+
+        Args:
+            audio_data: WAV bytes of the take
+            configured: transcription.options.language (anything but 'auto' wins)
+
+        Returns:
+            Language code, or 'auto' to let the provider detect it
+        """
+        if configured and configured != 'auto':
+            return configured
+        long_take = False
+        if self.max_pin_seconds > 0:
+            duration = wav_duration(audio_data)
+            long_take = duration is not None and duration > self.max_pin_seconds
+
+        with self._lock:
+            language = self._pinned(self._recent)
+            probe = self.probe_every and self._pinned_takes >= self.probe_every
+            if not language or long_take or probe:
+                self._pinned_takes = 0
+                return 'auto'
+            self._pinned_takes += 1
+            return language
+
+    def text_language(self, text: str) -> Optional[str]:
+        """Language of a transcript for the LLM examples: detected, else the pinned one"""
+        return detect_language(text) or self.pinned()
@@ -0,0 +1,164 @@
+"""
+Stage list for the dictation pipeline.
+
+A Stage turns an iterator of items into an iterator of items (a generator):
+WAV → text → formatted text → output. A Pipeline chains its stages on the
+caller's thread, so every recorded take goes through the same steps and a
+step can be added, replaced or removed without touching TextProcessor.
+
+    pipeline = Pipeline([TranscribeStage(processor), FormatStage(processor), OutputStage(processor)])
+    pipeline.insert_before('format', FunctionStage('dictionary', fix_names))
+    for text in pipeline.run([wav_take]):
+        ...
+"""
+from abc import ABC, abstractmethod
+from typing import Callable, Iterable, Iterator, List, Optional
+
+from src.core.tracing import span
+
+
+class Stage(ABC):
+    """Pipeline step: consumes an iterator of items and yields items"""
+
+    name = 'stage'
+
+    @abstractmethod
+    def process(self, items: Iterator) -> Iterator:
+        """
+        Process items
+
+        Args:
+            items: Items from the previous stage (or the pipeline source)
+
+        Returns:
+            Iterator over the items for the next stage
+        """
+        pass
+
+
+class FunctionStage(Stage):
+    """Applies a function to every item (None results are dropped)"""
+
+    def __init__(self, name: str, function: Callable):
+        self.name = name
+        self.function = function
+
+    def process(self, items: Iterator) -> Iterator:
+        for item in items:
+            with span(self.name):
+                result = self.function(item)
+            if result is not None:
+                yield result
+
+
+class Pipeline:
+    """Stages chained in order on the caller's thread"""
+
+    def __init__(self, stages: List[Stage]):
+        """
+        Args:
+            stages: Stages in order
+        """
+        self.stages = list(stages)
+
+    def stage_names(self) -> list:
+        return [stage.name for stage in self.stages]
+
+    def _index(self, name: str) -> int:
+        for index, stage in enumerate(self.stages):
+            if stage.name == name:
+                return index
+        raise ValueError(f"No pipeline stage named '{name}'")
+
+    def insert_before(self, name: str, stage: Stage) -> 'Pipeline':
+        self.stages.insert(self._index(name), stage)
+        return self
+
+    def insert_after(self, name: str, stage: Stage) -> 'Pipeline':
+        self.stages.insert(self._index(name) + 1, stage)
+        return self
+
+    def replace(self, name: str, stage: Stage) -> 'Pipeline':
+        self.stages[self._index(name)] = stage
+        return self
+
+    def remove(self, name: str) -> 'Pipeline':
+        del self.stages[self._index(name)]
+        return self
+
+    def run(self, source: Iterable) -> Iterator:
+        """
+        Pass items from source through every stage.
+
+        Args:
+            source: Input items
+
+        Returns:
+            Iterator over the items produced by the last stage
+
+        Raises:
+            Exception: The first exception raised by any stage (while iterating)
+        """
+        items = iter(source)
+        for stage in self.stages:
+            items = stage.process(items)
+        return items
+
+
+class TranscribeStage(Stage):
+    """WAV bytes → raw transcript (empty transcripts are dropped)"""
+
+    name = 'transcribe'
+
+    def __init__(self, processor, status_callback: Optional[Callable] = None,
+                 on_transcript: Optional[Callable[[str], None]] = None):
+        """
+        Args:
+            processor: TextProcessor
+            status_callback: Optional callback for status updates
+            on_transcript: Called with each raw transcript (e.g. to keep it for the history)
+        """
+        self.processor = processor
+        self.status_callback = status_callback
+        self.on_transcript = on_transcript
+
+    def process(self, items: Iterator) -> Iterator:
+        for audio_data in items:
+            if self.status_callback:
+                self.status_callback("Transcribing...")
+            text = self.processor.transcribe(audio_data)
+            if text.strip():
+                if self.on_transcript:
+                    self.on_transcript(text)
+                yield text
+
+
+class FormatStage(Stage):
+    """Raw transcript → formatted text"""
+
+    name = 'format'
+
+    def __init__(self, processor, status_callback: Optional[Callable] = None):
+        self.processor = processor
+        self.status_callback = status_callback
+
+    def process(self, items: Iterator) -> Iterator:
+        for raw_text in items:
+            if self.status_callback:
+                self.status_callback("Processing...")
+            yield self.processor.post_process(raw_text)
+
+
+class OutputStage(Stage):
+    """Inserts each text into the active app, in order, and passes it on"""
+
+    name = 'output'
+
+    def __init__(self, processor, status_callback: Optional[Callable] = None):
+        self.processor = processor
+        self.status_callback = status_callback
+
+    def process(self, items: Iterator) -> Iterator:
+        for text in items:
+            self.processor.output_text(text, self.status_callback)
+            yield text
@@ -0,0 +1,189 @@
+"""
+Background archive of recorded takes, for debugging.
+
+Takes are handed to a writer thread and saved gzip-compressed, so archiving
+never delays transcription. The writer keeps an in-memory index of the
+archive (scanned once at startup) and enforces retention by count, total
+size and age without listing the directory again.
+"""
+import datetime
+import gzip
+import os
+import queue
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+PREFIX = 'recording_'
+
+_STOP = object()
+
+
+class RecordingArchive:
+    """Saves takes to a directory on a background thread, with bounded retention"""
+
+    def __init__(
+        self,
+        directory: str,
+        max_files: int = 10,
+        max_bytes: int = 50 * 1024 * 1024,
+        max_age_days: float = 7,
+        compress: bool = True,
+        compress_level: int = 6,
+        queue_size: int = 8
+    ):
+        """
+        Args:
+            directory: Archive directory (created if missing)
+            max_files: Takes kept (0 = no limit)
+            max_bytes: Total size kept on disk (0 = no limit)
+            max_age_days: Older takes are deleted (0 = no limit)
+            compress: Store takes as .wav.gz instead of .wav
+            compress_level: gzip level (1 = fastest, 9 = smallest)
+            queue_size: Takes waiting to be written; beyond it new takes are not archived
+        """
+        self.directory = directory
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self.max_age = max_age_days * 86400
+        self.compress = compress
+        self.compress_level = compress_level
+
+        self._index = deque()  # (path, size, created) oldest first; written only by the writer
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = threading.Thread(target=self._run, daemon=True, name="recording-archive")
+        self._thread.start()
+
+    @classmethod
+    def from_config(cls, directory: str, recordings_config: dict) -> 'RecordingArchive':
+        """Build from the 'recordings' config section"""
+        return cls(
+            directory,
+            max_files=recordings_config.get('max_files', 10),
+            max_bytes=int(recordings_config.get('max_mb', 50) * 1024 * 1024),
+            max_age_days=recordings_config.get('max_age_days', 7),
+            compress=recordings_config.get('compress', True)
+        )
+
+    def save(self, audio_data: bytes) -> Optional[str]:
+        """
+        Queue a take for archiving (never blocks).
+
+        Returns:
+            Path the take will be written to, or None if the writer is behind
+            and the take was not archived
+        """
+        name = f"{PREFIX}{datetime.datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.wav"
+        path = os.path.join(self.directory, name + '.gz' if self.compress else name)
+        try:
+            self._queue.put_nowait((path, time.time(), audio_data))
+            return path
+        except queue.Full:
+            print("Recording archive busy, take not saved")
+            return None
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until queued takes are written; False on timeout"""
+        done = threading.Event()
+        try:
+            self._queue.put((None, None, done), timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self, timeout: float = 2.0):
+        """Write queued takes (up to timeout) and stop the writer"""
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+
+    def entries(self) -> list:
+        """Archived takes as (path, size, created), oldest first"""
+        with self._lock:
+            return list(self._index)
+
+    @staticmethod
+    def load(path: str) -> bytes:
+        """WAV bytes of an archived take (.wav or .wav.gz)"""
+        opener = gzip.open if path.endswith('.gz') else open
+        with opener(path, 'rb') as f:
+            return f.read()
+
+    def _run(self):
+        try:
+            self._scan()
+        except OSError as e:
+            print(f"Could not read recording archive {self.directory}: {e}")
+
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            path, created, audio_data = item
+            if path is None:
+                audio_data.set()  # flush() marker
+                continue
+            try:
+                self._write(path, created, audio_data)
+                self._enforce_retention()
+            except Exception as e:
+                print(f"Could not archive recording: {e}")
+
+    def _scan(self):
+        """Index takes already on disk (once, at startup)"""
+        os.makedirs(self.directory, exist_ok=True)
+        found = []
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.name.startswith(PREFIX) and entry.name.endswith(('.wav', '.wav.gz')) and entry.is_file():
+                    stat = entry.stat()
+                    found.append((entry.path, stat.st_size, stat.st_mtime))
+        for record in sorted(found, key=lambda record: record[2]):
+            self._add(record)
+        self._enforce_retention()
+
+    def _write(self, path: str, created: float, audio_data: bytes):
+        temp_path = path + '.tmp'
+        if self.compress:
+            name = os.path.basename(path)[:-len('.gz')]
+            with open(temp_path, 'wb') as raw, gzip.GzipFile(filename=name, mode='wb', fileobj=raw,
+                                                              compresslevel=self.compress_level) as f:
+                f.write(audio_data)
+        else:
+            with open(temp_path, 'wb') as f:
+                f.write(audio_data)
+        os.replace(temp_path, path)  # Never leave a truncated take behind
+
+        self._add((path, os.path.getsize(path), created))
+        print(f"Audio saved to: {path}")
+
+    def _add(self, record: tuple):
+        with self._lock:
+            self._index.append(record)
+            self._total_bytes += record[1]
+
+    def _enforce_retention(self):
+        """Delete the oldest takes until every limit holds"""
+        now = time.time()
+        while self._index:
+            path, size, created = self._index[0]
+            over_count = self.max_files and len(self._index) > self.max_files
+            over_size = self.max_bytes and self._total_bytes > self.max_bytes
+            too_old = self.max_age and now - created > self.max_age
+            if not (over_count or over_size or too_old):
+                break
+
+            with self._lock:
+                self._index.popleft()
+                self._total_bytes -= size
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"Could not delete {path}: {e}")
@@ -0,0 +1,287 @@
+import sys
+import threading
+import time
+from typing import Optional
+
+from src.core.tracing import span
+
+
+class WindowsClipboard:
+    """In-process Unicode text clipboard through the Win32 API (no subprocesses)"""
+
+    CF_UNICODETEXT = 13
+    GMEM_MOVEABLE = 0x0002
+    OPEN_RETRIES = 20
+    OPEN_RETRY_DELAY = 0.005  # Another app may hold the clipboard for a few ms
+
+    def __init__(self):
+        import ctypes
+        from ctypes import wintypes
+
+        self.ctypes = ctypes
+        user32 = ctypes.WinDLL('user32', use_last_error=True)
+        kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+
+        user32.OpenClipboard.argtypes = [wintypes.HWND]
+        user32.OpenClipboard.restype = wintypes.BOOL
+        user32.CloseClipboard.restype = wintypes.BOOL
+        user32.EmptyClipboard.restype = wintypes.BOOL
+        user32.GetClipboardData.argtypes = [wintypes.UINT]
+        user32.GetClipboardData.restype = wintypes.HANDLE
+        user32.SetClipboardData.argtypes = [wintypes.UINT, wintypes.HANDLE]
+        user32.SetClipboardData.restype = wintypes.HANDLE
+        user32.IsClipboardFormatAvailable.argtypes = [wintypes.UINT]
+        user32.IsClipboardFormatAvailable.restype = wintypes.BOOL
+        user32.GetClipboardSequenceNumber.restype = wintypes.DWORD
+        kernel32.GlobalAlloc.argtypes = [wintypes.UINT, ctypes.c_size_t]
+        kernel32.GlobalAlloc.restype = wintypes.HGLOBAL
+        kernel32.GlobalLock.argtypes = [wintypes.HGLOBAL]
+        kernel32.GlobalLock.restype = wintypes.LPVOID
+        kernel32.GlobalUnlock.argtypes = [wintypes.HGLOBAL]
+        kernel32.GlobalFree.argtypes = [wintypes.HGLOBAL]
+
+        self.user32 = user32
+        self.kernel32 = kernel32
+
+    def _open(self):
+        for _ in range(self.OPEN_RETRIES):
+            if self.user32.OpenClipboard(None):
+                return
+            time.sleep(self.OPEN_RETRY_DELAY)
+        raise Exception("Clipboard is busy (held by another application)")
+
+    def get_text(self) -> Optional[str]:
+        """Current clipboard text, or None if it holds no text"""
+        if not self.user32.IsClipboardFormatAvailable(self.CF_UNICODETEXT):
+            return None
+        self._open()
+        try:
+            handle = self.user32.GetClipboardData(self.CF_UNICODETEXT)
+            if not handle:
+                return None
+            pointer = self.kernel32.GlobalLock(handle)
+            try:
+                return self.ctypes.wstring_at(pointer)
+            finally:
+                self.kernel32.GlobalUnlock(handle)
+        finally:
+            self.user32.CloseClipboard()
+
+    def set_text(self, text: str):
+        data = text.encode('utf-16-le') + b'\x00\x00'
+        handle = self.kernel32.GlobalAlloc(self.GMEM_MOVEABLE, len(data))
+        if not handle:
+            raise Exception("Clipboard allocation failed")
+        pointer = self.kernel32.GlobalLock(handle)
+        self.ctypes.memmove(pointer, data, len(data))
+        self.kernel32.GlobalUnlock(handle)
+
+        self._open()
+        try:
+            self.user32.EmptyClipboard()
+            if not self.user32.SetClipboardData(self.CF_UNICODETEXT, handle):
+                self.kernel32.GlobalFree(handle)
+                raise Exception(f"SetClipboardData failed (error {self.ctypes.get_last_error()})")
+            # On success the system owns the memory
+        finally:
+            self.user32.CloseClipboard()
+
+    def sequence_number(self) -> Optional[int]:
+        """Changes every time any application writes the clipboard"""
+        return self.user32.GetClipboardSequenceNumber()
+
+
+class PyperclipClipboard:
+    """Portable clipboard (spawns xclip/xsel/pbcopy on Linux and macOS)"""
+
+    def __init__(self):
+        import pyperclip
+        self.pyperclip = pyperclip
+
+    def get_text(self) -> Optional[str]:
+        return self.pyperclip.paste()
+
+    def set_text(self, text: str):
+        self.pyperclip.copy(text)
+
+    def sequence_number(self) -> Optional[int]:
+        return None
+
+
+def default_clipboard():
+    """Best clipboard backend for this platform"""
+    if sys.platform == 'win32':
+        try:
+            return WindowsClipboard()
+        except Exception as e:
+            print(f"Win32 clipboard unavailable ({e}), using pyperclip")
+    return PyperclipClipboard()
+
+
+class TextOutput:
+    """
+    Inserts text into the active application.
+
+    Short single-line text is typed directly with the keyboard hook. Anything
+    else goes through the clipboard: the text is written in-process, read back
+    until the clipboard serves it (instead of sleeping a fixed delay), pasted
+    with Ctrl+V and, shortly after, the previous clipboard text is restored.
+    """
+
+    READY_TIMEOUT = 0.25
+    POLL_INTERVAL = 0.005
+
+    def __init__(
+        self,
+        auto_paste: bool = True,
+        type_max_chars: int = 20,
+        restore_clipboard: bool = True,
+        restore_delay: float = 0.5,
+        clipboard=None,
+        keyboard_backend=None
+    ):
+        """
+        Args:
+            auto_paste: Paste into the active app (False: only copy to the clipboard)
+            type_max_chars: Type text up to this length instead of pasting (0 = never type)
+            restore_clipboard: Put the previous clipboard text back after pasting
+            restore_delay: Seconds to wait before restoring, so the target app has read the paste
+            clipboard: Clipboard backend (default: platform backend)
+            keyboard_backend: Object with send(hotkey) and write(text) (default: keyboard module)
+        """
+        self.auto_paste = auto_paste
+        self.type_max_chars = type_max_chars
+        self.restore_clipboard = restore_clipboard
+        self.restore_delay = restore_delay
+        self.clipboard = clipboard or default_clipboard()
+        self._keyboard = keyboard_backend
+        self._restore_timer = None
+        self._restore_text = None
+        self._restore_lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, behavior: dict, **kwargs) -> 'TextOutput':
+        """Create from the 'behavior' config section"""
+        return cls(
+            auto_paste=behavior.get('auto_paste', True),
+            type_max_chars=behavior.get('type_max_chars', 20),
+            restore_clipboard=behavior.get('restore_clipboard', True),
+            restore_delay=behavior.get('restore_delay', 0.5),
+            **kwargs
+        )
+
+    @property
+    def keyboard(self):
+        if self._keyboard is None:
+            import keyboard
+            self._keyboard = keyboard
+        return self._keyboard
+
+    def output(self, text: str, status_callback: Optional[callable] = None) -> str:
+        """
+        Insert text into the active application.
+
+        Args:
+            text: Text to insert
+            status_callback: Optional callback for status updates
+
+        Returns:
+            How the text was delivered: 'typed', 'pasted' or 'copied'
+
+        Raises:
+            Exception: If the clipboard can't be written or the paste keystroke fails
+        """
+        if self.auto_paste and 0 < len(text) <= self.type_max_chars and '\n' not in text:
+            if status_callback:
+                status_callback("Typing...")
+            with span('type'):
+                # One character at a time, so a failure part way through pastes
+                # only what wasn't typed yet instead of repeating it
+                typed = 0
+                try:
+                    for char in text:
+                        self.keyboard.write(char)
+                        typed += 1
+                    return 'typed'
+                except Exception as e:
+                    print(f"Typing failed after {typed} of {len(text)} characters ({e}), pasting the rest")
+                    text = text[typed:]
+
+        previous = None
+        if self.auto_paste and self.restore_clipboard:
+            # Back-to-back takes: the user's clipboard is the one still waiting to be restored
+            previous = self._cancel_restore()
+            if previous is None:
+                try:
+                    previous = self.clipboard.get_text()
+                except Exception as e:
+                    print(f"Could not read previous clipboard: {e}")
+
+        if status_callback:
+            status_callback("Copying...")
+        with span('clipboard'):
+            self.clipboard.set_text(text)
+            if not self._wait_until_ready(text):
+                print(f"WARNING: clipboard not confirmed after {self.READY_TIMEOUT * 1000:.0f}ms, pasting anyway")
+            sequence = self.clipboard.sequence_number()
+
+        if not self.auto_paste:
+            return 'copied'
+
+        if status_callback:
+            status_callback("Pasting...")
+        with span('paste'):
+            try:
+                self.keyboard.send('ctrl+v')
+            except Exception as e:
+                raise Exception(f"Paste failed ({e}) - the text is in the clipboard")
+
+        if previous is not None and previous != text:
+            self._schedule_restore(previous, text, sequence)
+        return 'pasted'
+
+    def _wait_until_ready(self, text: str) -> bool:
+        """Poll until the clipboard serves text (async backends need a few ms)"""
+        deadline = time.perf_counter() + self.READY_TIMEOUT
+        while True:
+            try:
+                if self.clipboard.get_text() == text:
+                    return True
+            except Exception:
+                pass  # Busy: another app is reading it
+            if time.perf_counter() >= deadline:
+                return False
+            time.sleep(self.POLL_INTERVAL)
+
+    def _cancel_restore(self) -> Optional[str]:
+        """Cancel a pending restore and return the text it would have restored"""
+        with self._restore_lock:
+            if self._restore_timer is None:
+                return None
+            self._restore_timer.cancel()
+            previous = self._restore_text
+            self._restore_timer = self._restore_text = None
+            return previous
+
+    def _schedule_restore(self, previous: str, pasted: str, sequence: Optional[int]):
+        """Restore the previous clipboard text unless something else replaced ours meanwhile"""
+        def restore():
+            with self._restore_lock:
+                if self._restore_timer is not timer:
+                    return  # Superseded by a newer take
+                self._restore_timer = self._restore_text = None
+            try:
+                if sequence is not None:
+                    unchanged = self.clipboard.sequence_number() == sequence
+                else:
+                    unchanged = self.clipboard.get_text() == pasted
+                if unchanged:
+                    self.clipboard.set_text(previous)
+            except Exception as e:
+                print(f"Could not restore clipboard: {e}")
+
+        timer = threading.Timer(self.restore_delay, restore)
+        timer.daemon = True
+        with self._restore_lock:
+            self._restore_timer, self._restore_text = timer, previous
+        timer.start()
@@ -1,20 +1,17 @@
+import contextvars
+import threading
 import time
-import pyperclip
-import pyautogui
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
-from src.providers.transcription import (
-    TranscriptionProvider,
-    GroqWhisperProvider,
-    OpenAIWhisperProvider,
-    DeepgramProvider
-)
-from src.providers.llm import (
-    LLMProvider,
-    OllamaProvider,
-    OpenAILLMProvider,
-    GroqLLMProvider
-)
+from src.core.chunking import chunk_text
+from src.core.language_id import LanguageIdentifier
+from src.core.pipeline import FormatStage, OutputStage, Pipeline, TranscribeStage
+from src.core.text_output import TextOutput
+from src.core.tracing import span
+from src.core.vocabulary import Vocabulary
+from src.providers.llm.prompts import use_language
+from src.providers.registry import ProviderRegistry
 
 
 class TextProcessor:
@@ -22,69 +19,20 @@ class TextProcessor:
 
     def __init__(self, config: dict):
         self.config = config
-        self.transcription_provider = self._create_transcription_provider()
-        self.llm_provider = self._create_llm_provider()
-
-    def _create_transcription_provider(self) -> TranscriptionProvider:
-        """Create transcription provider based on config"""
-        trans_config = self.config.get('transcription', {})
-        provider_name = trans_config.get('provider', 'groq')
-        api_key = self._get_transcription_api_key()
-
-        if provider_name == 'groq':
-            return GroqWhisperProvider(api_key=api_key)
-        elif provider_name == 'openai':
-            return OpenAIWhisperProvider(api_key=api_key)
-        elif provider_name == 'deepgram':
-            return DeepgramProvider(api_key=api_key)
-        else:
-            raise ValueError(f"Unknown transcription provider: {provider_name}")
-
-    def _create_llm_provider(self) -> LLMProvider:
-        """Create LLM provider based on config"""
-        llm_config = self.config.get('llm', {})
-        provider_name = llm_config.get('provider', 'ollama')
-        model = llm_config.get('model', 'llama3.2:3b')
-        api_key = self._get_llm_api_key()
-
-        if provider_name == 'ollama':
-            ollama_url = llm_config.get('ollama_url', 'http://localhost:11434')
-            return OllamaProvider(
-                model=model,
-                ollama_url=ollama_url,
-                temperature=llm_config.get('temperature', 0.3),
-                max_tokens=llm_config.get('max_tokens', 500)
-            )
-        elif provider_name == 'openai':
-            return OpenAILLMProvider(
-                api_key=api_key,
-                model=model or 'gpt-4o-mini',
-                temperature=llm_config.get('temperature', 0.3),
-                max_tokens=llm_config.get('max_tokens', 500)
-            )
-        elif provider_name == 'groq':
-            return GroqLLMProvider(
-                api_key=api_key,
-                model=model or 'llama-3.1-8b-instant',
-                temperature=llm_config.get('temperature', 0.3),
-                max_tokens=llm_config.get('max_tokens', 500)
-            )
-        else:
-            raise ValueError(f"Unknown LLM provider: {provider_name}")
-
-    def _get_transcription_api_key(self) -> str:
-        """Get transcription API key from config"""
-        from src.core.config_manager import ConfigManager
-        config_manager = ConfigManager()
-        config_manager.config = self.config
-        return config_manager.get_transcription_api_key()
-
-    def _get_llm_api_key(self) -> str:
-        """Get LLM API key from config"""
-        from src.core.config_manager import ConfigManager
-        config_manager = ConfigManager()
-        config_manager.config = self.config
-        return config_manager.get_llm_api_key()
+        self.providers = ProviderRegistry()
+        self.transcription_provider = self.providers.transcription_provider(config)
+        self.llm_provider = self.providers.llm_provider(config)
+        self.text_output = TextOutput.from_config(self.config.get('behavior', {}))
+        self.vocabulary = Vocabulary.from_config(self.config.get('vocabulary', {}))
+        self.language_id = self._language_identifier(self.config)
+        self._llm_pool = None
+        self._llm_pool_size = 0
+        self._llm_pool_lock = threading.Lock()
+
+    def warm_up(self):
+        """Warm up providers in the background so the first request doesn't pay a cold start"""
+        llm_provider = self.llm_provider
+        threading.Thread(target=llm_provider.warm_up, daemon=True).start()
 
     def process_audio(self, audio_data: bytes, status_callback: Optional[callable] = None) -> str:
         """
@@ -102,58 +50,177 @@ class TextProcessor:
         """
         start_time = time.time()
 
-        # Step 1: Transcribe
+        results = list(self.pipeline(status_callback).run([audio_data]))
+        if not results:
+            raise Exception("No speech detected")
+        clean_text = results[0]
+
+        total_time = time.time() - start_time
+        print(f"Total processing time: {total_time:.2f}s")
+
         if status_callback:
-            status_callback("Transcribing...")
+            status_callback("Done!")
+
+        return clean_text
+
+    def pipeline(self, status_callback: Optional[callable] = None, output: bool = True,
+                 on_transcript: Optional[callable] = None) -> Pipeline:
+        """
+        Stage graph for recorded takes: WAV → transcribe → format → output.
+
+        Every take goes through it (the app, process_audio and the local
+        service), so stages added here apply to real dictations.
+
+        Args:
+            status_callback: Optional callback for status updates
+            output: Include the output stage (clipboard/paste)
+            on_transcript: Called with each raw transcript
+        """
+        stages = [TranscribeStage(self, status_callback, on_transcript), FormatStage(self, status_callback)]
+        if output:
+            stages.append(OutputStage(self, status_callback))
+        return Pipeline(stages)
+
+    def transcribe_and_format(self, audio_data: bytes, status_callback: Optional[callable] = None) -> tuple:
+        """
+        Transcribe audio and format the transcript (safe to run for several takes at once)
+
+        Runs the pipeline without its output stage: takes are pasted in
+        recording order by the DictationQueue.
+
+        Args:
+            audio_data: Audio file bytes (WAV)
+            status_callback: Optional callback for status updates
+
+        Returns:
+            (raw transcript, formatted text)
+
+        Raises:
+            Exception: If transcription or formatting fails
+        """
+        raw_texts = []
+        results = list(self.pipeline(status_callback, output=False, on_transcript=raw_texts.append).run([audio_data]))
+        if not results:
+            raise Exception("No speech detected")
+        return raw_texts[0], results[0]
 
+    def transcribe(self, audio_data: bytes) -> str:
+        """Transcribe WAV audio with the configured provider"""
         trans_start = time.time()
-        language = self.config.get('transcription', {}).get('options', {}).get('language', 'auto')
-        raw_text = self.transcription_provider.transcribe(audio_data, language=language)
+        language = self.transcription_language(audio_data)
+        with span('transcription', language=language):
+            raw_text = self.transcription_provider.transcribe(audio_data, language=language)
         trans_time = time.time() - trans_start
+        if self.language_id:
+            self.language_id.observe(raw_text, pinned=language if language != self._configured_language() else None)
 
-        if not raw_text.strip():
-            raise Exception("No speech detected")
+        print(f"Transcription ({trans_time:.2f}s, language: {language}): {raw_text}")
+        return raw_text
 
-        print(f"Transcription ({trans_time:.2f}s): {raw_text}")
+    def transcription_language(self, audio_data: bytes) -> str:
+        """Language to request: the configured one, or the recent dictation language for short takes"""
+        configured = self._configured_language()
+        if not self.language_id:
+            return configured
+        return self.language_id.choose(audio_data, configured)
 
-        # Step 2: LLM Post-processing
-        if status_callback:
-            status_callback("Processing...")
+    def _configured_language(self) -> str:
+        return self.config.get('transcription', {}).get('options', {}).get('language', 'auto')
+
+    def post_process(self, raw_text: str) -> str:
+        """Fix vocabulary terms, then format the transcript with the LLM"""
+        raw_text = self.correct_vocabulary(raw_text)
 
+        language = self.language_id.text_language(raw_text) if self.language_id else None
         llm_start = time.time()
-        clean_text = self.llm_provider.process(raw_text)
+        with span('llm'), use_language(language):
+            clean_text = self.format_text(raw_text)
         llm_time = time.time() - llm_start
 
         print(f"LLM processing ({llm_time:.2f}s): {clean_text}")
+        return clean_text
 
-        # Step 3: Copy to clipboard
-        if status_callback:
-            status_callback("Copying...")
+    def correct_vocabulary(self, raw_text: str) -> str:
+        """Write personal vocabulary terms in their canonical spelling (before the LLM)"""
+        if not self.vocabulary:
+            return raw_text
+        with span('vocabulary'):
+            corrected = self.vocabulary.apply(raw_text)
+        if corrected != raw_text:
+            print(f"Vocabulary: {corrected}")
+        return corrected
+
+    def output_text(self, text: str, status_callback: Optional[callable] = None):
+        """
+        Insert text into the active app, or just copy it if auto-paste is off (one take at a time)
+
+        Args:
+            text: Text to insert
+            status_callback: Optional callback for status updates
 
-        pyperclip.copy(clean_text)
+        Raises:
+            Exception: If the clipboard can't be written or pasting fails
+        """
+        # Step 3: Clipboard / typing + paste
+        method = self.text_output.output(text, status_callback)
+        print(f"Text {method} ({len(text)} chars)")
 
-        # Step 4: Auto-paste if enabled
-        auto_paste = self.config.get('behavior', {}).get('auto_paste', True)
-        if auto_paste:
-            if status_callback:
-                status_callback("Pasting...")
+    def format_text(self, raw_text: str) -> str:
+        """
+        Format a transcript with the LLM.
 
-            time.sleep(0.1)  # Small delay for clipboard to be ready
-            try:
-                pyautogui.hotkey('ctrl', 'v')
-            except:
-                pass  # Silently fail if paste doesn't work
+        Long transcripts are split at sentence-like boundaries into chunks of at
+        most llm.chunk_words words, formatted concurrently (up to
+        llm.max_concurrency requests at a time) and joined back in order.
+        Each request's output budget is derived from its own chunk length.
 
-        total_time = time.time() - start_time
-        print(f"Total processing time: {total_time:.2f}s")
+        Args:
+            raw_text: Transcribed text
 
-        if status_callback:
-            status_callback("Done!")
+        Returns:
+            Formatted text
+        """
+        llm_config = self.config.get('llm', {})
+        chunks = chunk_text(raw_text, llm_config.get('chunk_words', 120))
+        llm_provider = self.llm_provider
+
+        if len(chunks) == 1:
+            return llm_provider.process(raw_text)
+
+        pool = self._get_llm_pool(llm_config.get('max_concurrency', 3))
+        print(f"Formatting {len(chunks)} chunks concurrently")
+        # Each request runs in a copy of this context, so its spans reach the active trace
+        contexts = [contextvars.copy_context() for _ in chunks]
+        return ' '.join(pool.map(lambda context, chunk: context.run(llm_provider.process, chunk), contexts, chunks))
+
+    @staticmethod
+    def _language_identifier(config: dict) -> Optional[LanguageIdentifier]:
+        language_config = config.get('language_id', {})
+        if not language_config.get('enabled', True):
+            return None
+        return LanguageIdentifier.from_config(language_config)
+
+    def _get_llm_pool(self, size: int) -> ThreadPoolExecutor:
+        """
+        Get the bounded pool for concurrent LLM requests, resized if the config changed.
 
-        return clean_text
+        Takes formatted in parallel share the pool, so it is created and swapped
+        under a lock. A replaced pool is not shut down, since another take may
+        still be submitting to it: its idle workers exit once it is garbage collected.
+        """
+        size = max(1, size)
+        with self._llm_pool_lock:
+            if self._llm_pool is None or self._llm_pool_size != size:
+                self._llm_pool = ThreadPoolExecutor(max_workers=size, thread_name_prefix="llm")
+                self._llm_pool_size = size
+            return self._llm_pool
 
     def reload_config(self, config: dict):
-        """Reload configuration and recreate providers"""
+        """Reload configuration; providers are rebuilt only if their config changed"""
+        if config.get('language_id') != self.config.get('language_id'):
+            self.language_id = self._language_identifier(config)
         self.config = config
-        self.transcription_provider = self._create_transcription_provider()
-        self.llm_provider = self._create_llm_provider()
+        self.transcription_provider = self.providers.transcription_provider(config)
+        self.llm_provider = self.providers.llm_provider(config)
+        self.text_output = TextOutput.from_config(config.get('behavior', {}))
+        self.vocabulary = Vocabulary.from_config(config.get('vocabulary', {}))
@@ -0,0 +1,249 @@
+"""
+Per-stage latency tracing for dictations.
+
+Each take gets a Trace. Code anywhere in the pipeline records stages with
+`with span("name"):`, and spans go to whichever trace is active in the
+current context (see use_trace). Finished traces are appended to a rotating
+JSONL log, and the report command summarizes them into percentiles:
+
+    python -m src.core.tracing logs/traces.jsonl --by llm_provider
+"""
+import argparse
+import contextvars
+import json
+import logging
+import math
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from typing import Optional
+
+_current_trace = contextvars.ContextVar('dictation_trace', default=None)
+
+
+class Trace:
+    """Timeline of one dictation: named spans relative to the trace start"""
+
+    def __init__(self, **attrs):
+        """
+        Args:
+            **attrs: Trace attributes (e.g. transcription_provider, llm_provider)
+        """
+        self.id = uuid.uuid4().hex[:12]
+        self.attrs = attrs
+        self.wall_time = time.time()
+        self.start = time.perf_counter()
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def add_span(self, name: str, start: float, end: float, **attrs):
+        """
+        Record a stage measured with time.perf_counter().
+
+        Args:
+            name: Stage name
+            start: perf_counter() value at the start of the stage
+            end: perf_counter() value at the end of the stage
+            **attrs: Stage attributes (e.g. provider, path, error)
+        """
+        record = {
+            'name': name,
+            'start_ms': round((start - self.start) * 1000, 2),
+            'duration_ms': round((end - start) * 1000, 2),
+        }
+        if attrs:
+            record['attrs'] = attrs
+        with self._lock:
+            self.spans.append(record)
+
+    def durations(self) -> dict:
+        """Total milliseconds per stage name (stages can repeat, e.g. LLM chunks)"""
+        totals = {}
+        for record in self.spans:
+            totals[record['name']] = totals.get(record['name'], 0.0) + record['duration_ms']
+        return totals
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            spans = sorted(self.spans, key=lambda record: record['start_ms'])
+        return {
+            'id': self.id,
+            'time': self.wall_time,
+            'total_ms': round((time.perf_counter() - self.start) * 1000, 2),
+            'attrs': self.attrs,
+            'spans': spans,
+        }
+
+
+def current_trace() -> Optional[Trace]:
+    """The trace active in this context, if any"""
+    return _current_trace.get()
+
+
+@contextmanager
+def use_trace(trace: Optional[Trace]):
+    """Make trace the active trace for the enclosed code"""
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+
+
+@contextmanager
+def span(name: str, **attrs):
+    """
+    Time the enclosed code as a stage of the active trace (no-op without one).
+
+    Failures are recorded with an 'error' attribute and re-raised.
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception as e:
+        trace.add_span(name, start, time.perf_counter(), error=type(e).__name__, **attrs)
+        raise
+    trace.add_span(name, start, time.perf_counter(), **attrs)
+
+
+class TraceLog:
+    """Appends finished traces to a size-rotated JSONL file"""
+
+    def __init__(self, path: str, max_bytes: int = 1024 * 1024, backup_count: int = 5):
+        """
+        Args:
+            path: Log file path (rotated to path.1, path.2...)
+            max_bytes: Size at which the log is rotated
+            backup_count: Rotated files kept
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.logger = logging.getLogger(f"{__name__}.{self.path}")
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+        if not self.logger.handlers:
+            handler = RotatingFileHandler(self.path, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8')
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            self.logger.addHandler(handler)
+
+    def write(self, trace: Trace):
+        try:
+            self.logger.info(json.dumps(trace.to_dict(), ensure_ascii=False))
+        except Exception as e:
+            print(f"Could not write trace: {e}")
+
+    def close(self):
+        for handler in list(self.logger.handlers):
+            handler.close()
+            self.logger.removeHandler(handler)
+
+
+def load_traces(path: str) -> list:
+    """
+    Read traces from a JSONL log and its rotated backups (oldest first).
+
+    Unreadable lines (e.g. cut by a crash) are skipped.
+    """
+    path = Path(path)
+    backups = sorted(path.parent.glob(path.name + '.*'),
+                     key=lambda p: int(p.suffix[1:]) if p.suffix[1:].isdigit() else 0, reverse=True)
+
+    traces = []
+    for file in backups + [path]:
+        if not file.exists():
+            continue
+        with open(file, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    traces.append(json.loads(line))
+                except ValueError:
+                    continue
+    return traces
+
+
+def percentile(values: list, p: float) -> float:
+    """Percentile with linear interpolation between closest ranks"""
+    ordered = sorted(values)
+    if not ordered:
+        return math.nan
+    rank = (len(ordered) - 1) * p / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(traces: list, by: str = 'providers') -> dict:
+    """
+    Per-stage latency percentiles.
+
+    Args:
+        traces: Trace dicts (see Trace.to_dict)
+        by: Trace attribute to group by; 'providers' groups by the
+            transcription + LLM provider pair
+
+    Returns:
+        {group: {stage: {'count', 'p50', 'p95', 'p99'}}} in milliseconds;
+        'total' covers the whole dictation
+    """
+    samples = {}
+    for trace in traces:
+        attrs = trace.get('attrs', {})
+        if by == 'providers':
+            group = f"{attrs.get('transcription_provider', '?')}+{attrs.get('llm_provider', '?')}"
+        else:
+            group = str(attrs.get(by, '?'))
+
+        stages = samples.setdefault(group, {})
+        totals = {}
+        for record in trace.get('spans', []):
+            totals[record['name']] = totals.get(record['name'], 0.0) + record['duration_ms']
+        totals['total'] = trace.get('total_ms', 0.0)
+        for name, duration in totals.items():
+            stages.setdefault(name, []).append(duration)
+
+    return {
+        group: {
+            name: {
+                'count': len(values),
+                'p50': percentile(values, 50),
+                'p95': percentile(values, 95),
+                'p99': percentile(values, 99),
+            }
+            for name, values in stages.items()
+        }
+        for group, stages in samples.items()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize dictation traces")
+    parser.add_argument('path', nargs='?', default='logs/traces.jsonl', help="Trace log (JSONL)")
+    parser.add_argument('--by', default='providers',
+                        help="Group by: providers, transcription_provider, llm_provider")
+    parser.add_argument('--json', action='store_true', help="Print the summary as JSON")
+    args = parser.parse_args()
+
+    traces = load_traces(args.path)
+    summary = summarize(traces, by=args.by)
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return
+
+    print(f"{len(traces)} traces from {args.path}")
+    for group, stages in summary.items():
+        print(f"\n{group}")
+        print(f"  {'stage':<18} {'n':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+        for name, stats in sorted(stages.items(), key=lambda item: -item[1]['p50']):
+            print(f"  {name:<18} {stats['count']:>5} {stats['p50']:>9.1f} {stats['p95']:>9.1f} {stats['p99']:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Personal vocabulary: fixes product names and jargon in raw transcripts.
+
+Terms ("Playwright", "MailerLite") are matched case-insensitively and
+written in their canonical spelling; replacements map what the speech
+recognizer tends to hear ("play right", "mailer light") to the right term.
+All phrases are compiled into a word trie, so a transcript is corrected in
+a single left-to-right pass (longest match wins), whatever the vocabulary
+size. Terms are also sent to the transcription provider as a hint.
+"""
+import re
+from typing import Iterable, Optional
+
+_WORD_RE = re.compile(r"\w+(?:['’]\w+)*", re.UNICODE)
+# Only spaces and hyphens may separate the words of a phrase ("play-right", not "play. Right")
+_JOINER_RE = re.compile(r"[\s\-]+")
+
+_END = ''  # Trie key holding the replacement of the phrase ending at a node
+
+
+class Vocabulary:
+    """Compiled phrase → replacement trie over lowercase words"""
+
+    def __init__(self, terms: Iterable[str] = (), replacements: Optional[dict] = None):
+        """
+        Args:
+            terms: Canonical spellings, matched case-insensitively
+            replacements: {heard phrase: replacement}, e.g. {"play right": "Playwright"}
+        """
+        self.terms = [term.strip() for term in terms if term and term.strip()]
+        self.replacements = dict(replacements or {})
+        self._trie = {}
+        for term in self.terms:
+            self._add(term, term)
+        for phrase, replacement in self.replacements.items():
+            self._add(phrase, replacement)
+
+    @classmethod
+    def from_config(cls, vocabulary_config: dict) -> 'Vocabulary':
+        """Build from the 'vocabulary' config section"""
+        return cls(vocabulary_config.get('terms', []), vocabulary_config.get('replacements', {}))
+
+    def __bool__(self) -> bool:
+        return bool(self._trie)
+
+    def _add(self, phrase: str, replacement: str):
+        words = [word.lower() for word in _WORD_RE.findall(phrase)]
+        if not words:
+            return
+        node = self._trie
+        for word in words:
+            node = node.setdefault(word, {})
+        node[_END] = replacement
+
+    def apply(self, text: str) -> str:
+        """
+        Replace every vocabulary phrase in text (single pass, longest match first).
+
+        Args:
+            text: Raw transcript
+
+        Returns:
+            Corrected transcript
+        """
+        if not self._trie:
+            return text
+
+        words = list(_WORD_RE.finditer(text))
+        parts, position, i = [], 0, 0
+        while i < len(words):
+            node, match_end, replacement = self._trie, None, None
+            j = i
+            while j < len(words):
+                if j > i and not _JOINER_RE.fullmatch(text, words[j - 1].end(), words[j].start()):
+                    break
+                node = node.get(words[j].group().lower())
+                if node is None:
+                    break
+                if _END in node:
+                    match_end, replacement = j, node[_END]
+                j += 1
+
+            if match_end is None:
+                i += 1
+                continue
+            parts.append(text[position:words[i].start()])
+            parts.append(replacement)
+            position = words[match_end].end()
+            i = match_end + 1
+
+        parts.append(text[position:])
+        return ''.join(parts)
+
+    def hint_terms(self) -> list:
+        """Terms to pass to the transcription provider (canonical spellings, no duplicates)"""
+        seen, terms = set(), []
+        for term in self.terms + list(self.replacements.values()):
+            if term.lower() not in seen:
+                seen.add(term.lower())
+                terms.append(term)
+        return terms
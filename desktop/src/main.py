@@ -9,15 +9,40 @@ import os
 import sys
 import threading
 import time
-import tkinter as tk
 
+STARTUP_TIME = time.perf_counter()
+
+# Only what the tray and the hotkey need is imported up front. The audio stack
+# (numpy, sounddevice), the HTTP providers and the Tk windows are imported when
+# the pipeline loads in the background or on first use.
 from src.core.config_manager import ConfigManager
-from src.core.audio_recorder import AudioRecorder
+from src.core.dispatcher import Dispatcher, StateMachine
 from src.core.hotkey_manager import HotkeyManager
-from src.core.text_processor import TextProcessor
 from src.ui.system_tray import SystemTray
-from src.ui.settings_window import SettingsWindow
-from src.ui.recording_widget import RecordingWidget
+
+# Set to print a marker and exit as soon as the tray is up (startup benchmark)
+STARTUP_PROBE_ENV = 'VOICE_DICTATION_STARTUP_PROBE'
+
+# Recorder states. Takes being transcribed/pasted are tracked by the DictationQueue,
+# so a new take can be recorded while earlier ones are still processing.
+LOADING = 'loading'  # Pipeline loading in the background
+IDLE = 'idle'
+RECORDING = 'recording'
+FAILED = 'failed'  # Pipeline failed to load
+
+TRANSITIONS = {
+    (LOADING, 'loaded'): IDLE,
+    (LOADING, 'load_failed'): FAILED,
+    (FAILED, 'retry'): LOADING,  # Settings saved after a failed load
+    (IDLE, 'start'): RECORDING,
+    (RECORDING, 'stop'): IDLE,  # Hotkey or silence timeout: the take is queued
+    (RECORDING, 'cancel'): IDLE,  # ESC: the take is discarded
+    (RECORDING, 'fail'): IDLE,  # Audio error: the take is discarded
+}
+
+RECORD_TICK = 0.1  # Seconds between audio buffer polls
+AUTO_GAIN_TICKS = 30  # Check the level after ~3 seconds
+SILENCE_TIMEOUT = 60.0  # Auto-stop after 60 seconds of silence
 
 
 class VoiceDictationApp:
@@ -37,10 +62,12 @@ class VoiceDictationApp:
         llm_provider = self.config.get('llm', {}).get('provider', '')
         llm_key = self.config_manager.get_llm_api_key()
 
-        # Ollama doesn't need API key
-        llm_needs_key = llm_provider not in ['ollama']
+        # Local providers don't need API keys
+        local_providers = ['ollama', 'openai_compatible', 'punct']
+        trans_needs_key = self.config.get('transcription', {}).get('provider', '') not in local_providers
+        llm_needs_key = llm_provider not in local_providers
 
-        if not trans_key or (llm_needs_key and not llm_key):
+        if (trans_needs_key and not trans_key) or (llm_needs_key and not llm_key):
             print("\n" + "!"*60)
             print("WARNING: No API keys configured!")
             print("!"*60)
@@ -56,22 +83,80 @@ class VoiceDictationApp:
         self.audio_recorder = None
         self.hotkey_manager = None
         self.text_processor = None
+        self.dictation_queue = None
+        self.trace_log = None
+        self.dictation_service = None  # Optional localhost API for other tools
+        self.recording_archive = None  # Last takes, for debugging
+        self.history = None  # Searchable history of pasted dictations
+        self.history_window = None
+        self.current_trace = None  # Trace of the take being recorded
         self.system_tray = None
-        self.recording_widget = None
+        self.widget = None  # RecordingWidget on the Tk root, reused by every take
+        self.recording_widget = None  # The current take's view of the widget
         self.root = None  # Tk root for settings window
 
         self.is_running = False
-        self.is_recording = False
-        self.is_cancelled = False
-        self.recording_thread = None
+        self.pipeline_error = None
+
+        # Hotkeys, audio ticks and UI transitions are handled one at a time on the
+        # dispatcher thread; only it reads or changes the state and the fields below
+        self.dispatcher = Dispatcher(max_workers=2)
+        self.state = StateMachine(LOADING, TRANSITIONS, on_change=self._on_state_change)
+        self._record_timer = None  # Next audio tick of the current take
+        self._record_ticks = 0
+        self._auto_gain_applied = False
+        self._start_when_loaded = False  # Hotkey pressed while the pipeline was loading
+        self._pending_config = None  # Settings saved while recording, applied after the take
 
         self._initialize()
 
     def _initialize(self):
-        """Initialize all components"""
+        """Initialize the hotkey and tray now; load the dictation pipeline in the background"""
         print("Initializing Voice Dictation MVP...")
 
         try:
+            # Hotkey manager
+            print("- Loading hotkey manager...")
+            self.hotkey_manager = HotkeyManager()
+            self._register_hotkey()
+            print("  [OK] Hotkey manager loaded")
+
+            # System tray
+            print("- Loading system tray...")
+            self.system_tray = SystemTray(
+                on_settings=self._show_settings,
+                on_history=self._show_history,
+                on_exit=self._exit,
+                on_ready=self._on_tray_ready
+            )
+            print("  [OK] System tray loaded")
+
+            self.is_running = True
+
+        except Exception as e:
+            print(f"\n[ERROR] Initialization failed at: {e}")
+            raise
+
+        self.dispatcher.start()
+        self.dispatcher.run_in_worker(self._load_pipeline, on_done=self._on_pipeline_loaded)
+
+    @property
+    def is_recording(self) -> bool:
+        return self.state.state == RECORDING
+
+    def _load_pipeline(self):
+        """Load audio recorder, text processor and queue (heavy imports happen here)"""
+        try:
+            from src.core.audio_recorder import AudioRecorder
+            from src.core.dictation_queue import DictationQueue
+            from src.core.history import HistoryStore
+            from src.core.recording_archive import RecordingArchive
+            from src.core.text_processor import TextProcessor
+            from src.core.tracing import TraceLog
+
+            # A retry after a failed load replaces whatever the last attempt built
+            self._release_pipeline()
+
             # Audio recorder
             print("- Loading audio recorder...")
             audio_config = self.config.get('audio', {})
@@ -85,29 +170,108 @@ class VoiceDictationApp:
             # Text processor
             print("- Loading text processor...")
             self.text_processor = TextProcessor(self.config)
+            self.text_processor.warm_up()
+            # Takes are processed concurrently and pasted in recording order
+            self.dictation_queue = DictationQueue(
+                process=self._process_job,
+                output=self._output_job,
+                max_workers=self.config.get('behavior', {}).get('parallel_takes', 2),
+                on_error=self._job_failed
+            )
             print("  [OK] Text processor loaded")
 
-            # Hotkey manager
-            print("- Loading hotkey manager...")
-            self.hotkey_manager = HotkeyManager()
-            self._register_hotkey()
-            print("  [OK] Hotkey manager loaded")
+            # Per-stage latency traces
+            tracing_config = self.config.get('tracing', {})
+            if tracing_config.get('enabled', True):
+                self.trace_log = TraceLog(
+                    self._app_path('logs', 'traces.jsonl'),
+                    max_bytes=tracing_config.get('max_bytes', 1024 * 1024),
+                    backup_count=tracing_config.get('backup_count', 5)
+                )
 
-            # System tray
-            print("- Loading system tray...")
-            self.system_tray = SystemTray(
-                on_settings=self._show_settings,
-                on_exit=self._exit
-            )
-            print("  [OK] System tray loaded")
+            # Compressed archive of the last takes
+            recordings_config = self.config.get('recordings', {})
+            if recordings_config.get('enabled', True):
+                self.recording_archive = RecordingArchive.from_config(self._app_path('recordings'), recordings_config)
+
+            # Dictation history (SQLite, full-text search)
+            history_config = self.config.get('history', {})
+            if history_config.get('enabled', True):
+                self.history = HistoryStore(
+                    self._app_path('history.db'),
+                    max_entries=history_config.get('max_entries', 10000)
+                )
+                self._seed_language_id()
 
-            self.is_running = True
-            print("\n[OK] Initialization complete!\n")
+            # Localhost service for editors and scripts (off by default)
+            service_config = self.config.get('service', {})
+            if service_config.get('enabled', False):
+                self._start_dictation_service(service_config)
 
+            print("\n[OK] Initialization complete!\n")
         except Exception as e:
-            print(f"\n[ERROR] Initialization failed at: {e}")
+            print(f"\n[ERROR] Pipeline initialization failed: {e}")
+            import traceback
+            traceback.print_exc()
             raise
 
+    def _release_pipeline(self):
+        """Stop and close what a previous pipeline load built (threads, SQLite, port)"""
+        if self.dictation_service:
+            self.dictation_service.stop()
+            self.dictation_service = None
+
+        if self.dictation_queue:
+            self.dictation_queue.shutdown(wait=False)
+            self.dictation_queue = None
+
+        if self.recording_archive:
+            self.recording_archive.close()
+            self.recording_archive = None
+
+        if self.history:
+            self.history.close()
+            self.history = None
+            self.history_window = None  # Bound to the closed store
+
+        if self.trace_log:
+            self.trace_log.close()
+            self.trace_log = None
+
+    def _on_pipeline_loaded(self, future):
+        """Pipeline load finished (dispatcher): start a recording requested meanwhile"""
+        self.pipeline_error = future.exception()
+        if self.pipeline_error:
+            self.state.fire('load_failed')
+            if self._start_when_loaded:
+                self._start_when_loaded = False
+                self.system_tray.notify("Error", f"Initialization failed: {self.pipeline_error}")
+            return
+
+        self.state.fire('loaded')
+        if self._start_when_loaded:
+            self._start_when_loaded = False
+            self._start_recording(time.perf_counter())
+
+    def _start_dictation_service(self, service_config: dict):
+        """Serve the text processor on localhost (a busy port doesn't stop the app)"""
+        from src.core.dictation_service import DictationService
+
+        try:
+            self.dictation_service = DictationService.from_config(
+                self.text_processor, service_config, on_trace=self._write_trace
+            ).start()
+        except OSError as e:
+            print(f"Could not start dictation service on port {service_config.get('port')}: {e}")
+
+    def _on_tray_ready(self):
+        """Tray icon is visible: the app is usable"""
+        elapsed = time.perf_counter() - STARTUP_TIME
+        print(f"Tray ready after {elapsed:.2f}s")
+        if os.environ.get(STARTUP_PROBE_ENV):
+            print(f"[startup] tray_ready {elapsed:.4f}", flush=True)
+            os._exit(0)
+
     def _register_hotkey(self):
         """Register global hotkey"""
         hotkey_config = self.config.get('hotkey', {})
@@ -118,13 +282,13 @@ class VoiceDictationApp:
         if not isinstance(modifiers, list):
             print(f"Warning: modifiers is not a list: {modifiers}, using default ['ctrl', 'shift']")
             modifiers = ['ctrl', 'shift']
-            self.config['hotkey']['modifiers'] = modifiers
+            self.config_manager.update('hotkey', modifiers=modifiers)
 
         # Validate key is not empty
         if not key or key.strip() == '':
             print("Error: Hotkey key is empty, using default 'space'")
             key = 'space'
-            self.config['hotkey']['key'] = 'space'
+            self.config_manager.update('hotkey', key=key)
 
         try:
             print(f"Attempting to register hotkey: {'+'.join(modifiers + [key])}")
@@ -141,193 +305,191 @@ class VoiceDictationApp:
             traceback.print_exc()
 
     def _toggle_recording(self):
-        """Toggle recording on/off"""
-        if self.is_recording:
+        """Hotkey: start or stop recording (handled on the dispatcher)"""
+        self.dispatcher.post(self._on_toggle, time.perf_counter())
+
+    def _cancel_recording(self):
+        """ESC: discard the current take (handled on the dispatcher)"""
+        self.dispatcher.post(self._on_cancel)
+
+    def _on_state_change(self, old_state: str, event: str, new_state: str):
+        """Reflect a state transition in the tray"""
+        print(f"State: {old_state} -> {new_state} ({event})")
+        self.system_tray.set_recording(new_state == RECORDING)
+        if new_state == RECORDING:
+            self.system_tray.set_status("Recording...")
+        elif new_state == LOADING:
+            self.system_tray.set_status("Loading...")
+        elif new_state == FAILED:
+            self.system_tray.set_status("Error!")
+        elif event == 'cancel':
+            self.system_tray.set_status("Cancelled")
+
+        if old_state in (LOADING, RECORDING) and self._pending_config:
+            new_config, self._pending_config = self._pending_config, None
+            self._on_config_saved(new_config)  # Applied, or loaded again if the load failed
+
+    def _on_toggle(self, hotkey_time: float):
+        if self.state.state == RECORDING:
             self._stop_recording()
+        elif self.state.state == IDLE:
+            self._start_recording(hotkey_time)
+        elif self.state.state == LOADING:
+            print("Pipeline still loading, recording starts when ready")
+            self._start_when_loaded = True
+            self.system_tray.set_status("Loading...")
         else:
-            self._start_recording()
+            self.system_tray.set_status("Error!")
+            self.system_tray.notify("Error", f"Initialization failed: {self.pipeline_error}")
 
-    def _start_recording(self):
-        """Start recording audio"""
-        if self.is_recording:
-            return
+    def _start_recording(self, hotkey_time: float):
+        """Start recording audio (dispatcher, IDLE)"""
+        from src.core.tracing import Trace
+
+        trace = Trace(
+            transcription_provider=self.config.get('transcription', {}).get('provider', ''),
+            llm_provider=self.config.get('llm', {}).get('provider', '')
+        )
 
         print("\n=== Recording started ===")
-        self.is_recording = True
-        self.is_cancelled = False
-        self.system_tray.set_recording(True)
-        self.system_tray.set_status("Recording...")
 
-        # Show recording widget
-        self.recording_widget = RecordingWidget()
-        self.recording_widget.show()
+        # Show recording widget (once the Tk root is up)
+        if self.widget:
+            self.recording_widget = self.widget.show()
+
+        # Make sure the LLM is loaded by the time the transcript arrives
+        self.text_processor.warm_up()
 
         try:
             self.audio_recorder.start_recording()
         except Exception as e:
             print(f"Failed to start recording: {e}")
-            # Reset state
-            self.is_recording = False
-            self.system_tray.set_recording(False)
+            self._cleanup_audio_recorder()
+            self._hide_recording_widget()
             self.system_tray.set_status(f"Error: {str(e)[:50]}")
-            if self.recording_widget:
-                self.recording_widget.hide()
-                self.recording_widget = None
             return
 
-        # Start recording thread
-        self.recording_thread = threading.Thread(target=self._record_loop, daemon=True)
-        self.recording_thread.start()
-
-    def _record_loop(self):
-        """Record audio in loop until stopped"""
-        silence_timeout = 60.0  # Auto-stop after 60 seconds of silence
-        auto_gain_applied = False
-        chunks_recorded = 0
-
-        while self.is_recording:
-            try:
-                self.audio_recorder.record_chunk(duration=0.1)
-                chunks_recorded += 1
-
-                # Auto-gain: Check audio level after first 3 seconds (~30 chunks)
-                if chunks_recorded == 30 and not auto_gain_applied:
-                    audio_level = self.audio_recorder.get_recent_audio_level()
-                    if audio_level < 300 and audio_level > 0:  # Very low but not silent
-                        # Calculate suggested gain
-                        target_avg = 2000
-                        suggested_gain = min(10.0, target_avg / (audio_level + 1))
-                        suggested_gain = round(suggested_gain, 1)
-
-                        # Apply gain immediately (affects future chunks via callback)
-                        old_gain = self.audio_recorder.volume_multiplier
-                        self.audio_recorder.volume_multiplier = suggested_gain
-
-                        # Show notification in widget
-                        if self.recording_widget:
-                            self.recording_widget.update_status(
-                                status=f"🔊 Auto-gain applied: {old_gain}x → {suggested_gain}x",
-                                stop_animation=True
-                            )
-
-                        print(f"AUTO-GAIN: Audio level low ({audio_level:.1f}), applied gain {suggested_gain}x")
-
-                        # Save new gain to config
-                        self.config['audio']['volume_gain'] = suggested_gain
-                        self.config_manager.save(self.config)
-                        print(f"Saved new gain {suggested_gain}x to config")
-
-                        auto_gain_applied = True
-
-                # Check for silence timeout
-                silence_duration = self.audio_recorder.get_silence_duration()
-                if silence_duration >= silence_timeout:
-                    print(f"\nAuto-stopping after {silence_duration:.1f}s of silence")
-                    self.is_recording = False
-                    # Trigger stop_recording from main thread
-                    self._auto_stop_recording()
-                    break
+        trace.add_span('stream_open', hotkey_time, time.perf_counter())
+        if self.recording_widget:
+            self.recording_widget.show_levels(self.audio_recorder.level_history)
+        self.current_trace = trace
+        self._record_ticks = 0
+        self._auto_gain_applied = False
+        self.state.fire('start')
+        self._record_timer = self.dispatcher.call_later(RECORD_TICK, self._record_tick)
+
+    def _record_tick(self):
+        """Collect the audio captured since the last tick (dispatcher, every RECORD_TICK while RECORDING)"""
+        if self.state.state != RECORDING:
+            return
 
-            except Exception as e:
-                print(f"Recording error: {e}")
-                break
+        try:
+            self.audio_recorder.record_chunk(duration=RECORD_TICK)
+            self._record_ticks += 1
+
+            # Auto-gain: Check audio level after the first 3 seconds
+            if self._record_ticks == AUTO_GAIN_TICKS and not self._auto_gain_applied:
+                self._apply_auto_gain()
+
+            # Check for silence timeout
+            silence_duration = self.audio_recorder.get_silence_duration()
+            if silence_duration >= SILENCE_TIMEOUT:
+                print(f"\nAuto-stopping after {silence_duration:.1f}s of silence")
+                self._stop_recording()
+                return
+        except Exception as e:
+            print(f"Recording error: {e}")
+            self._discard_take('fail')
+            self.system_tray.set_status("Error!")
+            self.system_tray.notify("Error", f"Recording failed: {e}")
+            return
 
-    def _auto_stop_recording(self):
-        """Auto-stop recording due to silence timeout"""
-        # Just call the normal stop, it will process the audio
-        print("Auto-stop triggered, processing audio...")
-        threading.Thread(target=self._stop_recording, daemon=True).start()
+        self._record_timer = self.dispatcher.call_later(RECORD_TICK, self._record_tick)
 
-    def _cancel_recording(self):
-        """Cancel recording (ESC pressed)"""
-        if not self.is_recording:
+    def _apply_auto_gain(self):
+        """Raise the gain if the first seconds of the take are very quiet"""
+        self._auto_gain_applied = True
+        audio_level = self.audio_recorder.get_recent_audio_level()
+        if not 0 < audio_level < 300:  # Only very low but not silent
             return
 
-        print("\n=== Recording cancelled ===")
-        self.is_recording = False
-        self.is_cancelled = True
-        self.system_tray.set_recording(False)
-        self.system_tray.set_status("Cancelled")
+        # Calculate suggested gain
+        target_avg = 2000
+        suggested_gain = round(min(10.0, target_avg / (audio_level + 1)), 1)
 
-        try:
-            # Hide recording widget
-            if self.recording_widget:
-                self.recording_widget.hide()
-                self.recording_widget = None
+        # Apply gain immediately (affects future chunks via callback)
+        old_gain = self.audio_recorder.volume_multiplier
+        self.audio_recorder.volume_multiplier = suggested_gain
 
-            # Wait for recording thread
-            if self.recording_thread:
-                self.recording_thread.join(timeout=1)
+        # Show notification in widget
+        if self.recording_widget:
+            self.recording_widget.update_status(
+                status=f"🔊 Auto-gain applied: {old_gain}x → {suggested_gain}x",
+                stop_animation=True
+            )
 
-            # CRITICAL: Clean up audio recorder properly
-            self._cleanup_audio_recorder()
+        print(f"AUTO-GAIN: Audio level low ({audio_level:.1f}), applied gain {suggested_gain}x")
 
-            print("Recording discarded")
-        except Exception as e:
-            print(f"Error during cancel: {e}")
-            # Force cleanup even if error
-            self._cleanup_audio_recorder()
-        finally:
-            # Reset state to allow new recordings
-            self.is_recording = False
-            self.is_cancelled = False
+        # Save new gain to config (written in the background once changes settle).
+        # self.config is the manager's dict: update() changes it under the writer's lock
+        self.config_manager.update('audio', volume_gain=suggested_gain)
 
-    def _stop_recording(self):
-        """Stop recording and process audio"""
-        if not self.is_recording:
-            return
-
-        print("Recording stopped, processing...")
-        self.is_recording = False
-        self.system_tray.set_recording(False)
+    def _on_cancel(self):
+        if not self.state.can('cancel'):
+            return  # ESC outside a recording
 
-        try:
-            # Update widget to show processing (don't hide)
-            if self.recording_widget:
-                self.recording_widget.update_status(
-                    title="Processing",
-                    status="Preparing audio...",
-                    stop_animation=True
-                )
+        print("\n=== Recording cancelled ===")
+        self._discard_take('cancel')
+        print("Recording discarded")
 
-            # Wait for recording thread
-            if self.recording_thread:
-                self.recording_thread.join(timeout=1)
-
-            # Check if cancelled
-            if self.is_cancelled:
-                self.system_tray.set_status("Ready")
-                if self.recording_widget:
-                    self.recording_widget.hide()
-                    self.recording_widget = None
-                # Clean up audio recorder state
-                self._cleanup_audio_recorder()
-                return
+    def _discard_take(self, event: str):
+        """Drop the current take and free the recorder (dispatcher, RECORDING)"""
+        self._record_timer.cancel()
+        self.current_trace = None
+        self._hide_recording_widget()
+        self._cleanup_audio_recorder()
+        self.state.fire(event)
 
-            # Get audio data
-            audio_data = self.audio_recorder.stop_recording()
+    def _stop_recording(self):
+        """Stop recording and queue the take for processing (dispatcher, RECORDING)"""
+        from src.core.tracing import use_trace
 
-            # Process in separate thread to not block
-            processing_thread = threading.Thread(
-                target=self._process_audio,
-                args=(audio_data,),
-                daemon=True
+        print("Recording stopped, processing...")
+        self._record_timer.cancel()
+        trace, self.current_trace = self.current_trace, None
+
+        # The take keeps its own widget for the processing status; the next take creates a new one
+        widget, self.recording_widget = self.recording_widget, None
+        if widget:
+            widget.show_levels(None)
+            widget.update_status(
+                title="Processing",
+                status="Preparing audio...",
+                stop_animation=True
             )
-            processing_thread.start()
 
+        try:
+            # Get audio data (the recorder is free for the next take from here on)
+            with use_trace(trace):
+                audio_data = self.audio_recorder.stop_recording()
+            self.dictation_queue.submit(audio_data, context=widget, trace=trace)
         except Exception as e:
             print(f"Error stopping recording: {e}")
-            self.system_tray.set_status("Error!")
             self.system_tray.notify("Error", str(e))
-            # Hide widget on error
-            if self.recording_widget:
-                self.recording_widget.hide()
-                self.recording_widget = None
+            if widget:
+                widget.hide()
             # Critical: ensure audio recorder is cleaned up
             self._cleanup_audio_recorder()
-            # Reset state to allow new recordings
-            self.is_recording = False
-            self.is_cancelled = False
+            self.state.fire('stop')
+            self.system_tray.set_status("Error!")
+            return
+
+        self.state.fire('stop')
+
+    def _hide_recording_widget(self):
+        if self.recording_widget:
+            self.recording_widget.hide()
+            self.recording_widget = None
 
     def _cleanup_audio_recorder(self):
         """Ensure audio recorder is fully cleaned up"""
@@ -351,78 +513,116 @@ class VoiceDictationApp:
         except Exception as e:
             print(f"Error cleaning up audio recorder: {e}")
 
-    def _process_audio(self, audio_data: bytes):
-        """Process audio data through pipeline"""
+    def _app_path(self, *parts) -> str:
+        """Path next to the executable (or main.py when running from source)"""
+        app_dir = os.path.dirname(os.path.abspath(sys.executable if getattr(sys, 'frozen', False) else __file__))
+        return os.path.join(app_dir, *parts)
+
+    def _job_status_callback(self, job):
+        """Status callback updating the tray and the take's own widget"""
+        widget = job.context
+
+        def status_callback(status: str):
+            self.system_tray.set_status(status)
+            if widget:
+                if "Transcribing" in status:
+                    widget.update_status(title="Transcribing", status="Converting speech to text...")
+                elif "Processing" in status:
+                    widget.update_status(title="Post-processing", status="Formatting text...")
+                elif "Pasting" in status:
+                    widget.update_status(title="Pasting", status="Inserting text...")
+
+        return status_callback
+
+    def _process_job(self, job) -> str:
+        """Transcribe and format a take (runs concurrently with other takes)"""
+        if self.recording_archive:
+            job.audio_path = self.recording_archive.save(job.audio_data)  # Written in the background
+
+        job.raw_text, text = self.text_processor.transcribe_and_format(job.audio_data, self._job_status_callback(job))
+        return text
+
+    def _output_job(self, job):
+        """Paste a take's text (called in recording order, one take at a time)"""
+        self.text_processor.output_text(job.result, self._job_status_callback(job))
+
+        # Success - hide widget
+        if job.context:
+            job.context.hide()
+
+        self._update_queue_status()
+        self.system_tray.notify("Success", f"Inserted: {job.result[:50]}...")
+        self._add_to_history(job)
+        self._write_trace(job.trace)
+
+    def _add_to_history(self, job):
+        """Queue a pasted take for the history (written in the background)"""
+        if not self.history:
+            return
+        trace = job.trace
+        self.history.add(
+            job.raw_text or "",
+            job.result,
+            transcription_provider=trace.attrs.get('transcription_provider', '') if trace else '',
+            llm_provider=trace.attrs.get('llm_provider', '') if trace else '',
+            total_ms=trace.to_dict()['total_ms'] if trace else None,
+            timings=trace.durations() if trace else None,
+            audio_path=job.audio_path,
+            trace_id=trace.id if trace else None
+        )
+
+    def _seed_language_id(self):
+        """Start language identification from the last dictations instead of from scratch"""
+        language_id = self.text_processor.language_id
+        if not language_id:
+            return
         try:
-            # Save WAV for debugging (keep only last 10 files)
-            import datetime
-            import glob
-            recordings_dir = os.path.join(os.path.dirname(os.path.abspath(sys.executable if getattr(sys, 'frozen', False) else __file__)), 'recordings')
-            os.makedirs(recordings_dir, exist_ok=True)
-
-            # Save new recording
-            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            wav_path = os.path.join(recordings_dir, f"recording_{timestamp}.wav")
-            with open(wav_path, 'wb') as f:
-                f.write(audio_data)
-            print(f"Audio saved to: {wav_path}")
-
-            # Keep only last 10 recordings
-            wav_files = sorted(glob.glob(os.path.join(recordings_dir, "recording_*.wav")))
-            if len(wav_files) > 10:
-                for old_file in wav_files[:-10]:  # Keep last 10, delete older ones
-                    try:
-                        os.remove(old_file)
-                        print(f"Deleted old recording: {old_file}")
-                    except Exception as e:
-                        print(f"Could not delete {old_file}: {e}")
-
-            # Update widget during processing
-            def status_callback(status: str):
-                self.system_tray.set_status(status)
-                if self.recording_widget:
-                    if "Transcribing" in status:
-                        self.recording_widget.update_status(title="Transcribing", status="Converting speech to text...")
-                    elif "Processing" in status:
-                        self.recording_widget.update_status(title="Post-processing", status="Formatting text...")
-
-            # Update widget for transcription
-            if self.recording_widget:
-                self.recording_widget.update_status(title="Transcribing", status="Converting speech to text...")
-
-            # Process
-            result_text = self.text_processor.process_audio(audio_data, status_callback)
-
-            # Success - hide widget
-            if self.recording_widget:
-                self.recording_widget.hide()
-                self.recording_widget = None
+            recent = self.history.search('', limit=language_id.window)
+        except Exception as e:
+            print(f"Warning: Could not read recent dictations: {e}")
+            return
+        language_id.seed(record['raw_text'] for record in reversed(recent))
 
-            self.system_tray.set_status("Ready")
-            self.system_tray.notify("Success", f"Inserted: {result_text[:50]}...")
+    def _job_failed(self, job):
+        """Report a take that failed; later takes are unaffected"""
+        print(f"Processing error (take {job.seq + 1}): {job.error}")
+        import traceback
+        traceback.print_exception(type(job.error), job.error, job.error.__traceback__)
 
-        except Exception as e:
-            print(f"Processing error: {e}")
-            import traceback
-            traceback.print_exc()
+        self.system_tray.set_status("Error!")
+        self.system_tray.notify("Error", str(job.error))
 
-            self.system_tray.set_status("Error!")
-            self.system_tray.notify("Error", str(e))
+        # Hide widget on error
+        if job.context:
+            job.context.hide()
 
-            # Hide widget on error
-            if self.recording_widget:
-                self.recording_widget.hide()
-                self.recording_widget = None
+        if job.trace:
+            job.trace.attrs['error'] = str(job.error)[:200]
+        self._write_trace(job.trace)
 
-            # Ensure audio recorder is cleaned up after error
-            self._cleanup_audio_recorder()
+    def _write_trace(self, trace):
+        """Append a finished take's trace to the trace log"""
+        if trace and self.trace_log:
+            self.trace_log.write(trace)
+            durations = ', '.join(f"{name} {ms:.0f}ms" for name, ms in trace.durations().items())
+            print(f"Trace {trace.id}: {durations}")
 
-            # Reset state to allow new recordings
-            self.is_recording = False
-            self.is_cancelled = False
+    def _update_queue_status(self):
+        """Tray status after a take is done"""
+        remaining = self.dictation_queue.pending() - 1  # The current take is still counted
+        if self.is_recording:
+            self.system_tray.set_status("Recording...")
+        elif remaining > 0:
+            self.system_tray.set_status(f"Processing ({remaining} queued)...")
+        else:
+            self.system_tray.set_status("Ready")
 
     def _show_settings(self):
         """Show settings window (safe for cross-thread calls)"""
+        self.dispatcher.post(self._open_settings)
+
+    def _open_settings(self):
+        """Open the settings window unless recording (dispatcher)"""
         # Prevent opening settings during recording
         if self.is_recording:
             print("Cannot open settings during recording")
@@ -432,29 +632,15 @@ class VoiceDictationApp:
         def open_settings_window():
             """Open settings in tkinter main thread"""
             try:
-                def on_save(new_config):
-                    self.config = new_config
-
-                    # Reload text processor with new config
-                    self.text_processor.reload_config(new_config)
-
-                    # Recreate audio recorder with new settings
-                    audio_config = new_config.get('audio', {})
-                    self.audio_recorder = AudioRecorder(
-                        sample_rate=audio_config.get('sample_rate', 16000),
-                        device_index=audio_config.get('device_index', -1),
-                        max_gain=audio_config.get('volume_gain', 1.0)
-                    )
+                from src.ui.settings_window import SettingsWindow
 
-                    # Re-register hotkey with delay to avoid race condition
-                    print("Re-registering hotkeys...")
-                    self.hotkey_manager.unregister_all()
-                    time.sleep(0.2)  # Give system time to release old hotkeys
-                    self._register_hotkey()
-
-                    print("Configuration reloaded")
+                def on_save(new_config):
+                    self.dispatcher.post(self._on_config_saved, new_config)
 
-                settings = SettingsWindow(self.config, self.config_manager, on_save=on_save, root=self.root)
+                settings = SettingsWindow(
+                    self.config, self.config_manager, on_save=on_save, root=self.root,
+                    run_task=self.dispatcher.run_in_worker
+                )
                 settings.show()
             except Exception as e:
                 print(f"Error opening settings: {e}")
@@ -468,6 +654,86 @@ class VoiceDictationApp:
             # Fallback if root not available yet
             open_settings_window()
 
+    def _on_config_saved(self, new_config: dict):
+        """Settings saved (dispatcher): apply now, or once the take or the load is done"""
+        if self.state.state == FAILED:
+            # The settings may fix what made the load fail (device, provider): load again
+            print("Settings saved, retrying to load the pipeline")
+            self.config = new_config
+            self._reregister_hotkeys()
+            self.state.fire('retry')
+            self.dispatcher.run_in_worker(self._load_pipeline, on_done=self._on_pipeline_loaded)
+        elif self.state.state in (LOADING, RECORDING):
+            print("Settings saved, applying after the current recording/load")
+            self._pending_config = new_config
+        else:
+            self._apply_config(new_config)
+
+    def _apply_config(self, new_config: dict):
+        """Reload providers, recorder and hotkeys with new settings (dispatcher, not RECORDING)"""
+        self.config = new_config
+
+        # Reload text processor with new config
+        if self.text_processor:
+            self.text_processor.reload_config(new_config)
+            self.text_processor.warm_up()
+
+        # Recreate audio recorder with new settings
+        try:
+            from src.core.audio_recorder import AudioRecorder
+
+            audio_config = new_config.get('audio', {})
+            self.audio_recorder = AudioRecorder(
+                sample_rate=audio_config.get('sample_rate', 16000),
+                device_index=audio_config.get('device_index', -1),
+                max_gain=audio_config.get('volume_gain', 1.0)
+            )
+        except Exception as e:
+            print(f"Error recreating audio recorder: {e}")
+
+        self._reregister_hotkeys()
+        print("Configuration reloaded")
+
+    def _reregister_hotkeys(self):
+        """Register the hotkeys from the current config (dispatcher)"""
+        # Re-register hotkey with delay to avoid race condition
+        print("Re-registering hotkeys...")
+        self.hotkey_manager.unregister_all()
+        # Give system time to release old hotkeys (without blocking the dispatcher)
+        self.dispatcher.call_later(0.2, self._register_hotkey)
+
+    def _show_history(self):
+        """Show the dictation history window (safe for cross-thread calls)"""
+        if not self.history:
+            self.system_tray.notify("History", "History is disabled or still loading")
+            return
+
+        def insert(text: str):
+            # Clipboard + paste only: no transcription or LLM request. Pasted in
+            # turn with the takes, so it can't race their paste or clipboard restore
+            self.dictation_queue.submit_text(text, output=self._insert_from_history)
+
+        def open_history_window():
+            try:
+                if not self.history_window:
+                    from src.ui.history_window import HistoryWindow
+                    self.history_window = HistoryWindow(self.history, on_insert=insert, root=self.root)
+                self.history_window.show()
+            except Exception as e:
+                print(f"Error opening history: {e}")
+                import traceback
+                traceback.print_exc()
+
+        if self.root:
+            self.root.after(0, open_history_window)
+        else:
+            open_history_window()
+
+    def _insert_from_history(self, job):
+        """Paste a history entry (called by the dictation queue, in turn with the takes)"""
+        self.text_processor.output_text(job.result)
+        self._update_queue_status()
+
     def _exit(self):
         """Exit application"""
         print("\nShutting down...")
@@ -476,6 +742,10 @@ class VoiceDictationApp:
         if self.hotkey_manager:
             self.hotkey_manager.unregister_all()
 
+        self.dispatcher.stop()
+        self._release_pipeline()
+        self.config_manager.close()
+
         sys.exit(0)
 
     def run(self):
@@ -491,9 +761,13 @@ class VoiceDictationApp:
         print("="*50 + "\n")
 
         # Create hidden root window for tkinter
+        import tkinter as tk
         self.root = tk.Tk()
         self.root.withdraw()  # Hide the root window
 
+        from src.ui.recording_widget import RecordingWidget
+        self.widget = RecordingWidget(self.root)
+
         # Run system tray in separate thread
         tray_thread = threading.Thread(target=self.system_tray.start, daemon=True)
         tray_thread.start()
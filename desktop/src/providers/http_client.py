@@ -0,0 +1,191 @@
+import io
+import threading
+import time
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib.parse import urlsplit
+from urllib3 import encode_multipart_formdata
+
+from src.core.tracing import current_trace
+
+# (connect, read) seconds
+DEFAULT_CONNECT_TIMEOUT = 3.05
+DEFAULT_READ_TIMEOUT = 10
+
+# Connections kept per host: enough for concurrent LLM chunks plus a transcription
+POOL_MAXSIZE = 8
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+class ProviderError(Exception):
+    """API error already mapped to a user-facing message"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def get_session(base_url: str) -> requests.Session:
+    """
+    Get the pooled session for a host.
+
+    Sessions are shared by every provider talking to the same scheme/host
+    (e.g. Groq Whisper and Groq LLM), so TLS connections are reused across
+    requests and across pipeline stages.
+    """
+    parts = urlsplit(base_url)
+    key = f"{parts.scheme}://{parts.netloc}"
+
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_MAXSIZE, max_retries=0)
+            session.mount(key, adapter)
+            _sessions[key] = session
+        return session
+
+
+class _TimedBody(io.BytesIO):
+    """Request body that records when the HTTP stack finished reading (i.e. sending) it"""
+
+    def __init__(self, data: bytes):
+        super().__init__(data)
+        self.sent_at = None
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = super().read(size)
+        if not chunk and self.sent_at is None:
+            self.sent_at = time.perf_counter()
+        return chunk
+
+
+class HTTPClient:
+    """HTTP client for one provider API: pooled session, unified timeouts and error mapping"""
+
+    def __init__(
+        self,
+        base_url: str,
+        name: str,
+        headers: dict = None,
+        timeout: float = DEFAULT_READ_TIMEOUT,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        error_messages: dict = None
+    ):
+        """
+        Args:
+            base_url: API root (e.g. 'https://api.groq.com/openai/v1')
+            name: Provider name used in error messages
+            headers: Headers sent with every request (e.g. Authorization)
+            timeout: Read timeout in seconds
+            connect_timeout: Connect timeout in seconds
+            error_messages: Overrides for the messages of specific HTTP status
+                codes, or 'connection' for connection failures
+        """
+        self.base_url = base_url.rstrip('/')
+        self.name = name
+        self.headers = headers or {}
+        self.timeout = (connect_timeout, timeout)
+        self.error_messages = error_messages or {}
+        self.session = get_session(self.base_url)
+
+    def url(self, path: str) -> str:
+        """Absolute URL of an API path"""
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def request(self, method: str, path: str, timeout: float = None, **kwargs) -> requests.Response:
+        """
+        Send a request and map failures to ProviderError.
+
+        Args:
+            method: HTTP method
+            path: Path relative to base_url
+            timeout: Read timeout override in seconds
+            **kwargs: Passed to requests (json, data, files, params, stream...)
+
+        Returns:
+            Successful response
+
+        Raises:
+            ProviderError: On timeouts, connection failures and HTTP errors
+        """
+        headers = dict(self.headers, **kwargs.pop('headers', {}))
+        request_timeout = (self.timeout[0], timeout) if timeout else self.timeout
+
+        trace = current_trace()
+        body = self._timed_body(kwargs, headers) if trace else None
+        start = time.perf_counter()
+
+        try:
+            response = self.session.request(method, self.url(path), headers=headers, timeout=request_timeout, **kwargs)
+            if trace:
+                self._trace_request(trace, path, start, body, response)
+            response.raise_for_status()
+            return response
+        except requests.exceptions.Timeout:
+            raise ProviderError(self.error_messages.get('timeout', f"{self.name} API timeout - try again"))
+        except requests.exceptions.ConnectionError:
+            raise ProviderError(self.error_messages.get('connection', f"Cannot connect to {self.name} at {self.base_url}"))
+        except requests.exceptions.HTTPError as e:
+            raise ProviderError(self._http_error_message(e.response.status_code), e.response.status_code)
+
+    @staticmethod
+    def _timed_body(kwargs: dict, headers: dict) -> Optional[_TimedBody]:
+        """
+        Replace a multipart or raw bytes body with a _TimedBody, to measure upload time.
+
+        Multipart bodies are encoded here instead of by requests so the encoded
+        bytes can be wrapped. JSON bodies are small and left alone.
+        """
+        if 'files' in kwargs:
+            fields = dict(kwargs.pop('data', None) or {})
+            fields.update(kwargs.pop('files'))
+            encoded, content_type = encode_multipart_formdata(fields)
+            headers['Content-Type'] = content_type
+        elif isinstance(kwargs.get('data'), bytes):
+            encoded = kwargs['data']
+        else:
+            return None
+
+        body = _TimedBody(encoded)
+        kwargs['data'] = body
+        return body
+
+    def _trace_request(self, trace, path: str, start: float, body: Optional[_TimedBody], response: requests.Response):
+        """Record upload, time-to-first-byte and download spans of a finished request"""
+        end = time.perf_counter()
+        # elapsed: from sending the request until the response headers were parsed
+        first_byte = min(start + response.elapsed.total_seconds(), end)
+        attrs = {'provider': self.name, 'path': path, 'status': response.status_code}
+
+        # Request body size (JSON bodies are already encoded to bytes by requests)
+        if body is not None:
+            attrs['bytes'] = len(body.getbuffer())
+        elif isinstance(response.request.body, (bytes, str)):
+            attrs['bytes'] = len(response.request.body)
+
+        if body is not None and body.sent_at is not None:
+            trace.add_span('upload', start, body.sent_at, **attrs)
+        trace.add_span('ttfb', start, first_byte, **attrs)
+        trace.add_span('download', first_byte, end, **attrs)
+
+    def post(self, path: str, **kwargs) -> requests.Response:
+        """POST to an API path (see request)"""
+        return self.request('POST', path, **kwargs)
+
+    def post_json(self, path: str, payload: dict, **kwargs) -> dict:
+        """POST a JSON payload and return the decoded JSON response"""
+        return self.request('POST', path, json=payload, **kwargs).json()
+
+    def _http_error_message(self, status_code: int) -> str:
+        if status_code in self.error_messages:
+            return self.error_messages[status_code]
+        if status_code == 401:
+            return f"Invalid {self.name} API key"
+        if status_code == 429:
+            return f"{self.name} rate limit exceeded"
+        return f"{self.name} API error: {status_code}"
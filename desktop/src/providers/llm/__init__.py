@@ -1,11 +1,20 @@
-from .base import LLMProvider
-from .ollama import OllamaProvider
-from .openai_llm import OpenAILLMProvider
-from .groq_llm import GroqLLMProvider
-
-__all__ = [
-    'LLMProvider',
-    'OllamaProvider',
-    'OpenAILLMProvider',
-    'GroqLLMProvider'
-]
+import importlib
+
+# Provider modules are imported on first access (e.g. the ONNX runtime is
+# only loaded if PunctuationProvider is actually used)
+_EXPORTS = {
+    'LLMProvider': '.base',
+    'OllamaProvider': '.ollama',
+    'OpenAICompatibleLLMProvider': '.openai_compat',
+    'OpenAILLMProvider': '.openai_llm',
+    'GroqLLMProvider': '.groq_llm',
+    'PunctuationProvider': '.punct',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
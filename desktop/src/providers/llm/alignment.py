@@ -0,0 +1,163 @@
+"""
+Word alignment between a transcript and an LLM response.
+
+Used to salvage a response that failed validation: wherever the LLM's words
+line up with the transcript we keep its punctuation and casing, and whatever
+it added (answers, explanations) is dropped.
+"""
+from difflib import SequenceMatcher
+import re
+
+# Minimum half-width of the alignment band; widened to the length difference
+DEFAULT_BAND = 8
+# Similarity from which a substituted word counts as the same word respelled
+# ('playwrite' / 'Playwright:'), so it takes the LLM's punctuation too
+NEAR_MATCH_RATIO = 0.8
+
+_KEY_STRIP_RE = re.compile(r"[^\w']", re.UNICODE)
+_SENTENCE_END = ('.', '!', '?')
+
+
+def word_key(token: str) -> str:
+    """Comparison key of a token: lowercase, without punctuation"""
+    return _KEY_STRIP_RE.sub('', token.lower())
+
+
+def align_words(source: list, target: list, band: int = DEFAULT_BAND) -> list:
+    """
+    Align two word sequences with a banded edit distance.
+
+    Only cells within `band` of the diagonal are computed (the band is widened
+    to the length difference so the end cell is always reachable), so the cost
+    is O(len(source) * band) instead of O(len(source) * len(target)).
+
+    Args:
+        source: Comparison keys of the original words
+        target: Comparison keys of the rewritten words
+        band: Minimum half-width of the diagonal band
+
+    Returns:
+        List of (i, j) index pairs in order; i is None for words only in target
+        (insertions), j is None for words only in source (deletions)
+    """
+    n, m = len(source), len(target)
+    band = max(band, abs(n - m))
+    inf = n + m + 1
+
+    # costs[i][j - lows[i]] and ops[i][j - lows[i]] for j in [lows[i], highs[i]]
+    lows = [max(0, i - band) for i in range(n + 1)]
+    highs = [min(m, i + band) for i in range(n + 1)]
+    costs = [list(range(highs[0] + 1))]
+    ops = [[None] + ['I'] * highs[0]]
+
+    for i in range(1, n + 1):
+        low, high = lows[i], highs[i]
+        prev_low, prev_high, prev = lows[i - 1], highs[i - 1], costs[i - 1]
+        row, row_ops = [], []
+        for j in range(low, high + 1):
+            # Deletion: source word i-1 has no counterpart
+            best = prev[j - prev_low] + 1 if prev_low <= j <= prev_high else inf
+            op = 'D'
+            # Match / substitution
+            if j > 0 and prev_low <= j - 1 <= prev_high:
+                same = source[i - 1] == target[j - 1] and source[i - 1] != ''
+                cost = prev[j - 1 - prev_low] + (0 if same else 1)
+                if cost < best:
+                    best, op = cost, 'M' if same else 'S'
+            # Insertion: target word j-1 was added. Preferred on ties, so that
+            # added content is attributed to the end and matches stay early
+            if j > low:
+                cost = row[-1] + 1
+                if cost <= best:
+                    best, op = cost, 'I'
+            row.append(best)
+            row_ops.append(op)
+        costs.append(row)
+        ops.append(row_ops)
+
+    pairs = []
+    i, j = n, m
+    while i > 0 or j > 0:
+        op = ops[i][j - lows[i]]
+        if op in ('M', 'S'):
+            pairs.append((i - 1, j - 1))
+            i, j = i - 1, j - 1
+        elif op == 'D':
+            pairs.append((i - 1, None))
+            i -= 1
+        else:
+            pairs.append((None, j - 1))
+            j -= 1
+    pairs.reverse()
+    return pairs
+
+
+def _near_match(key: str, other: str) -> bool:
+    """Whether two comparison keys are close enough to be the same word"""
+    return bool(key) and SequenceMatcher(None, key, other).ratio() >= NEAR_MATCH_RATIO
+
+
+def _transfer_style(word: str, styled: str, punctuation: bool = True) -> str:
+    """Apply the leading capital (and surrounding punctuation) of styled to word"""
+    if styled.strip('"«(\'')[:1].isupper():
+        word = word[:1].upper() + word[1:]
+    if not punctuation:
+        return word
+    leading = styled[:len(styled) - len(styled.lstrip('"«(\''))]
+    trailing = styled[len(styled.rstrip('.,;:!?"»)\'')):]
+    return leading + word + trailing
+
+
+def finalize_sentence(text: str) -> str:
+    """Capitalize the first letter and make sure the text ends like a sentence"""
+    text = text.strip().rstrip(',;:')
+    if text and text[0].islower():
+        text = text[0].upper() + text[1:]
+    if text and not text.endswith(_SENTENCE_END):
+        text += '.'
+    return text
+
+
+def salvage_output(input_text: str, output_text: str, fillers=(), band: int = DEFAULT_BAND) -> str:
+    """
+    Rebuild the transcript using the LLM's formatting where words line up.
+
+    - Matching words: the LLM's version (casing and punctuation)
+    - Near-matching words: the transcript word with the LLM's casing and punctuation
+    - Other substituted words: the transcript word with the LLM's casing only,
+      since punctuation placed around a different word doesn't fit this one
+    - Words the LLM dropped: kept as transcribed, unless they are fillers
+    - Words the LLM added: dropped
+
+    Args:
+        input_text: Original transcription
+        output_text: LLM response that failed validation
+        fillers: Lowercase filler words the LLM is allowed to drop
+        band: Minimum half-width of the alignment band
+
+    Returns:
+        Formatted transcript
+    """
+    source = input_text.split()
+    target = output_text.split()
+
+    words = []
+    for i, j in align_words([word_key(w) for w in source], [word_key(w) for w in target], band):
+        if i is None:
+            continue
+        if j is None:
+            if word_key(source[i]) not in fillers:
+                words.append(source[i])
+        else:
+            key, other = word_key(source[i]), word_key(target[j])
+            if key == other:
+                words.append(target[j])
+            else:
+                words.append(_transfer_style(source[i], target[j], punctuation=_near_match(key, other)))
+
+    # Capitalize after sentence ends that survived next to dropped words
+    for index in range(1, len(words)):
+        if words[index - 1].endswith(_SENTENCE_END) and words[index][:1].islower():
+            words[index] = words[index][0].upper() + words[index][1:]
+
+    return finalize_sentence(' '.join(words))
@@ -1,93 +1,155 @@
 from abc import ABC, abstractmethod
+from functools import lru_cache
 import logging
+import re
+import threading
+
+from .alignment import salvage_output
+from .prompts import FULL_PROMPT, count_tokens, detect_language, get_system_prompt, language_hint
 
 logger = logging.getLogger(__name__)
 
+# Output budget per request: formatted text is about as long as its input
+OUTPUT_BUDGET_RATIO = 1.5
+OUTPUT_BUDGET_MARGIN = 32
+
+FILLER_WORDS = ['um', 'uh', 'eh', 'mm', 'hmm', 'ah']
+
+# Phrases that show the LLM answered or gave instructions instead of formatting
+ASSISTANT_PHRASES = [
+    # Italian instruction phrases
+    'ecco', 'devi', 'puoi', 'per fare', 'per configurare', 'innanzitutto',
+    'prima di tutto', 'segui questi passi', 'ti consiglio', 'ti suggerisco',
+    'è necessario', 'occorre', 'bisogna prima', 'dovresti', 'potresti',
+    'il modo migliore', 'la soluzione è', 'per risolvere', 'devi prima',
+    'visita', 'scarica', 'installa prima', 'controlla', 'verifica',
+    'apri', 'vai su', 'clicca su', 'esegui', 'premi',
+    # English instruction phrases
+    'here are', 'you need', 'you can', 'to do this', 'first',
+    'follow these steps', 'let me', 'i can help', 'you should',
+    'you could', 'the best way', 'the solution is', 'to solve',
+    'you must', 'visit', 'download', 'install', 'check', 'verify',
+    'open', 'go to', 'click on', 'run', 'press'
+]
+
+# Code fences, and list items/headings at the start of a line or after a colon
+MARKDOWN_PATTERN = r'```|(?:^|:)[ \t]*(?:[-*•]|\d+[.)])[ \t]+|^[ \t]*#{1,6}[ \t]'
+
+
+def _trie_pattern(words: list) -> str:
+    """
+    Whole-word regex matching any of words, factored into a prefix trie.
+
+    The trie shape lets the regex engine reject most positions after one
+    character instead of trying every alternative in turn.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node: dict) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # A word ending here makes the rest optional; regex backtracking still
+        # prefers the longest phrase ('devi prima' over 'devi')
+        return f'(?:{body})?' if '' in node else body
+
+    return r'\b' + build(trie) + r'\b'
+
+
+# Both patterns run on lowercased text
+_FILLER_RE = re.compile(_trie_pattern(FILLER_WORDS))
+_OUTPUT_RE = re.compile(rf'(?P<phrase>{_trie_pattern(ASSISTANT_PHRASES)})|(?P<markdown>{MARKDOWN_PATTERN})', re.MULTILINE)
+
+
+@lru_cache(maxsize=None)
+def _phrase_re(phrase: str) -> re.Pattern:
+    """Whole-word pattern for one assistant phrase, tolerant of extra spaces"""
+    return re.compile(r'\b' + r'\s+'.join(map(re.escape, phrase.split())) + r'\b')
+
 
 class LLMProvider(ABC):
     """Base class for LLM providers"""
 
-    SYSTEM_PROMPT = """You are a text formatter. You ONLY format text. You are NOT an assistant.
-
-YOUR ONLY JOB:
-1. Read the input text
-2. Add punctuation (periods, commas, question marks)
-3. Fix capitalization
-4. Return the SAME text (just formatted)
-
-YOU MUST NOT:
-- Answer questions
-- Provide information
-- Give instructions
-- Explain anything
-- Expand on topics
-- Add new content
-
-FORMATTING RULES:
-- Remove ONLY: um, uh, eh, mm, hmm, ah
-- Add punctuation and capitalization
-- Keep EVERY other word unchanged
-- Return ONLY the formatted text (no extra words)
-
-CORRECT Examples:
-Input: "bisogna trovare il modo di permettere a playwright di testare"
-Output: "Bisogna trovare il modo di permettere a Playwright di testare."
-
-Input: "come si fa questo"
-Output: "Come si fa questo?"
-
-Input: "um penso che dovremmo provare"
-Output: "Penso che dovremmo provare."
-
-WRONG Examples - QUESTIONS (NEVER ANSWER, JUST FORMAT):
-Input: "come si configura git"
-WRONG: "Per configurare git, devi prima installare git sul tuo sistema..."
-CORRECT: "Come si configura git?"
-
-Input: "come posso installare python"
-WRONG: "Per installare Python, visita python.org e scarica..."
-CORRECT: "Come posso installare Python?"
+    SYSTEM_PROMPT = FULL_PROMPT
 
-Input: "perché non funziona il codice"
-WRONG: "Il codice potrebbe non funzionare per diversi motivi..."
-CORRECT: "Perché non funziona il codice?"
-
-Input: "bisogna trovare il modo di testare playwright"
-WRONG: "Ecco una guida per testare con Playwright: 1) Installa..."
-CORRECT: "Bisogna trovare il modo di testare Playwright."
-
-Input: "qual è il modo migliore per fare questo"
-WRONG: "Il modo migliore dipende dal contesto, ma generalmente..."
-CORRECT: "Qual è il modo migliore per fare questo?"
+    def __init__(self, api_key: str = None, model: str = None, **kwargs):
+        self.api_key = api_key
+        self.model = model
+        self.config = kwargs
+        self.last_usage = {}
+        self.total_usage = {'requests': 0, 'prompt_tokens': 0, 'completion_tokens': 0}
+        self._usage_lock = threading.Lock()
 
-Input: "cosa devo fare per risolvere questo errore"
-WRONG: "Per risolvere l'errore, devi prima controllare..."
-CORRECT: "Cosa devo fare per risolvere questo errore?"
+    def build_system_prompt(self, text: str) -> str:
+        """
+        Select the system prompt for this request.
 
-Input: "mi spieghi come funziona docker"
-WRONG: "Docker è una piattaforma che permette..."
-CORRECT: "Mi spieghi come funziona Docker?"
+        Uses the configured 'prompt_variant' (default 'full') with few-shot
+        examples in the configured 'language'. With 'auto', uses the language
+        identified upstream (see prompts.use_language), else detects it from text.
+        """
+        variant = self.config.get('prompt_variant', 'full')
+        language = self.config.get('language')
+        if not language or language == 'auto':
+            language = language_hint() or detect_language(text)
+        return get_system_prompt(variant, language)
+
+    def record_usage(self, system_prompt: str, text: str, output: str,
+                     prompt_tokens: int = None, completion_tokens: int = None) -> dict:
+        """
+        Record token usage for a request.
 
-Input: "dove trovo la documentazione"
-WRONG: "La documentazione si trova sul sito ufficiale..."
-CORRECT: "Dove trovo la documentazione?"
+        Uses the counts reported by the API when available, otherwise estimates them.
 
-Input: "quando devo usare async await"
-WRONG: "Devi usare async/await quando lavori con operazioni asincrone..."
-CORRECT: "Quando devo usare async await?"
+        Returns:
+            Usage dict for this request (also stored in last_usage)
+        """
+        estimated = prompt_tokens is None or completion_tokens is None
+        usage = {
+            'system_tokens': count_tokens(system_prompt),
+            'prompt_tokens': prompt_tokens if prompt_tokens is not None else count_tokens(system_prompt) + count_tokens(text),
+            'completion_tokens': completion_tokens if completion_tokens is not None else count_tokens(output),
+            'estimated': estimated
+        }
+
+        with self._usage_lock:
+            self.last_usage = usage
+            self.total_usage['requests'] += 1
+            self.total_usage['prompt_tokens'] += usage['prompt_tokens']
+            self.total_usage['completion_tokens'] += usage['completion_tokens']
+
+        logger.info(
+            f"LLM tokens: {usage['prompt_tokens']} prompt ({usage['system_tokens']} system), "
+            f"{usage['completion_tokens']} completion{' (estimated)' if estimated else ''}"
+        )
+        return usage
+
+    def output_budget(self, text: str) -> int:
+        """
+        Completion token budget for formatting text.
 
-Input: "chi ha creato questo framework"
-WRONG: "Questo framework è stato creato da..."
-CORRECT: "Chi ha creato questo framework?"
+        Derived from the input length, capped by the configured max_tokens.
+        """
+        budget = int(count_tokens(text) * OUTPUT_BUDGET_RATIO) + OUTPUT_BUDGET_MARGIN
+        return min(budget, self.config.get('max_tokens', 500))
 
-CRITICAL: If the input is a QUESTION (starts with come, cosa, quando, dove, perché, chi, quale, OR contains "come posso", "come si", "devo fare", etc.), you MUST return it as a question with "?" - NEVER provide an answer!
+    def warm_up(self) -> bool:
+        """
+        Prepare the provider so the next request is fast (e.g. load a local model).
 
-Remember: You are NOT an AI assistant. You are a simple formatter. Just add punctuation."""
+        Called in the background at startup and when recording begins.
+        Providers without anything to warm up keep this no-op.
 
-    def __init__(self, api_key: str = None, model: str = None, **kwargs):
-        self.api_key = api_key
-        self.model = model
-        self.config = kwargs
+        Returns:
+            True if the provider is ready
+        """
+        return True
 
     def validate_output(self, input_text: str, output_text: str) -> tuple[bool, str]:
         """
@@ -100,71 +162,67 @@ Remember: You are NOT an AI assistant. You are a simple formatter. Just add punc
         Returns:
             Tuple of (is_valid, reason). is_valid=False if LLM answered instead of formatting.
         """
-        # Remove filler words from input for fair comparison
-        filler_words = ['um', 'uh', 'eh', 'mm', 'hmm', 'ah']
-        input_clean = input_text.lower()
-        for word in filler_words:
-            input_clean = input_clean.replace(word, '')
-        input_clean = ' '.join(input_clean.split())  # normalize whitespace
-
-        output_clean = output_text.lower().strip()
+        input_lower = input_text.lower()
+        input_clean = _FILLER_RE.sub('', input_lower)
 
         # Check 1: Length ratio (if output is 2x longer, it likely added content)
         input_len = len(input_clean.split())
-        output_len = len(output_clean.split())
+        output_len = len(output_text.split())
 
         if output_len > input_len * 2:
-            reason = f"Output too long ({output_len} words vs {input_len} input words)"
-            logger.warning(f"LLM validation failed: {reason}")
-            logger.warning(f"Input: {input_text[:100]}...")
-            logger.warning(f"Output: {output_text[:200]}...")
-            return False, reason
-
-        # Check 2: Presence of assistant-like phrases (Italian + English)
-        assistant_phrases = [
-            # Italian instruction phrases
-            'ecco', 'devi', 'puoi', 'per fare', 'per configurare', 'innanzitutto',
-            'prima di tutto', 'segui questi passi', 'ti consiglio', 'ti suggerisco',
-            'è necessario', 'occorre', 'bisogna prima', 'dovresti', 'potresti',
-            'il modo migliore', 'la soluzione è', 'per risolvere', 'devi prima',
-            'visita', 'scarica', 'installa prima', 'controlla', 'verifica',
-            'apri', 'vai su', 'clicca su', 'esegui', 'premi',
-            # English instruction phrases
-            'here are', 'you need', 'you can', 'to do this', 'first',
-            'follow these steps', 'let me', 'i can help', 'you should',
-            'you could', 'the best way', 'the solution is', 'to solve',
-            'you must', 'visit', 'download', 'install', 'check', 'verify',
-            'open', 'go to', 'click on', 'run', 'press'
-        ]
-
-        for phrase in assistant_phrases:
-            if phrase in output_clean:
-                reason = f"Found assistant phrase: '{phrase}'"
-                logger.warning(f"LLM validation failed: {reason}")
-                logger.warning(f"Input: {input_text[:100]}...")
-                logger.warning(f"Output: {output_text[:200]}...")
-                return False, reason
-
-        # Check 3: Markdown formatting (lists, code blocks)
-        markdown_patterns = ['```', '- ', '* ', '1.', '2.', '3.']
-        for pattern in markdown_patterns:
-            if pattern in output_text:
-                reason = f"Found markdown formatting: '{pattern}'"
-                logger.warning(f"LLM validation failed: {reason}")
-                logger.warning(f"Input: {input_text[:100]}...")
-                logger.warning(f"Output: {output_text[:200]}...")
-                return False, reason
+            return self._validation_failed(
+                f"Output too long ({output_len} words vs {input_len} input words)",
+                input_text, output_text
+            )
+
+        # Checks 2 and 3 in a single pass over the output:
+        # assistant-like phrases (Italian + English) and markdown formatting
+        for match in _OUTPUT_RE.finditer(output_text.lower()):
+            if match.lastgroup == 'phrase':
+                phrase = match.group()
+                # Phrases the user actually dictated are not answers; checked
+                # per phrase since the input may contain a shorter or longer
+                # overlapping phrase ('devi' inside 'devi prima')
+                if not _phrase_re(phrase).search(input_lower):
+                    return self._validation_failed(f"Found assistant phrase: '{phrase}'", input_text, output_text)
+            else:
+                pattern = match.group().strip(': \t\n') or match.group()
+                return self._validation_failed(f"Found markdown formatting: '{pattern}'", input_text, output_text)
 
         # All checks passed
         return True, "OK"
 
+    def fallback_format(self, text: str, llm_output: str) -> str:
+        """
+        Format text when the LLM output failed validation, without another LLM call.
+
+        Keeps the LLM's punctuation and casing wherever its words line up with
+        the transcript and drops the content it added.
+
+        Args:
+            text: Original transcription
+            llm_output: Rejected LLM output
+
+        Returns:
+            Formatted text
+        """
+        return salvage_output(text, llm_output, fillers=FILLER_WORDS)
+
+    def _validation_failed(self, reason: str, input_text: str, output_text: str) -> tuple[bool, str]:
+        """Log a validation failure and return the (is_valid, reason) result"""
+        logger.warning(f"LLM validation failed: {reason}")
+        logger.warning(f"Input: {input_text[:100]}...")
+        logger.warning(f"Output: {output_text[:200]}...")
+        return False, reason
+
     @abstractmethod
-    def process(self, text: str) -> str:
+    def process(self, text: str, max_tokens: int = None) -> str:
         """
         Process transcribed text with LLM
 
         Args:
             text: Raw transcription text
+            max_tokens: Completion token budget (default: output_budget(text))
 
         Returns:
             Cleaned and formatted text
@@ -1,6 +1,7 @@
-import requests
+import threading
 import logging
 from .base import LLMProvider
+from ..http_client import HTTPClient, ProviderError
 
 logger = logging.getLogger(__name__)
 
@@ -8,56 +9,94 @@ logger = logging.getLogger(__name__)
 class OllamaProvider(LLMProvider):
     """Ollama local LLM provider"""
 
-    def __init__(self, model: str, ollama_url: str = "http://localhost:11434", **kwargs):
+    DEFAULT_KEEP_ALIVE = "30m"
+    WARM_UP_TIMEOUT = 120  # Cold model loads can take a while on CPU-only machines
+
+    def __init__(self, model: str, ollama_url: str = "http://localhost:11434",
+                 keep_alive: str = DEFAULT_KEEP_ALIVE, **kwargs):
         super().__init__(api_key=None, model=model, **kwargs)
         self.ollama_url = ollama_url.rstrip('/')
+        self.keep_alive = keep_alive
+        self.client = HTTPClient(
+            self.ollama_url,
+            "Ollama",
+            timeout=self.config.get("timeout", 15),
+            connect_timeout=self.config.get("connect_timeout", 3.05),
+            error_messages={
+                'connection': "Cannot connect to Ollama - is it running?",
+                'timeout': "Ollama timeout - model may be too slow",
+                404: f"Model '{model}' not found - run: ollama pull {model}"
+            }
+        )
+        self._warm_up_lock = threading.Lock()
+
+    def warm_up(self) -> bool:
+        """
+        Load the model into Ollama's memory and extend its keep-alive.
+
+        Sends a chat request with no messages, which makes Ollama load the model
+        without generating anything. Concurrent calls are collapsed into one.
+
+        Returns:
+            True if the model is loaded, False if the warm-up failed or another
+            warm-up was already in flight
+        """
+        if not self._warm_up_lock.acquire(blocking=False):
+            return False
+
+        try:
+            payload = {
+                "model": self.model,
+                "messages": [],
+                "keep_alive": self.keep_alive
+            }
+            self.client.post("/api/chat", json=payload, timeout=self.WARM_UP_TIMEOUT)
+            logger.info(f"Ollama model '{self.model}' warm (keep_alive={self.keep_alive})")
+            return True
+        except Exception as e:
+            # Warm-up is best effort: the real request reports errors to the user
+            logger.warning(f"Ollama warm-up failed: {e}")
+            return False
+        finally:
+            self._warm_up_lock.release()
 
-    def process(self, text: str) -> str:
+    def process(self, text: str, max_tokens: int = None) -> str:
         """Process text using Ollama local LLM"""
 
-        url = f"{self.ollama_url}/api/chat"
+        system_prompt = self.build_system_prompt(text)
 
         payload = {
             "model": self.model,
             "messages": [
-                {"role": "system", "content": self.SYSTEM_PROMPT},
+                {"role": "system", "content": system_prompt},
                 {"role": "user", "content": text}
             ],
             "stream": False,
+            "keep_alive": self.keep_alive,
             "options": {
                 "temperature": self.config.get("temperature", 0.3),
-                "num_predict": self.config.get("max_tokens", 500)
+                "num_predict": max_tokens or self.output_budget(text)
             }
         }
 
         try:
-            response = requests.post(url, json=payload, timeout=15)
-            response.raise_for_status()
-            result = response.json()
+            result = self.client.post_json("/api/chat", payload)
             llm_output = result.get("message", {}).get("content", "").strip()
+            self.record_usage(
+                system_prompt, text, llm_output,
+                prompt_tokens=result.get("prompt_eval_count"),
+                completion_tokens=result.get("eval_count")
+            )
 
             # Validate output
             is_valid, reason = self.validate_output(text, llm_output)
             if not is_valid:
-                logger.error(f"LLM output validation failed: {reason}. Using fallback formatting.")
-                # Fallback: simple capitalization and period
-                fallback = text.strip()
-                if fallback and fallback[0].islower():
-                    fallback = fallback[0].upper() + fallback[1:]
-                if fallback and not fallback.endswith(('.', '!', '?')):
-                    fallback += '.'
-                return fallback
+                logger.error(f"LLM output validation failed: {reason}. Salvaging aligned formatting.")
+                return self.fallback_format(text, llm_output)
 
             return llm_output
 
-        except requests.exceptions.ConnectionError:
-            raise Exception("Cannot connect to Ollama - is it running?")
-        except requests.exceptions.Timeout:
-            raise Exception("Ollama timeout - model may be too slow")
-        except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 404:
-                raise Exception(f"Model '{self.model}' not found - run: ollama pull {self.model}")
-            else:
-                raise Exception(f"Ollama API error: {e.response.status_code}")
+        except ProviderError:
+            raise
         except Exception as e:
             raise Exception(f"Ollama processing failed: {str(e)}")
@@ -0,0 +1,71 @@
+import logging
+from .base import LLMProvider
+from ..http_client import HTTPClient, ProviderError
+
+logger = logging.getLogger(__name__)
+
+
+class OpenAICompatibleLLMProvider(LLMProvider):
+    """
+    LLM provider for any OpenAI-compatible chat completions API.
+
+    Used directly for local servers (llama.cpp server, vLLM, LM Studio...)
+    via base_url, and subclassed for hosted APIs.
+    """
+
+    NAME = "OpenAI-compatible"
+    BASE_URL = None
+    DEFAULT_MODEL = None
+
+    def __init__(self, api_key: str = None, model: str = None, base_url: str = None, **kwargs):
+        super().__init__(api_key=api_key, model=model or self.DEFAULT_MODEL, **kwargs)
+        self.base_url = base_url or self.BASE_URL
+        if not self.base_url:
+            raise ValueError(f"{self.NAME} LLM provider requires a base_url")
+
+        headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        self.client = HTTPClient(
+            self.base_url,
+            self.NAME,
+            headers=headers,
+            timeout=self.config.get("timeout", 10),
+            connect_timeout=self.config.get("connect_timeout", 3.05)
+        )
+
+    def process(self, text: str, max_tokens: int = None) -> str:
+        """Process text using the chat completions API"""
+
+        system_prompt = self.build_system_prompt(text)
+
+        payload = {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": text}
+            ],
+            "temperature": self.config.get("temperature", 0.3),
+            "max_tokens": max_tokens or self.output_budget(text)
+        }
+
+        try:
+            result = self.client.post_json("/chat/completions", payload)
+            llm_output = result.get("choices", [{}])[0].get("message", {}).get("content", "").strip()
+            usage = result.get("usage") or {}
+            self.record_usage(
+                system_prompt, text, llm_output,
+                prompt_tokens=usage.get("prompt_tokens"),
+                completion_tokens=usage.get("completion_tokens")
+            )
+
+            # Validate output
+            is_valid, reason = self.validate_output(text, llm_output)
+            if not is_valid:
+                logger.error(f"LLM output validation failed: {reason}. Salvaging aligned formatting.")
+                return self.fallback_format(text, llm_output)
+
+            return llm_output
+
+        except ProviderError:
+            raise
+        except Exception as e:
+            raise Exception(f"{self.NAME} LLM processing failed: {str(e)}")
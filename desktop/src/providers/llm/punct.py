@@ -0,0 +1,222 @@
+"""
+Local punctuation restoration with an ONNX token-classification model.
+
+Punctuation and capitalization are a sequence-labeling task: the model
+predicts, for every word, the mark that follows it. Unlike an LLM it cannot
+add, drop or reword anything, so no output validation is needed.
+
+The model directory must contain:
+    model.onnx      Token classification model (logits: batch x tokens x labels)
+    tokenizer.json  Hugging Face fast tokenizer
+    config.json     With "id2label", e.g. {"0": "0", "1": ".", "2": ",", "3": "?"}
+
+Models exported from the "fullstop" punctuation family work as-is.
+"""
+import json
+import logging
+import re
+import sys
+import threading
+from pathlib import Path
+
+from .alignment import finalize_sentence
+from .base import LLMProvider
+
+try:
+    import numpy as np
+    import onnxruntime as ort
+    from tokenizers import Tokenizer
+    ONNX_AVAILABLE = True
+except ImportError:
+    ONNX_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Labels meaning "no punctuation after this word"
+NO_PUNCTUATION = ('0', 'O', '')
+SENTENCE_END = ('.', '?', '!')
+
+_WORD_PUNCT_RE = re.compile(r"^[^\w']+|[^\w']+$", re.UNICODE)
+
+
+def app_dir() -> Path:
+    """Directory of the executable (or of the src package when running from source)"""
+    if getattr(sys, 'frozen', False):
+        return Path(sys.executable).resolve().parent
+    return Path(__file__).resolve().parents[2]
+
+
+def token_windows(token_counts: list, budget: int) -> list:
+    """
+    Split words into consecutive windows that fit the model input.
+
+    Args:
+        token_counts: Sub-tokens of each word
+        budget: Sub-tokens allowed per window (special tokens excluded)
+
+    Returns:
+        (start, end) word ranges; a word longer than the budget gets a window
+        of its own (and is truncated by the tokenizer)
+    """
+    windows = []
+    start, used = 0, 0
+    for index, count in enumerate(token_counts):
+        if index > start and used + count > budget:
+            windows.append((start, index))
+            start, used = index, 0
+        used += count
+    if start < len(token_counts):
+        windows.append((start, len(token_counts)))
+    return windows
+
+
+def strip_punctuation(word: str) -> str:
+    """Remove leading/trailing punctuation from a word (the model sees bare words)"""
+    return _WORD_PUNCT_RE.sub('', word)
+
+
+def apply_labels(words: list, labels: list) -> str:
+    """
+    Rebuild the text from words and the punctuation predicted after each one.
+
+    Casing follows the new sentence boundaries: sentence starts are capitalized,
+    and words capitalized only because the transcription started a sentence
+    there are lowercased again. Other capitals (names, acronyms) are kept.
+
+    Args:
+        words: Words as transcribed
+        labels: Punctuation label per word ('0' for none)
+
+    Returns:
+        Formatted text
+    """
+    output = []
+    previous_ended = True
+    previous_original_ended = False
+
+    for word, label in zip(words, labels):
+        bare = strip_punctuation(word) or word
+
+        if previous_ended:
+            bare = bare[:1].upper() + bare[1:]
+        elif previous_original_ended and bare[:1].isupper() and bare[1:].islower():
+            bare = bare[:1].lower() + bare[1:]
+
+        mark = '' if label in NO_PUNCTUATION else label
+        output.append(f"{bare} -" if mark == '-' else bare + mark)
+
+        previous_ended = mark in SENTENCE_END
+        previous_original_ended = word.endswith(SENTENCE_END)
+
+    return finalize_sentence(' '.join(output))
+
+
+class PunctuationProvider(LLMProvider):
+    """Punctuation and truecasing with a local ONNX model (no LLM call)"""
+
+    # Model input limit in sub-tokens, special tokens included. Words are
+    # windowed by their token count: 200 Italian words can exceed 512 tokens.
+    MAX_TOKENS = 512
+
+    # model_path -> (session, tokenizer, id2label), shared by every instance
+    _models = {}
+    _models_lock = threading.Lock()
+
+    def __init__(self, model_path: str, threads: int = None, **kwargs):
+        """
+        Args:
+            model_path: Directory with model.onnx, tokenizer.json and config.json
+                (relative paths are resolved against the app directory)
+            threads: ONNX Runtime intra-op threads (default: runtime's choice)
+        """
+        super().__init__(api_key=None, model=str(model_path), **kwargs)
+        if not ONNX_AVAILABLE:
+            raise Exception("Punctuation model requires onnxruntime and tokenizers - run: pip install onnxruntime tokenizers")
+        self.model_path = app_dir() / model_path
+        self.threads = threads
+
+    def _load(self) -> tuple:
+        """Load the model once per path and keep it in memory"""
+        key = str(self.model_path.resolve())
+        with self._models_lock:
+            if key not in self._models:
+                if not (self.model_path / 'model.onnx').exists():
+                    raise Exception(f"Punctuation model not found in {self.model_path}")
+
+                options = ort.SessionOptions()
+                if self.threads:
+                    options.intra_op_num_threads = self.threads
+                session = ort.InferenceSession(
+                    str(self.model_path / 'model.onnx'), options, providers=['CPUExecutionProvider']
+                )
+                tokenizer = Tokenizer.from_file(str(self.model_path / 'tokenizer.json'))
+                tokenizer.enable_truncation(self.MAX_TOKENS)  # Only a single huge word gets this far
+                with open(self.model_path / 'config.json', encoding='utf-8') as f:
+                    id2label = {int(k): v for k, v in json.load(f)['id2label'].items()}
+
+                self._models[key] = (session, tokenizer, id2label)
+                logger.info(f"Punctuation model loaded from {self.model_path}")
+            return self._models[key]
+
+    def warm_up(self) -> bool:
+        """Load the model and run one inference so the first dictation is fast"""
+        try:
+            self.predict_labels(['warm', 'up'])
+            return True
+        except Exception as e:
+            logger.warning(f"Punctuation model warm-up failed: {e}")
+            return False
+
+    def predict_labels(self, words: list) -> list:
+        """
+        Predict the punctuation label after each word.
+
+        Args:
+            words: Bare words (without punctuation)
+
+        Returns:
+            One label per word
+        """
+        session, tokenizer, id2label = self._load()
+        input_names = {i.name for i in session.get_inputs()}
+
+        token_counts = [
+            len(encoding.ids)
+            for encoding in tokenizer.encode_batch([[word] for word in words], is_pretokenized=True,
+                                                   add_special_tokens=False)
+        ]
+        budget = self.MAX_TOKENS - tokenizer.num_special_tokens_to_add(False)
+
+        labels = []
+        for start, end in token_windows(token_counts, budget):
+            window = words[start:end]
+            encoding = tokenizer.encode(window, is_pretokenized=True)
+
+            feed = {
+                'input_ids': np.array([encoding.ids], dtype=np.int64),
+                'attention_mask': np.array([encoding.attention_mask], dtype=np.int64),
+                'token_type_ids': np.array([encoding.type_ids], dtype=np.int64),
+            }
+            logits = session.run(None, {name: value for name, value in feed.items() if name in input_names})[0]
+            predictions = logits[0].argmax(axis=-1)
+
+            # The label of a word is the one predicted on its last sub-token
+            word_labels = ['0'] * len(window)
+            for token_index, word_index in enumerate(encoding.word_ids):
+                if word_index is not None:
+                    word_labels[word_index] = id2label[int(predictions[token_index])]
+            labels.extend(word_labels)
+
+        return labels
+
+    def process(self, text: str, max_tokens: int = None) -> str:
+        """Add punctuation and capitalization to text"""
+        words = text.split()
+        if not words:
+            return text
+
+        try:
+            labels = self.predict_labels([strip_punctuation(word) or word for word in words])
+            return apply_labels(words, labels)
+        except Exception as e:
+            raise Exception(f"Punctuation model failed: {str(e)}")
@@ -0,0 +1,157 @@
+"""
+Provider registry: builds providers from config, lazily and only when needed.
+
+Provider classes are imported on first use, so selecting Groq never imports
+the Ollama or ONNX modules. Instances are cached by the config slice they
+are built from: reloading a config where only the LLM changed keeps the
+transcription provider (and its warm connections) as is. Decrypted API keys
+are cached by their encrypted value, so DPAPI runs once per key.
+"""
+import importlib
+import json
+import threading
+from typing import Callable, Optional
+
+from src.core.vocabulary import Vocabulary
+
+# Provider name -> 'module:Class'
+TRANSCRIPTION_PROVIDERS = {
+    'groq': 'src.providers.transcription.groq_whisper:GroqWhisperProvider',
+    'openai': 'src.providers.transcription.openai_whisper:OpenAIWhisperProvider',
+    'deepgram': 'src.providers.transcription.deepgram:DeepgramProvider',
+    'openai_compatible': 'src.providers.transcription.openai_compat:OpenAICompatibleWhisperProvider',
+}
+
+LLM_PROVIDERS = {
+    'ollama': 'src.providers.llm.ollama:OllamaProvider',
+    'openai': 'src.providers.llm.openai_llm:OpenAILLMProvider',
+    'groq': 'src.providers.llm.groq_llm:GroqLLMProvider',
+    'openai_compatible': 'src.providers.llm.openai_compat:OpenAICompatibleLLMProvider',
+    'punct': 'src.providers.llm.punct:PunctuationProvider',
+}
+
+DEFAULT_LOCAL_URL = 'http://localhost:8080/v1'
+
+
+def load_class(spec: str):
+    """Import 'module:Class' and return the class"""
+    module_name, class_name = spec.split(':')
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def _timeout_options(section: dict) -> dict:
+    """Timeout overrides from a config section (providers have their own defaults)"""
+    return {key: section[key] for key in ('timeout', 'connect_timeout') if key in section}
+
+
+def transcription_options(config: dict) -> tuple:
+    """
+    Provider name and constructor arguments for the transcription provider.
+
+    The API key is left encrypted (under 'api_key'); it is decrypted only when
+    an instance is actually built.
+    """
+    section = config.get('transcription', {})
+    name = section.get('provider', 'groq')
+    options = dict(api_key=section.get('api_key_encrypted', ''), **_timeout_options(section))
+
+    if name == 'openai_compatible':
+        options['base_url'] = section.get('base_url', DEFAULT_LOCAL_URL)
+        options['model'] = section.get('model')
+    else:
+        # Optional override of the hosted API root (proxies, local stand-ins)
+        options['base_url'] = section.get('base_url')
+
+    vocabulary_config = config.get('vocabulary', {})
+    if vocabulary_config.get('prompt_hint', True):
+        terms = Vocabulary.from_config(vocabulary_config).hint_terms()
+        if terms:
+            options['vocabulary'] = terms
+    return name, options
+
+
+def llm_options(config: dict) -> tuple:
+    """Provider name and constructor arguments for the LLM provider (API key still encrypted)"""
+    section = config.get('llm', {})
+    name = section.get('provider', 'ollama')
+    model = section.get('model', 'llama3.2:3b')
+
+    options = dict(
+        temperature=section.get('temperature', 0.3),
+        max_tokens=section.get('max_tokens', 500),
+        prompt_variant=section.get('prompt_variant', 'full'),
+        # Few-shot examples follow the dictation language (detected per request when 'auto')
+        language=config.get('transcription', {}).get('options', {}).get('language', 'auto'),
+        **_timeout_options(section)
+    )
+
+    if name == 'ollama':
+        options.update(
+            model=model,
+            ollama_url=section.get('ollama_url', 'http://localhost:11434'),
+            keep_alive=section.get('keep_alive', '30m')
+        )
+    elif name == 'openai':
+        options.update(api_key=section.get('api_key_encrypted', ''), model=model or 'gpt-4o-mini',
+                       base_url=section.get('base_url'))
+    elif name == 'groq':
+        options.update(api_key=section.get('api_key_encrypted', ''), model=model or 'llama-3.1-8b-instant',
+                       base_url=section.get('base_url'))
+    elif name == 'openai_compatible':
+        options.update(api_key=section.get('api_key_encrypted', ''), model=model,
+                       base_url=section.get('base_url', DEFAULT_LOCAL_URL))
+    elif name == 'punct':
+        options.update(model_path=section.get('punct_model_path', 'models/punct'), threads=section.get('threads'))
+    return name, options
+
+
+class ProviderRegistry:
+    """Builds and caches providers per config slice"""
+
+    def __init__(self, decrypt: Optional[Callable[[str], str]] = None):
+        """
+        Args:
+            decrypt: Decrypts an 'api_key_encrypted' value (default: ConfigManager.decrypt_api_key)
+        """
+        if decrypt is None:
+            from src.core.config_manager import ConfigManager
+            decrypt = ConfigManager.decrypt_api_key
+        self._decrypt = decrypt
+        self._secrets = {}
+        self._instances = {}  # kind -> (cache key, provider)
+        self._lock = threading.Lock()
+
+    def secret(self, encrypted: str) -> str:
+        """Decrypted API key, cached by its encrypted value"""
+        if not encrypted:
+            return ""
+        if encrypted not in self._secrets:
+            self._secrets[encrypted] = self._decrypt(encrypted)
+        return self._secrets[encrypted]
+
+    def transcription_provider(self, config: dict):
+        """Transcription provider for config (cached while its config slice is unchanged)"""
+        name, options = transcription_options(config)
+        return self._get('transcription', TRANSCRIPTION_PROVIDERS, name, options)
+
+    def llm_provider(self, config: dict):
+        """LLM provider for config (cached while its config slice is unchanged)"""
+        name, options = llm_options(config)
+        return self._get('llm', LLM_PROVIDERS, name, options)
+
+    def _get(self, kind: str, providers: dict, name: str, options: dict):
+        if name not in providers:
+            raise ValueError(f"Unknown {kind} provider: {name}")
+
+        key = json.dumps([name, options], sort_keys=True, default=str)
+        with self._lock:
+            cached = self._instances.get(kind)
+            if cached and cached[0] == key:
+                return cached[1]
+
+            if 'api_key' in options:
+                options = dict(options, api_key=self.secret(options['api_key']))
+            provider = load_class(providers[name])(**options)
+            self._instances[kind] = (key, provider)
+            print(f"Created {kind} provider: {name}")
+            return provider
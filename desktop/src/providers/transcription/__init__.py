@@ -1,11 +1,18 @@
-from .base import TranscriptionProvider
-from .groq_whisper import GroqWhisperProvider
-from .openai_whisper import OpenAIWhisperProvider
-from .deepgram import DeepgramProvider
-
-__all__ = [
-    'TranscriptionProvider',
-    'GroqWhisperProvider',
-    'OpenAIWhisperProvider',
-    'DeepgramProvider'
-]
+import importlib
+
+# Provider modules are imported on first access
+_EXPORTS = {
+    'TranscriptionProvider': '.base',
+    'OpenAICompatibleWhisperProvider': '.openai_compat',
+    'GroqWhisperProvider': '.groq_whisper',
+    'OpenAIWhisperProvider': '.openai_whisper',
+    'DeepgramProvider': '.deepgram',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
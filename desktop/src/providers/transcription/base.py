@@ -4,10 +4,23 @@ from abc import ABC, abstractmethod
 class TranscriptionProvider(ABC):
     """Base class for transcription providers"""
 
+    # Whisper reads at most 224 prompt tokens; stay well below
+    PROMPT_MAX_CHARS = 600
+
     def __init__(self, api_key: str = None, **kwargs):
         self.api_key = api_key
         self.config = kwargs
 
+    def vocabulary_prompt(self) -> str:
+        """Vocabulary terms (config 'vocabulary') as a Whisper prompt: "Playwright, MailerLite, ..." """
+        prompt = ""
+        for term in self.config.get("vocabulary") or []:
+            candidate = f"{prompt}, {term}" if prompt else term
+            if len(candidate) > self.PROMPT_MAX_CHARS:
+                break
+            prompt = candidate
+        return prompt
+
     @abstractmethod
     def transcribe(self, audio_data: bytes, language: str = "auto") -> str:
         """
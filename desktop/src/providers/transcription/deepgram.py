@@ -1,21 +1,29 @@
-import requests
 from .base import TranscriptionProvider
+from ..http_client import HTTPClient, ProviderError
 
 
 class DeepgramProvider(TranscriptionProvider):
     """Deepgram transcription provider"""
 
-    API_URL = "https://api.deepgram.com/v1/listen"
+    BASE_URL = "https://api.deepgram.com/v1"
     MODEL = "nova-2"
+    MAX_KEYWORDS = 100
+    KEYWORD_BOOST = 2
+
+    def __init__(self, api_key: str = None, base_url: str = None, **kwargs):
+        super().__init__(api_key=api_key, **kwargs)
+        self.base_url = base_url or self.BASE_URL
+        self.client = HTTPClient(
+            self.base_url,
+            "Deepgram",
+            headers={"Authorization": f"Token {api_key}"},
+            timeout=self.config.get("timeout", 10),
+            connect_timeout=self.config.get("connect_timeout", 3.05)
+        )
 
     def transcribe(self, audio_data: bytes, language: str = "auto") -> str:
         """Transcribe audio using Deepgram API"""
 
-        headers = {
-            "Authorization": f"Token {self.api_key}",
-            "Content-Type": "audio/wav"
-        }
-
         # Build query parameters
         params = {
             "model": self.MODEL,
@@ -25,29 +33,24 @@ class DeepgramProvider(TranscriptionProvider):
         if language != "auto":
             params["language"] = language
 
+        # Boost vocabulary terms (sent as repeated keywords=term:boost)
+        vocabulary = self.config.get("vocabulary") or []
+        if vocabulary:
+            params["keywords"] = [f"{term}:{self.KEYWORD_BOOST}" for term in vocabulary[:self.MAX_KEYWORDS]]
+
         try:
-            response = requests.post(
-                self.API_URL,
-                headers=headers,
+            result = self.client.post(
+                "/listen",
+                headers={"Content-Type": "audio/wav"},
                 params=params,
-                data=audio_data,
-                timeout=10
-            )
-            response.raise_for_status()
-            result = response.json()
+                data=audio_data
+            ).json()
 
             # Extract transcription from Deepgram response
             transcript = result.get("results", {}).get("channels", [{}])[0].get("alternatives", [{}])[0].get("transcript", "")
             return transcript
 
-        except requests.exceptions.Timeout:
-            raise Exception("Deepgram API timeout - try again")
-        except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 401:
-                raise Exception("Invalid Deepgram API key")
-            elif e.response.status_code == 429:
-                raise Exception("Deepgram rate limit exceeded")
-            else:
-                raise Exception(f"Deepgram API error: {e.response.status_code}")
+        except ProviderError:
+            raise
         except Exception as e:
             raise Exception(f"Deepgram transcription failed: {str(e)}")
@@ -0,0 +1,59 @@
+from .base import TranscriptionProvider
+from ..http_client import HTTPClient, ProviderError
+
+
+class OpenAICompatibleWhisperProvider(TranscriptionProvider):
+    """
+    Transcription provider for any OpenAI-compatible /audio/transcriptions API.
+
+    Used directly for local servers (whisper.cpp server, faster-whisper server,
+    vLLM...) via base_url, and subclassed for hosted APIs.
+    """
+
+    NAME = "OpenAI-compatible"
+    BASE_URL = None
+    MODEL = "whisper-1"
+
+    def __init__(self, api_key: str = None, base_url: str = None, model: str = None, **kwargs):
+        super().__init__(api_key=api_key, **kwargs)
+        self.model = model or self.MODEL
+        self.base_url = base_url or self.BASE_URL
+        if not self.base_url:
+            raise ValueError(f"{self.NAME} transcription provider requires a base_url")
+
+        headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        self.client = HTTPClient(
+            self.base_url,
+            self.NAME,
+            headers=headers,
+            timeout=self.config.get("timeout", 10),
+            connect_timeout=self.config.get("connect_timeout", 3.05)
+        )
+
+    def transcribe(self, audio_data: bytes, language: str = "auto") -> str:
+        """Transcribe audio using the audio transcriptions API"""
+
+        files = {
+            "file": ("audio.wav", audio_data, "audio/wav")
+        }
+
+        data = {
+            "model": self.model,
+        }
+
+        if language != "auto":
+            data["language"] = language
+
+        # Spelling hint for names and jargon
+        prompt = self.vocabulary_prompt()
+        if prompt:
+            data["prompt"] = prompt
+
+        try:
+            result = self.client.post("/audio/transcriptions", files=files, data=data).json()
+            return result.get("text", "")
+
+        except ProviderError:
+            raise
+        except Exception as e:
+            raise Exception(f"{self.NAME} transcription failed: {str(e)}")
@@ -0,0 +1,170 @@
+import datetime
+import tkinter as tk
+from tkinter import ttk
+from typing import Callable
+
+
+class HistoryWindow:
+    """Search past dictations and insert one again (no transcription or LLM call)"""
+
+    SEARCH_DELAY_MS = 150  # Wait for a pause in typing before querying
+    INSERT_DELAY_MS = 200  # Let focus return to the previous app before pasting
+
+    def __init__(self, history, on_insert: Callable[[str], None], root=None):
+        """
+        Args:
+            history: HistoryStore
+            on_insert: Called with the text to insert into the active app
+            root: Tk root (the window is a Toplevel of it)
+        """
+        self.history = history
+        self.on_insert = on_insert
+        self.root = root
+        self.window = None
+        self.results = []
+        self._search_job = None
+
+    def show(self):
+        """Show the history window (or bring it to front)"""
+        if self.window:
+            self.window.deiconify()
+            self.window.lift()
+            self.search_entry.focus_set()
+            return
+
+        self.window = tk.Toplevel(self.root) if self.root else tk.Tk()
+        self.window.title("Voice Dictation History")
+        self.window.geometry("640x480")
+        self.window.attributes('-topmost', True)
+
+        # Search box
+        search_frame = tk.Frame(self.window)
+        search_frame.pack(fill='x', padx=10, pady=(10, 5))
+        tk.Label(search_frame, text="Search:").pack(side='left')
+        self.search_var = tk.StringVar()
+        self.search_var.trace_add('write', lambda *args: self._schedule_search())
+        self.search_entry = tk.Entry(search_frame, textvariable=self.search_var, font=('Arial', 11))
+        self.search_entry.pack(side='left', fill='x', expand=True, padx=5)
+
+        # Results
+        paned = ttk.PanedWindow(self.window, orient='vertical')
+        paned.pack(fill='both', expand=True, padx=10, pady=5)
+
+        list_frame = tk.Frame(paned)
+        scrollbar = tk.Scrollbar(list_frame)
+        scrollbar.pack(side='right', fill='y')
+        self.listbox = tk.Listbox(list_frame, font=('Arial', 10), activestyle='none', yscrollcommand=scrollbar.set)
+        self.listbox.pack(side='left', fill='both', expand=True)
+        scrollbar.config(command=self.listbox.yview)
+        paned.add(list_frame, weight=3)
+
+        self.preview = tk.Text(paned, height=6, wrap='word', font=('Arial', 10), state='disabled')
+        paned.add(self.preview, weight=1)
+
+        # Buttons
+        btn_frame = tk.Frame(self.window)
+        btn_frame.pack(fill='x', padx=10, pady=10)
+        tk.Button(btn_frame, text="Close", command=self.close, width=12).pack(side='right', padx=5)
+        tk.Button(btn_frame, text="Copy", command=self._copy, width=12).pack(side='right', padx=5)
+        tk.Button(btn_frame, text="Insert", command=self._insert, width=12).pack(side='right', padx=5)
+        self.status_label = tk.Label(btn_frame, text="", fg='gray')
+        self.status_label.pack(side='left')
+
+        self.listbox.bind('<<ListboxSelect>>', lambda event: self._show_preview())
+        self.listbox.bind('<Double-Button-1>', lambda event: self._insert())
+        self.window.bind('<Return>', lambda event: self._insert())
+        self.window.bind('<Escape>', lambda event: self.close())
+        self.window.bind('<Down>', lambda event: self._move(1))
+        self.window.bind('<Up>', lambda event: self._move(-1))
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        self._search()
+        self.search_entry.focus_set()
+
+    def close(self):
+        if not self.window:
+            return
+        if self._search_job:
+            self.window.after_cancel(self._search_job)
+            self._search_job = None
+        self.window.destroy()
+        self.window = None
+
+    def _schedule_search(self):
+        if self._search_job:
+            self.window.after_cancel(self._search_job)
+        self._search_job = self.window.after(self.SEARCH_DELAY_MS, self._search)
+
+    def _search(self):
+        self._search_job = None
+        try:
+            self.results = self.history.search(self.search_var.get(), limit=100)
+        except Exception as e:
+            self.results = []
+            self.status_label.config(text=f"Search failed: {e}")
+            return
+
+        self.listbox.delete(0, 'end')
+        for record in self.results:
+            when = datetime.datetime.fromtimestamp(record['created']).strftime('%d/%m %H:%M')
+            self.listbox.insert('end', f"{when}  {' '.join(record['text'].split())[:120]}")
+        self.status_label.config(text=f"{len(self.results)} results")
+        if self.results:
+            self._select(0)
+        else:
+            self._set_preview("")
+
+    def _select(self, index: int):
+        self.listbox.selection_clear(0, 'end')
+        self.listbox.selection_set(index)
+        self.listbox.see(index)
+        self._show_preview()
+
+    def _move(self, step: int):
+        if not self.results:
+            return
+        selection = self.listbox.curselection()
+        index = selection[0] + step if selection else 0
+        self._select(max(0, min(index, len(self.results) - 1)))
+
+    def _selected(self):
+        selection = self.listbox.curselection()
+        return self.results[selection[0]] if selection else None
+
+    def _show_preview(self):
+        record = self._selected()
+        if not record:
+            return
+        details = [record['text'], "", f"Raw: {record['raw_text']}"]
+        providers = ' + '.join(p for p in (record['transcription_provider'], record['llm_provider']) if p)
+        if providers:
+            details.append(f"Providers: {providers}")
+        if record['total_ms']:
+            details.append(f"Total: {record['total_ms']:.0f} ms")
+        if record['audio_path']:
+            details.append(f"Audio: {record['audio_path']}")
+        self._set_preview('\n'.join(details))
+
+    def _set_preview(self, text: str):
+        self.preview.config(state='normal')
+        self.preview.delete('1.0', 'end')
+        self.preview.insert('1.0', text)
+        self.preview.config(state='disabled')
+
+    def _copy(self):
+        record = self._selected()
+        if record:
+            self.window.clipboard_clear()
+            self.window.clipboard_append(record['text'])
+            self.status_label.config(text="Copied")
+
+    def _insert(self):
+        """Close the window and insert the selected text into the app that had focus"""
+        record = self._selected()
+        if not record:
+            return
+        self.close()
+        if self.root:
+            self.root.after(self.INSERT_DELAY_MS, lambda: self.on_insert(record['text']))
+        else:
+            self.on_insert(record['text'])
@@ -0,0 +1,135 @@
+"""
+Live microphone level for the recording widget.
+
+Draws the per-block statistics the AudioRecorder computes in its capture
+callback (mean and peak of each ~100 ms block), never the raw audio: a
+scrolling peak envelope plus a meter for the current block. Everything is
+drawn on one canvas whose items are created once and only moved, at a
+capped frame rate, and frames are skipped while no new block has arrived.
+"""
+import math
+import tkinter as tk
+from typing import Callable
+
+FLOOR_DB = -60.0  # Shown as silence
+CLIP_LEVEL = 32000  # Peak at which the meter turns red
+
+BAR_WIDTH = 3
+BAR_GAP = 1
+METER_WIDTH = 6
+METER_GAP = 6
+
+
+def level_fraction(level: float) -> float:
+    """Map an int16 block level (0-32767) to 0..1 on a dB scale (FLOOR_DB → 0, full scale → 1)"""
+    if level <= 0:
+        return 0.0
+    db = 20 * math.log10(level / 32767)
+    return min(1.0, max(0.0, 1 - db / FLOOR_DB))
+
+
+def bar_heights(peaks: list, count: int, height: int) -> list:
+    """
+    Heights of the envelope bars, newest block on the right.
+
+    Args:
+        peaks: Peak level of each block, oldest first
+        count: Number of bars
+        height: Canvas height in pixels
+
+    Returns:
+        count heights in pixels (at least 1, so silence shows as a line)
+    """
+    recent = peaks[-count:]
+    heights = [max(1, round(level_fraction(peak) * height)) for peak in recent]
+    return [1] * (count - len(heights)) + heights
+
+
+class LevelMeter:
+    """Peak envelope and current level of the take being recorded, on one canvas"""
+
+    FPS = 15  # Blocks arrive every ~100 ms: faster redraws would show nothing new
+
+    def __init__(self, parent, width: int = 180, height: int = 22, bg: str = '#1a1a1a'):
+        """
+        Args:
+            parent: Tk container
+            width: Canvas width in pixels
+            height: Canvas height in pixels
+            bg: Background color
+        """
+        self.height = height
+        self.canvas = tk.Canvas(parent, width=width, height=height, bg=bg, highlightthickness=0)
+
+        bar_count = max(1, (width - METER_WIDTH - METER_GAP) // (BAR_WIDTH + BAR_GAP))
+        self._bar_x = [n * (BAR_WIDTH + BAR_GAP) for n in range(bar_count)]
+        self._bars = [
+            self.canvas.create_rectangle(x, height // 2, x + BAR_WIDTH, height // 2 + 1, fill='#4caf50', outline='')
+            for x in self._bar_x
+        ]
+        self._meter_x = width - METER_WIDTH
+        self._meter = self.canvas.create_rectangle(
+            self._meter_x, height, width, height, fill='#4caf50', outline=''
+        )
+
+        self.source = None
+        self._frame_id = None
+        self._last_count = None
+        self._meter_color = '#4caf50'
+
+    def pack(self, **kwargs):
+        self.canvas.pack(**kwargs)
+
+    def start(self, source: Callable[[], tuple]):
+        """
+        Follow a level source.
+
+        Args:
+            source: Returns (blocks captured so far, ((mean, peak), ...) oldest first),
+                e.g. AudioRecorder.level_history
+        """
+        if source is self.source:
+            return
+        self.source = source
+        self._last_count = None
+        if self._frame_id is None:
+            self._frame()
+
+    def stop(self, clear: bool = False):
+        """Stop following the source (the last frame stays unless clear)"""
+        self.source = None
+        if self._frame_id is not None:
+            self.canvas.after_cancel(self._frame_id)
+            self._frame_id = None
+        if clear:
+            self.draw(())
+
+    def _frame(self):
+        self._frame_id = None
+        if self.source is None:
+            return
+
+        try:
+            count, levels = self.source()
+        except Exception:
+            count, levels = None, ()
+        if count is None or count != self._last_count:
+            self._last_count = count
+            self.draw(levels)
+
+        self._frame_id = self.canvas.after(1000 // self.FPS, self._frame)
+
+    def draw(self, levels):
+        """Move the canvas items to show levels ((mean, peak) per block, oldest first)"""
+        middle = self.height / 2
+        heights = bar_heights([peak for _, peak in levels], len(self._bars), self.height)
+        for item, x, bar_height in zip(self._bars, self._bar_x, heights):
+            self.canvas.coords(item, x, middle - bar_height / 2, x + BAR_WIDTH, middle + bar_height / 2)
+
+        mean, peak = levels[-1] if levels else (0, 0)
+        top = self.height - level_fraction(mean) * self.height
+        self.canvas.coords(self._meter, self._meter_x, top, self._meter_x + METER_WIDTH, self.height)
+        color = '#f44336' if peak >= CLIP_LEVEL else '#4caf50'
+        if color != self._meter_color:
+            self._meter_color = color
+            self.canvas.itemconfigure(self._meter, fill=color)
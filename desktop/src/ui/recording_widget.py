@@ -1,125 +1,192 @@
 import tkinter as tk
-import threading
 
+from src.ui.level_meter import LevelMeter
 
-class RecordingWidget:
-    """Small widget shown during recording"""
 
-    def __init__(self):
+class WidgetTake:
+    """One take's view of the RecordingWidget (callable from any thread)"""
+
+    def __init__(self, widget: 'RecordingWidget'):
+        self.widget = widget
+        self.title = "Recording"
+        self.status = "Press ESC to cancel"
+        self.animate = True
+        self.level_source = None
+
+    def update_status(self, title: str = None, status: str = None, stop_animation: bool = False):
+        """Update title and/or status text"""
+        self.widget._call(self.widget._update, self, title, status, stop_animation)
+
+    def show_levels(self, source):
+        """Show the live microphone level from source (e.g. AudioRecorder.level_history), None to stop"""
+        self.widget._call(self.widget._set_levels, self, source)
+
+    def hide(self):
+        """The take is done: hide the widget unless other takes are still in progress"""
+        self.widget._call(self.widget._remove, self)
+
+
+class RecordingWidget:
+    """
+    Small widget shown while recording and processing.
+
+    One Toplevel of the app's Tk root, created on first use and then only
+    shown and hidden. Every call is marshalled to the Tk thread with after().
+    When takes overlap (one recording while another is processed), the
+    widget shows the most recent one. While a take records, a level meter
+    shows whether the microphone picks up the voice.
+    """
+
+    ANIMATION_MS = 500
+
+    def __init__(self, root):
+        """
+        Args:
+            root: Tk root running the mainloop
+        """
+        self.root = root
         self.window = None
-        self.is_visible = False
+        self.title_label = None
+        self.status_label = None
+        self.level_meter = None
         self.animation_id = None
         self.dot_count = 0
+        self._takes = []  # Takes in progress, oldest first (Tk thread only)
 
-    def show(self):
-        """Show recording widget"""
-        if self.window:
+    def show(self) -> WidgetTake:
+        """
+        Show the widget for a new take.
+
+        Returns:
+            Handle to update and hide the widget for this take
+        """
+        take = WidgetTake(self)
+        self._call(self._add, take)
+        return take
+
+    def _call(self, function, *args):
+        """Run function on the Tk thread"""
+        try:
+            self.root.after(0, function, *args)
+        except (RuntimeError, tk.TclError):
+            pass  # Tk is shutting down
+
+    def _create_window(self):
+        self.window = tk.Toplevel(self.root)
+        self.window.withdraw()
+        self.window.title("Recording")
+        self.window.attributes('-topmost', True)
+        self.window.overrideredirect(True)  # Remove window decorations
+
+        # Small window in top-right corner
+        window_width = 250
+        window_height = 104
+        screen_width = self.window.winfo_screenwidth()
+        x = screen_width - window_width - 20
+        y = 20
+        self.window.geometry(f"{window_width}x{window_height}+{x}+{y}")
+
+        # Semi-transparent background with border
+        self.window.configure(bg='white')
+        self.window.attributes('-alpha', 0.95)
+
+        # Create content frame with border
+        frame = tk.Frame(self.window, bg='#1a1a1a', padx=20, pady=15, highlightbackground='white', highlightthickness=2)
+        frame.pack(fill='both', expand=True, padx=2, pady=2)
+
+        # Recording indicator (red circle)
+        canvas = tk.Canvas(frame, width=20, height=20, bg='#1a1a1a', highlightthickness=0)
+        canvas.pack(side='left', padx=(0, 10))
+        canvas.create_oval(2, 2, 18, 18, fill='red', outline='')
+
+        # Text label
+        text_frame = tk.Frame(frame, bg='#1a1a1a')
+        text_frame.pack(side='left', fill='both', expand=True)
+
+        self.title_label = tk.Label(
+            text_frame,
+            text="Recording",
+            font=('Arial', 14, 'bold'),
+            fg='white',
+            bg='#1a1a1a'
+        )
+        self.title_label.pack(anchor='w')
+
+        self.status_label = tk.Label(
+            text_frame,
+            text="Press ESC to cancel",
+            font=('Arial', 9),
+            fg='#888888',
+            bg='#1a1a1a'
+        )
+        self.status_label.pack(anchor='w')
+
+        self.level_meter = LevelMeter(text_frame, width=180, height=22, bg='#1a1a1a')
+        self.level_meter.pack(anchor='w', pady=(4, 0))
+
+    def _current(self):
+        return self._takes[-1] if self._takes else None
+
+    def _add(self, take: WidgetTake):
+        if self.window is None:
+            self._create_window()
+        self._takes.append(take)
+        self._render()
+        self.window.deiconify()
+        self.window.lift()
+        if self.animation_id is None:
+            self.animation_id = self.window.after(self.ANIMATION_MS, self._animate)
+
+    def _update(self, take: WidgetTake, title: str, status: str, stop_animation: bool):
+        if title:
+            take.title = title
+        if status:
+            take.status = status
+        if stop_animation:
+            take.animate = False
+        if take is self._current():
+            self._render()
+
+    def _set_levels(self, take: WidgetTake, source):
+        take.level_source = source
+        if take is self._current():
+            self._render()
+
+    def _remove(self, take: WidgetTake):
+        if take in self._takes:
+            self._takes.remove(take)
+        if self._takes:
+            self._render()
             return
 
-        def create_window():
-            self.window = tk.Tk()
-            self.window.title("Recording")
-            self.window.attributes('-topmost', True)
-            self.window.overrideredirect(True)  # Remove window decorations
-
-            # Small window in top-right corner
-            window_width = 250
-            window_height = 80
-            screen_width = self.window.winfo_screenwidth()
-            x = screen_width - window_width - 20
-            y = 20
-            self.window.geometry(f"{window_width}x{window_height}+{x}+{y}")
-
-            # Semi-transparent background with border
-            self.window.configure(bg='white')
-            self.window.attributes('-alpha', 0.95)
-
-            # Create content frame with border
-            frame = tk.Frame(self.window, bg='#1a1a1a', padx=20, pady=15, highlightbackground='white', highlightthickness=2)
-            frame.pack(fill='both', expand=True, padx=2, pady=2)
-
-            # Recording indicator (red circle)
-            canvas = tk.Canvas(frame, width=20, height=20, bg='#1a1a1a', highlightthickness=0)
-            canvas.pack(side='left', padx=(0, 10))
-            canvas.create_oval(2, 2, 18, 18, fill='red', outline='')
-
-            # Text label
-            text_frame = tk.Frame(frame, bg='#1a1a1a')
-            text_frame.pack(side='left', fill='both', expand=True)
-
-            self.title_label = tk.Label(
-                text_frame,
-                text="Recording",
-                font=('Arial', 14, 'bold'),
-                fg='white',
-                bg='#1a1a1a'
-            )
-            self.title_label.pack(anchor='w')
-
-            self.status_label = tk.Label(
-                text_frame,
-                text="Press ESC to cancel",
-                font=('Arial', 9),
-                fg='#888888',
-                bg='#1a1a1a'
-            )
-            self.status_label.pack(anchor='w')
-
-            self.is_visible = True
-            self._animate()
-            self.window.mainloop()
-
-        # Create window in separate thread
-        thread = threading.Thread(target=create_window, daemon=True)
-        thread.start()
+        if self.animation_id:
+            self.window.after_cancel(self.animation_id)
+            self.animation_id = None
+        self.level_meter.stop(clear=True)
+        self.window.withdraw()
+
+    def _render(self):
+        """Show the current take's text and, while it records, its level"""
+        take = self._current()
+        self.dot_count = 0
+        self.title_label.config(text=take.title)
+        self.status_label.config(text=take.status)
+        if take.level_source:
+            self.level_meter.start(take.level_source)
+        else:
+            self.level_meter.stop()
 
     def _animate(self):
         """Animate the status text with dots"""
-        if not self.is_visible or not self.window:
+        take = self._current()
+        if take is None:
+            self.animation_id = None
             return
 
-        try:
+        if take.animate:
             self.dot_count = (self.dot_count + 1) % 4
             dots = '.' * self.dot_count
-            self.status_label.config(text=f"Press ESC to cancel{dots}   ")
-
-            # Schedule next animation frame
-            self.animation_id = self.window.after(500, self._animate)
-        except:
-            pass
+            self.status_label.config(text=f"{take.status}{dots}   ")
 
-    def update_status(self, title: str = None, status: str = None, stop_animation: bool = False):
-        """Update title and/or status text"""
-        if not self.window:
-            return
-
-        try:
-            if title and self.title_label:
-                self.title_label.config(text=title)
-
-            if status and self.status_label:
-                self.status_label.config(text=status)
-
-            if stop_animation and self.animation_id:
-                self.window.after_cancel(self.animation_id)
-                self.animation_id = None
-        except:
-            pass
-
-    def hide(self):
-        """Hide recording widget"""
-        self.is_visible = False
-
-        if self.animation_id and self.window:
-            try:
-                self.window.after_cancel(self.animation_id)
-            except:
-                pass
-
-        if self.window:
-            try:
-                self.window.quit()
-                self.window.destroy()
-            except:
-                pass
-            self.window = None
+        # Schedule next animation frame
+        self.animation_id = self.window.after(self.ANIMATION_MS, self._animate)
@@ -1,8 +1,13 @@
+import copy
 import tkinter as tk
 from tkinter import ttk, messagebox
 import subprocess
+import threading
 from typing import Callable
 
+from src.providers.llm.prompts import PROMPT_VARIANTS
+from src.providers.registry import DEFAULT_LOCAL_URL
+
 
 class SettingsWindow:
     """Settings window for configuration"""
@@ -10,16 +15,35 @@ class SettingsWindow:
     LLM_MODELS = {
         'ollama': ['llama3.2:3b', 'gemma2:2b', 'mistral:7b', 'llama3.1:8b'],
         'openai': ['gpt-4o-mini', 'gpt-4o', 'gpt-3.5-turbo'],
-        'groq': ['llama-3.1-8b-instant', 'mixtral-8x7b-32768', 'gemma2-9b-it']
+        'groq': ['llama-3.1-8b-instant', 'mixtral-8x7b-32768', 'gemma2-9b-it'],
+        'openai_compatible': [],  # Whatever the local server serves: typed in
     }
 
-    def __init__(self, config: dict, config_manager, on_save: Callable = None, root=None):
-        self.config = config.copy()
+    def __init__(self, config: dict, config_manager, on_save: Callable = None, root=None,
+                 run_task: Callable = None):
+        """
+        Args:
+            config: Current configuration (edited on a deep copy: the app and the config
+                writer keep using it until the new one is saved)
+            config_manager: Saves the configuration
+            on_save: Called with the new configuration after saving
+            root: Tk root (the window is a Toplevel of it)
+            run_task: Runs the audio/API tests in the background (default: a new thread per test)
+        """
+        self.config = copy.deepcopy(config)
         self.config_manager = config_manager
         self.on_save = on_save
         self.root = root
+        self.run_task = run_task
         self.window = None
 
+    def _run_task(self, task: Callable):
+        """Run a test off the Tk thread"""
+        if self.run_task:
+            self.run_task(task)
+        else:
+            threading.Thread(target=task, daemon=True).start()
+
     def show(self):
         """Show settings window"""
         if self.window:
@@ -93,7 +117,6 @@ class SettingsWindow:
     def _capture_hotkey(self):
         """Capture hotkey from user input"""
         from pynput import keyboard
-        import threading
 
         captured_keys = set()
         captured_modifiers = set()
@@ -303,7 +326,6 @@ class SettingsWindow:
 
     def _test_microphone(self):
         """Test microphone and suggest gain"""
-        import threading
         import sounddevice as sd
         import numpy as np
 
@@ -365,9 +387,7 @@ class SettingsWindow:
                 self.calibration_result.config(text=f"Error: {str(e)}", fg="red")
                 self.calibrate_btn.config(state='normal', text="Test Microphone (5s)")
 
-        # Run in separate thread
-        thread = threading.Thread(target=test_audio, daemon=True)
-        thread.start()
+        self._run_task(test_audio)
 
     def _create_transcription_tab(self, notebook):
         """Create transcription provider configuration tab"""
@@ -379,12 +399,22 @@ class SettingsWindow:
         # Provider selection
         tk.Label(frame, text="Provider:").pack(anchor='w', padx=20)
         self.trans_provider_var = tk.StringVar(value=self.config.get('transcription', {}).get('provider', 'groq'))
+        self.trans_provider_var.trace('w', self._on_trans_provider_change)
         providers_frame = tk.Frame(frame)
         providers_frame.pack(fill='x', padx=20, pady=5)
 
         tk.Radiobutton(providers_frame, text="Groq (Free, Fast)", variable=self.trans_provider_var, value='groq').pack(anchor='w')
         tk.Radiobutton(providers_frame, text="OpenAI ($0.006/min)", variable=self.trans_provider_var, value='openai').pack(anchor='w')
         tk.Radiobutton(providers_frame, text="Deepgram ($0.0043/min)", variable=self.trans_provider_var, value='deepgram').pack(anchor='w')
+        tk.Radiobutton(providers_frame, text="OpenAI-compatible (Local server)", variable=self.trans_provider_var, value='openai_compatible').pack(anchor='w')
+
+        # Base URL: required for a local server, optional override for hosted APIs
+        self.trans_base_url_label = tk.Label(frame, text="Base URL:")
+        self.trans_base_url_label.pack(anchor='w', padx=20, pady=(10, 0))
+        self.trans_base_url_entry = tk.Entry(frame, width=50)
+        self.trans_base_url_entry.pack(padx=20, pady=5)
+        self.trans_base_url_entry.insert(0, self.config.get('transcription', {}).get('base_url') or '')
+        self._on_trans_provider_change()
 
         # API Key
         tk.Label(frame, text="API Key:").pack(anchor='w', padx=20, pady=(10, 0))
@@ -417,6 +447,8 @@ class SettingsWindow:
         tk.Radiobutton(providers_frame, text="Ollama (Local, Free)", variable=self.llm_provider_var, value='ollama').pack(anchor='w')
         tk.Radiobutton(providers_frame, text="OpenAI (Cloud)", variable=self.llm_provider_var, value='openai').pack(anchor='w')
         tk.Radiobutton(providers_frame, text="Groq (Cloud, Free)", variable=self.llm_provider_var, value='groq').pack(anchor='w')
+        tk.Radiobutton(providers_frame, text="OpenAI-compatible (Local server)", variable=self.llm_provider_var, value='openai_compatible').pack(anchor='w')
+        tk.Radiobutton(providers_frame, text="Punctuation model (Local, no LLM)", variable=self.llm_provider_var, value='punct').pack(anchor='w')
 
         # Model selection
         tk.Label(frame, text="Model:").pack(anchor='w', padx=20, pady=(10, 0))
@@ -425,18 +457,34 @@ class SettingsWindow:
         self.llm_model_combo.pack(padx=20, pady=5)
         self._update_llm_models()
 
-        # API Key (hidden for Ollama)
-        self.llm_api_key_label = tk.Label(frame, text="API Key:")
-        self.llm_api_key_entry = tk.Entry(frame, width=50, show='*')
-
-        current_llm_key = self.config_manager.get_llm_api_key()
-        if current_llm_key:
-            self.llm_api_key_entry.insert(0, current_llm_key)
-
-        # Ollama URL (only for Ollama)
-        self.ollama_url_label = tk.Label(frame, text="Ollama URL:")
-        self.ollama_url_entry = tk.Entry(frame, width=50)
-        self.ollama_url_entry.insert(0, self.config.get('llm', {}).get('ollama_url', 'http://localhost:11434'))
+        llm_config = self.config.get('llm', {})
+
+        # Provider-specific fields, shown by _on_llm_provider_change
+        self.llm_fields_frame = tk.Frame(frame)
+        self.llm_fields_frame.pack(fill='x')
+        self.llm_fields = {}
+
+        def field(name: str, label: str, value: str, show: str = None) -> tk.Entry:
+            entry = tk.Entry(self.llm_fields_frame, width=50, show=show)
+            entry.insert(0, value)
+            self.llm_fields[name] = (tk.Label(self.llm_fields_frame, text=label), entry)
+            return entry
+
+        # API Key (not used by Ollama and the punctuation model)
+        self.llm_api_key_entry = field('api_key', "API Key:", self.config_manager.get_llm_api_key() or '', show='*')
+        # Base URL: required for a local server, optional override for hosted APIs
+        self.llm_base_url_entry = field('base_url', "Base URL:", llm_config.get('base_url') or '')
+        # Ollama URL and how long the model stays loaded
+        self.ollama_url_entry = field('ollama_url', "Ollama URL:", llm_config.get('ollama_url', 'http://localhost:11434'))
+        self.keep_alive_entry = field('keep_alive', "Keep model loaded for (e.g. 30m):", llm_config.get('keep_alive', '30m'))
+        # Punctuation model directory
+        self.punct_path_entry = field('punct_model_path', "Punctuation model folder:", llm_config.get('punct_model_path', 'models/punct'))
+
+        # System prompt variant (LLM providers only)
+        self.prompt_variant_var = tk.StringVar(value=llm_config.get('prompt_variant', 'full'))
+        prompt_combo = ttk.Combobox(self.llm_fields_frame, textvariable=self.prompt_variant_var, width=47, state='readonly')
+        prompt_combo['values'] = list(PROMPT_VARIANTS)
+        self.llm_fields['prompt_variant'] = (tk.Label(self.llm_fields_frame, text="Prompt variant:"), prompt_combo)
 
         self._on_llm_provider_change()
 
@@ -472,18 +520,43 @@ class SettingsWindow:
         # Update model list
         self._update_llm_models()
 
-        # Show/hide API key and Ollama URL based on provider
-        if provider == 'ollama':
-            self.llm_api_key_label.pack_forget()
-            self.llm_api_key_entry.pack_forget()
-            self.ollama_url_label.pack(anchor='w', padx=20, pady=(10, 0))
-            self.ollama_url_entry.pack(padx=20, pady=5)
+        # Any model name the server knows can be typed in for a local server; the
+        # punctuation model has none
+        if provider == 'punct':
+            self.llm_model_combo['state'] = 'disabled'
         else:
-            self.ollama_url_label.pack_forget()
-            self.ollama_url_entry.pack_forget()
-            self.llm_api_key_label.pack(anchor='w', padx=20, pady=(10, 0))
-            self.llm_api_key_entry.pack(padx=20, pady=5)
+            self.llm_model_combo['state'] = 'normal' if provider == 'openai_compatible' else 'readonly'
 
+        # Show only the fields the provider uses
+        if provider == 'ollama':
+            shown = ['ollama_url', 'keep_alive', 'prompt_variant']
+        elif provider == 'punct':
+            shown = ['punct_model_path']
+        else:
+            shown = ['api_key', 'base_url', 'prompt_variant']
+
+        self._default_base_url(self.llm_base_url_entry, provider)
+
+        for name, (label, widget) in self.llm_fields.items():
+            label.pack_forget()
+            widget.pack_forget()
+        for name in shown:
+            label, widget = self.llm_fields[name]
+            label.pack(anchor='w', padx=20, pady=(10, 0))
+            widget.pack(padx=20, pady=5)
+
+    def _on_trans_provider_change(self, *args):
+        """Handle transcription provider change"""
+        self._default_base_url(self.trans_base_url_entry, self.trans_provider_var.get())
+
+    @staticmethod
+    def _default_base_url(entry: tk.Entry, provider: str):
+        """Fill in the local server URL for openai_compatible, and take it out when switching away"""
+        url = entry.get().strip()
+        if provider == 'openai_compatible' and not url:
+            entry.insert(0, DEFAULT_LOCAL_URL)
+        elif provider != 'openai_compatible' and url == DEFAULT_LOCAL_URL:
+            entry.delete(0, 'end')
     def _update_llm_models(self):
         """Update LLM model list based on selected provider"""
         provider = self.llm_provider_var.get()
@@ -526,19 +599,29 @@ class SettingsWindow:
 
     def _test_transcription(self):
         """Test transcription API connection"""
-        import threading
         import requests
 
         def test_api():
             try:
                 # Get API key from entry
                 api_key = self.trans_api_key_entry.get().strip()
+                provider = self.trans_provider_var.get()
+                base_url = self.trans_base_url_entry.get().strip()
+
+                # A local server usually needs no key
+                if provider == 'openai_compatible':
+                    headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+                    response = requests.get(f"{base_url.rstrip('/')}/models", headers=headers, timeout=5)
+                    if response.status_code == 200:
+                        messagebox.showinfo("Success", f"Server at {base_url} is running!")
+                    else:
+                        messagebox.showerror("Error", f"Server responded with status {response.status_code}")
+                    return
+
                 if not api_key:
                     messagebox.showerror("Error", "Please enter an API key first")
                     return
 
-                provider = self.trans_provider_var.get()
-
                 # Test based on provider
                 if provider == 'groq':
                     url = "https://api.groq.com/openai/v1/models"
@@ -568,13 +651,10 @@ class SettingsWindow:
             except Exception as e:
                 messagebox.showerror("Error", f"Test failed: {str(e)}")
 
-        # Run in thread
-        thread = threading.Thread(target=test_api, daemon=True)
-        thread.start()
+        self._run_task(test_api)
 
     def _test_llm(self):
         """Test LLM API connection"""
-        import threading
         import requests
 
         def test_api():
@@ -598,8 +678,30 @@ class SettingsWindow:
                         messagebox.showerror("Error", "Cannot connect to Ollama.\nMake sure Ollama is running: 'ollama serve'")
                     return
 
-                # Cloud LLM test (OpenAI, Groq)
+                # Punctuation model test: load it
+                if provider == 'punct':
+                    from src.providers.llm.punct import PunctuationProvider
+                    punct = PunctuationProvider(model_path=self.punct_path_entry.get().strip())
+                    if punct.warm_up():
+                        messagebox.showinfo("Success", f"Punctuation model loaded from {punct.model_path}")
+                    else:
+                        messagebox.showerror("Error", f"Cannot load the punctuation model from {punct.model_path}")
+                    return
+
                 api_key = self.llm_api_key_entry.get().strip()
+
+                # Local server test (usually no API key)
+                if provider == 'openai_compatible':
+                    base_url = self.llm_base_url_entry.get().strip()
+                    headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+                    response = requests.get(f"{base_url.rstrip('/')}/models", headers=headers, timeout=5)
+                    if response.status_code == 200:
+                        messagebox.showinfo("Success", f"Server at {base_url} is running!")
+                    else:
+                        messagebox.showerror("Error", f"Server responded with status {response.status_code}")
+                    return
+
+                # Cloud LLM test (OpenAI, Groq)
                 if not api_key:
                     messagebox.showerror("Error", "Please enter an API key first")
                     return
@@ -628,9 +730,7 @@ class SettingsWindow:
             except Exception as e:
                 messagebox.showerror("Error", f"Test failed: {str(e)}")
 
-        # Run in thread
-        thread = threading.Thread(target=test_api, daemon=True)
-        thread.start()
+        self._run_task(test_api)
 
     def _save(self):
         """Save configuration"""
@@ -658,22 +758,23 @@ class SettingsWindow:
 
         # Transcription
         self.config['transcription']['provider'] = self.trans_provider_var.get()
+        self._save_base_url(self.config['transcription'], self.trans_base_url_entry)
         trans_api_key = self.trans_api_key_entry.get().strip()
         if trans_api_key:
-            self.config_manager.config = self.config
-            self.config_manager.set_transcription_api_key(trans_api_key)
-            self.config = self.config_manager.config
+            self.config['transcription']['api_key_encrypted'] = self.config_manager.encrypt_api_key(trans_api_key)
 
         # LLM
         self.config['llm']['provider'] = self.llm_provider_var.get()
         self.config['llm']['model'] = self.llm_model_var.get()
         self.config['llm']['ollama_url'] = self.ollama_url_entry.get().strip()
+        self.config['llm']['keep_alive'] = self.keep_alive_entry.get().strip() or '30m'
+        self.config['llm']['punct_model_path'] = self.punct_path_entry.get().strip() or 'models/punct'
+        self.config['llm']['prompt_variant'] = self.prompt_variant_var.get()
+        self._save_base_url(self.config['llm'], self.llm_base_url_entry)
 
         llm_api_key = self.llm_api_key_entry.get().strip()
         if llm_api_key:
-            self.config_manager.config = self.config
-            self.config_manager.set_llm_api_key(llm_api_key)
-            self.config = self.config_manager.config
+            self.config['llm']['api_key_encrypted'] = self.config_manager.encrypt_api_key(llm_api_key)
 
         # Audio
         device_str = self.device_var.get()
@@ -698,6 +799,15 @@ class SettingsWindow:
         messagebox.showinfo("Success", "Settings saved successfully!")
         self._cancel()
 
+    @staticmethod
+    def _save_base_url(section: dict, entry: tk.Entry):
+        """Store the base URL override, or remove it when the field is empty"""
+        base_url = entry.get().strip()
+        if base_url:
+            section['base_url'] = base_url
+        else:
+            section.pop('base_url', None)
+
     def _cancel(self):
         """Cancel and close window"""
         if self.window:
@@ -9,10 +9,14 @@ class SystemTray:
     def __init__(
         self,
         on_settings: Callable = None,
-        on_exit: Callable = None
+        on_history: Callable = None,
+        on_exit: Callable = None,
+        on_ready: Callable = None
     ):
         self.on_settings = on_settings
+        self.on_history = on_history
         self.on_exit = on_exit
+        self.on_ready = on_ready  # Called once the icon is visible
         self.icon = None
         self.is_recording = False
 
@@ -41,6 +45,11 @@ class SystemTray:
                 self._open_settings,
                 default=True  # Make it the default action
             ),
+            pystray.MenuItem(
+                "History",
+                self._open_history,
+                visible=lambda item: self.on_history is not None
+            ),
             pystray.MenuItem(
                 "Exit",
                 lambda: self.stop()
@@ -55,6 +64,14 @@ class SystemTray:
             except Exception as e:
                 print(f"Error opening settings: {e}")
 
+    def _open_history(self, icon=None, item=None):
+        """Open history window (safe wrapper)"""
+        if self.on_history:
+            try:
+                self.on_history()
+            except Exception as e:
+                print(f"Error opening history: {e}")
+
     def start(self):
         """Start system tray icon"""
         self.icon = pystray.Icon(
@@ -65,7 +82,16 @@ class SystemTray:
         )
 
         # Run in blocking mode
-        self.icon.run()
+        self.icon.run(setup=self._setup)
+
+    def _setup(self, icon):
+        """Show the icon (pystray leaves it hidden when a setup callback is given)"""
+        icon.visible = True
+        if self.on_ready:
+            try:
+                self.on_ready()
+            except Exception as e:
+                print(f"Tray ready callback failed: {e}")
 
     def stop(self):
         """Stop system tray icon"""
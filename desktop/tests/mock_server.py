@@ -0,0 +1,366 @@
+"""
+Local stand-in for the Groq, OpenAI, Deepgram and Ollama HTTP APIs.
+
+Implements the endpoints the providers use (audio transcriptions, chat
+completions, Deepgram listen, Ollama chat/generate) including streaming
+responses, with injectable latency, jitter, errors and rate limits.
+
+From pytest or benchmarks:
+
+    with MockServer(latency=0.2, transcript="ciao a tutti") as server:
+        provider = GroqWhisperProvider(api_key="test", base_url=server.groq_base_url)
+
+Standalone (point config base_url / ollama_url at it):
+
+    python -m tests.mock_server --port 8765 --latency 0.3 --jitter 0.1
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from collections import deque
+from email.parser import BytesParser
+from email.policy import default as default_policy
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Optional, Union
+
+
+def default_formatter(text: str) -> str:
+    """Minimal 'LLM': capitalize and add a period"""
+    text = text.strip()
+    if text and not text.endswith(('.', '!', '?')):
+        text += '.'
+    return text[:1].upper() + text[1:]
+
+
+def parse_multipart(content_type: str, body: bytes) -> dict:
+    """Parse a multipart/form-data body into {name: bytes}"""
+    message = BytesParser(policy=default_policy).parsebytes(
+        f"Content-Type: {content_type}\r\n\r\n".encode() + body
+    )
+    fields = {}
+    for part in message.iter_parts():
+        name = part.get_param('name', header='content-disposition')
+        fields[name] = part.get_payload(decode=True)
+    return fields
+
+
+class MockServer:
+    """In-process HTTP stand-in for the provider APIs"""
+
+    def __init__(
+        self,
+        port: int = 0,
+        latency: Union[float, dict] = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 500,
+        rate_limit: Optional[tuple] = None,
+        transcript: Union[str, Callable] = "this is a test",
+        formatter: Callable = default_formatter,
+        load_latency: float = 0.0,
+        stream_interval: float = 0.0,
+        seed: Optional[int] = None
+    ):
+        """
+        Args:
+            port: Port to listen on (0 = any free port)
+            latency: Seconds before the first response byte; a float, or a dict
+                keyed by endpoint ('transcription', 'chat', 'listen', 'ollama')
+            jitter: Random +/- seconds added to latency
+            error_rate: Probability of answering with error_status
+            error_status: HTTP status used for random errors
+            rate_limit: (max_requests, per_seconds), answered with 429 beyond it
+            transcript: Transcription text, or callable(audio_bytes, fields) -> text
+            formatter: Chat 'model': callable(user_message) -> reply
+            load_latency: Ollama model load time, paid while the model is unloaded
+            stream_interval: Seconds between streamed chunks
+            seed: Seed for jitter and random errors
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.rate_limit = rate_limit
+        self.transcript = transcript
+        self.formatter = formatter
+        self.load_latency = load_latency
+        self.stream_interval = stream_interval
+
+        self.requests = []
+        self.model_loaded = False
+        self._random = random.Random(seed)
+        self._forced_errors = deque()
+        self._request_times = deque()
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', port), self._make_handler())
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = None
+
+    # Base URLs to pass to the providers
+    @property
+    def groq_base_url(self) -> str:
+        return f"{self.url}/openai/v1"
+
+    @property
+    def openai_base_url(self) -> str:
+        return f"{self.url}/v1"
+
+    @property
+    def deepgram_base_url(self) -> str:
+        return f"{self.url}/v1"
+
+    @property
+    def ollama_url(self) -> str:
+        return self.url
+
+    def start(self) -> 'MockServer':
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self) -> 'MockServer':
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def fail_next(self, status: int, count: int = 1):
+        """Answer the next `count` requests with an HTTP error"""
+        with self._lock:
+            self._forced_errors.extend([status] * count)
+
+    def unload_model(self):
+        """Simulate Ollama evicting the model after keep_alive expires"""
+        self.model_loaded = False
+
+    def requests_to(self, endpoint: str) -> list:
+        """Recorded requests for an endpoint"""
+        return [request for request in self.requests if request['endpoint'] == endpoint]
+
+    def _delay(self, endpoint: str):
+        latency = self.latency.get(endpoint, 0.0) if isinstance(self.latency, dict) else self.latency
+        if self.jitter:
+            latency += self._random.uniform(-self.jitter, self.jitter)
+        if latency > 0:
+            time.sleep(latency)
+
+    def _injected_error(self) -> Optional[int]:
+        """Status code to answer with instead of a normal response, if any"""
+        with self._lock:
+            if self._forced_errors:
+                return self._forced_errors.popleft()
+
+            if self.rate_limit:
+                max_requests, window = self.rate_limit
+                now = time.time()
+                while self._request_times and now - self._request_times[0] > window:
+                    self._request_times.popleft()
+                if len(self._request_times) >= max_requests:
+                    return 429
+                self._request_times.append(now)
+
+            if self.error_rate and self._random.random() < self.error_rate:
+                return self.error_status
+        return None
+
+    def _ensure_model_loaded(self):
+        with self._load_lock:
+            if not self.model_loaded:
+                time.sleep(self.load_latency)
+                self.model_loaded = True
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def _send_json(self, data: dict, status: int = 200, headers: dict = None):
+                body = json.dumps(data).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _send_stream(self, content_type: str, chunks):
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Transfer-Encoding', 'chunked')
+                self.end_headers()
+                for index, chunk in enumerate(chunks):
+                    if index and server.stream_interval:
+                        time.sleep(server.stream_interval)
+                    data = chunk.encode()
+                    self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                    self.wfile.flush()
+                self.wfile.write(b"0\r\n\r\n")
+
+            def _send_error(self, status: int):
+                headers = {'Retry-After': '1'} if status == 429 else None
+                self._send_json({"error": {"message": f"mock error {status}", "code": status}}, status, headers)
+
+            def do_GET(self):
+                endpoint = 'models'
+                server.requests.append({'endpoint': endpoint, 'method': 'GET', 'path': self.path,
+                                        'headers': dict(self.headers), 'size': 0})
+                if self.path == '/api/tags':
+                    self._send_json({"models": [{"name": "llama3.2:3b"}]})
+                elif self.path.endswith('/models'):
+                    self._send_json({"object": "list", "data": [{"id": "mock-model"}]})
+                else:
+                    self._send_error(404)
+
+            def do_POST(self):
+                path = self.path.split('?', 1)[0]
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+
+                if path.endswith('/audio/transcriptions'):
+                    endpoint = 'transcription'
+                elif path.endswith('/chat/completions'):
+                    endpoint = 'chat'
+                elif path.endswith('/listen'):
+                    endpoint = 'listen'
+                elif path in ('/api/chat', '/api/generate'):
+                    endpoint = 'ollama'
+                else:
+                    self._send_error(404)
+                    return
+
+                record = {'endpoint': endpoint, 'method': 'POST', 'path': self.path,
+                          'headers': dict(self.headers), 'size': len(body), 'time': time.time()}
+                server.requests.append(record)
+
+                status = server._injected_error()
+                server._delay(endpoint)
+                if status:
+                    self._send_error(status)
+                    return
+
+                getattr(self, f"_handle_{endpoint}")(body, record)
+
+            def _handle_transcription(self, body: bytes, record: dict):
+                fields = parse_multipart(self.headers['Content-Type'], body)
+                record['fields'] = {name: value for name, value in fields.items() if name != 'file'}
+                audio = fields.get('file', b'')
+                text = server.transcript(audio, fields) if callable(server.transcript) else server.transcript
+                self._send_json({"text": text})
+
+            def _handle_listen(self, body: bytes, record: dict):
+                from urllib.parse import parse_qs, urlsplit
+                record['params'] = {k: v[0] for k, v in parse_qs(urlsplit(self.path).query).items()}
+                text = server.transcript(body, record['params']) if callable(server.transcript) else server.transcript
+                self._send_json({"results": {"channels": [{"alternatives": [{"transcript": text, "confidence": 0.99}]}]}})
+
+            def _handle_chat(self, body: bytes, record: dict):
+                payload = json.loads(body)
+                record['json'] = payload
+                user_message = payload['messages'][-1]['content']
+                reply = server.formatter(user_message)
+                prompt_tokens = sum(len(m['content'].split()) for m in payload['messages'])
+                usage = {"prompt_tokens": prompt_tokens, "completion_tokens": len(reply.split())}
+
+                if payload.get('stream'):
+                    chunks = [
+                        "data: " + json.dumps({"choices": [{"index": 0, "delta": {"content": piece}}]}) + "\n\n"
+                        for piece in _pieces(reply)
+                    ]
+                    chunks.append("data: " + json.dumps({"choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+                                                         "usage": usage}) + "\n\n")
+                    chunks.append("data: [DONE]\n\n")
+                    self._send_stream('text/event-stream', chunks)
+                else:
+                    self._send_json({
+                        "object": "chat.completion",
+                        "model": payload.get('model'),
+                        "choices": [{"index": 0, "message": {"role": "assistant", "content": reply},
+                                     "finish_reason": "stop"}],
+                        "usage": usage
+                    })
+
+            def _handle_ollama(self, body: bytes, record: dict):
+                payload = json.loads(body)
+                record['json'] = payload
+                server._ensure_model_loaded()
+
+                if self.path.startswith('/api/generate'):
+                    user_message = payload.get('prompt', '')
+                else:
+                    user_message = payload['messages'][-1]['content'] if payload.get('messages') else ''
+
+                if not user_message:
+                    # Empty request: Ollama just loads the model
+                    self._send_json({"model": payload.get('model'), "message": {"role": "assistant", "content": ""},
+                                     "done": True, "done_reason": "load"})
+                    return
+
+                reply = server.formatter(user_message)
+                counts = {"prompt_eval_count": len(user_message.split()), "eval_count": len(reply.split())}
+
+                if payload.get('stream', True):
+                    chunks = [
+                        json.dumps({"model": payload.get('model'), "message": {"role": "assistant", "content": piece},
+                                    "done": False}) + "\n"
+                        for piece in _pieces(reply)
+                    ]
+                    chunks.append(json.dumps(dict({"model": payload.get('model'), "done": True}, **counts)) + "\n")
+                    self._send_stream('application/x-ndjson', chunks)
+                else:
+                    self._send_json(dict({"model": payload.get('model'),
+                                          "message": {"role": "assistant", "content": reply},
+                                          "done": True}, **counts))
+
+        return Handler
+
+
+def _pieces(text: str) -> list:
+    """Split a reply into word-sized streaming pieces"""
+    words = text.split(' ')
+    return [word if index == 0 else ' ' + word for index, word in enumerate(words)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the provider API stand-in")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--load-latency', type=float, default=0.0)
+    parser.add_argument('--transcript', default="this is a test")
+    args = parser.parse_args()
+
+    server = MockServer(
+        port=args.port,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        load_latency=args.load_latency,
+        transcript=args.transcript
+    )
+    print(f"Mock provider APIs on {server.url}")
+    print(f"  Groq:     {server.groq_base_url}")
+    print(f"  OpenAI:   {server.openai_base_url}")
+    print(f"  Deepgram: {server.deepgram_base_url}")
+    print(f"  Ollama:   {server.ollama_url}")
+    try:
+        server.server.serve_forever()
+    except KeyboardInterrupt:
+        server.server.server_close()
+
+
+if __name__ == "__main__":
+    main()
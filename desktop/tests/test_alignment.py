@@ -0,0 +1,76 @@
+"""Test alignment-based salvage of rejected LLM output"""
+from src.providers.llm.alignment import align_words, salvage_output
+from src.providers.llm.base import FILLER_WORDS, LLMProvider
+
+
+class MockLLMProvider(LLMProvider):
+    """Mock LLM provider exposing fallback formatting"""
+
+    def process(self, text: str) -> str:
+        pass
+
+
+def test_align_words():
+    """Test that alignment reports matches, deletions and insertions"""
+    pairs = align_words(['a', 'b', 'c'], ['a', 'c', 'd'])
+    assert pairs == [(0, 0), (1, None), (2, 1), (None, 2)]
+
+
+def test_answer_appended_to_question():
+    """Test that an answer after the formatted question is dropped"""
+    result = salvage_output(
+        "come si configura git",
+        "Come si configura Git? Per configurare git devi installarlo.",
+        FILLER_WORDS
+    )
+    assert result == "Come si configura Git?"
+
+
+def test_keeps_formatting_of_aligned_words():
+    """Test that punctuation and casing survive around dropped content"""
+    result = salvage_output(
+        "ok allora domani ci vediamo alle tre poi andiamo al mare",
+        "Ok, allora domani ci vediamo alle tre. Poi andiamo al mare. Ti consiglio di portare la crema.",
+        FILLER_WORDS
+    )
+    assert result == "Ok, allora domani ci vediamo alle tre. Poi andiamo al mare."
+
+
+def test_dropped_words_and_fillers():
+    """Test that words the LLM dropped are restored, except fillers"""
+    assert salvage_output("penso che dovremmo proprio provare", "Penso che dovremmo provare, ecco.", FILLER_WORDS) == \
+        "Penso che dovremmo proprio provare."
+    assert salvage_output("um penso che", "Penso che. Ecco la risposta.", FILLER_WORDS) == "Penso che."
+
+
+def test_provider_fallback_format():
+    """Test the provider fallback with an unusable response"""
+    provider = MockLLMProvider()
+    assert provider.fallback_format("come si fa questo", "") == "Come si fa questo."
+    assert provider.fallback_format(
+        "bisogna trovare il modo di testare playwright",
+        "Ecco una guida per testare con Playwright: 1) Installa..."
+    ) == "Bisogna trovare il modo di testare Playwright."
+
+
+def test_substitutions_keep_casing_only():
+    """Test that punctuation is not pasted onto a different word"""
+    result = salvage_output(
+        "come si configura git",
+        "Per configurare git, devi prima installare git sul tuo sistema.",
+        FILLER_WORDS
+    )
+    assert result == "Come si configura git."
+
+
+def test_near_matches_keep_punctuation():
+    """Test that a respelled word still takes the LLM's punctuation"""
+    result = salvage_output("bisogna testare playwrite ok", "Bisogna testare Playwright, ok.", FILLER_WORDS)
+    assert result == "Bisogna testare Playwrite, ok."
+
+
+def test_long_transcript_alignment():
+    """Test that long inputs align with a narrow band (timed in benchmarks.microbench)"""
+    words = ' '.join(f"parola{i}" for i in range(2000))
+    formatted = words.capitalize() + '.'
+    assert salvage_output(words, formatted) == formatted
@@ -0,0 +1,47 @@
+"""Test the end-to-end benchmark against the local stand-in APIs"""
+import copy
+
+from benchmarks.bench_e2e import compare, evaluate, mock_config, mock_server, wer
+from benchmarks.fixtures import load_audio
+from src.core.text_processor import TextProcessor
+
+
+def test_wer():
+    assert wer("Ciao, come stai?", "ciao come stai") == 0.0
+    assert wer("one two three four", "one too three") == 0.5
+    assert wer("one two", "one two three four") == 1.0
+
+
+def test_mock_run_measures_wer_latency_and_bytes():
+    with mock_server(latency=0.01) as server:
+        processor = TextProcessor(mock_config(server))
+        results = evaluate(processor, ['it'], repeat=2, warm_up=False)
+
+    result = results['fixtures']['it']
+    assert result['runs'] == 2 and result['errors'] == 0
+    assert result['raw_wer'] == 0.0
+    assert result['wer'] < 0.05
+    # The WAV upload dominates what is sent
+    assert result['bytes_sent'] > len(load_audio('it'))
+    assert result['stages']['transcription']['count'] == 2
+    assert result['stages']['total']['p50'] >= result['stages']['transcription']['p50']
+
+
+def test_compare_flags_regressions():
+    baseline = {'fixtures': {'it': {
+        'errors': 0, 'raw_wer': 0.05, 'wer': 0.08,
+        'stages': {'total': {'p50': 1000.0}, 'transcription': {'p50': 400.0}, 'llm': {'p50': 20.0}},
+    }}}
+    results = copy.deepcopy(baseline)
+    assert compare(results, baseline) == []
+
+    # Small absolute changes on fast stages are noise
+    results['fixtures']['it']['stages']['llm']['p50'] = 60.0
+    assert compare(results, baseline) == []
+
+    results['fixtures']['it']['stages']['total']['p50'] = 1300.0
+    results['fixtures']['it']['wer'] = 0.2
+    failures = compare(results, baseline)
+    assert len(failures) == 2
+    assert any('total p50' in failure for failure in failures)
+    assert any('wer 0.200' in failure for failure in failures)
@@ -1,6 +1,8 @@
 import pytest
+import json
 import os
 import tempfile
+import time
 from src.core.config_manager import ConfigManager
 
 
@@ -52,3 +54,98 @@ def test_api_key_encryption():
     # Decrypt
     decrypted = config_manager.decrypt_api_key(encrypted)
     assert decrypted == api_key
+
+
+def test_unreadable_config_falls_back_and_is_repaired(tmp_path):
+    """A truncated config is skipped on load and rewritten by the next save"""
+    path = tmp_path / 'config.json'
+    path.write_text('{"hotkey": {"key": "sp')
+
+    config_manager = ConfigManager(str(path))
+    config = config_manager.load()
+    assert 'transcription' in config
+    assert config_manager.config_path == str(path)
+
+    config_manager.save()
+    assert ConfigManager(str(path)).load()['transcription'] == config['transcription']
+
+
+def test_save_is_atomic(tmp_path, monkeypatch):
+    """A failed write leaves the previous config and no temp files"""
+    path = tmp_path / 'config.json'
+    config_manager = ConfigManager(str(path))
+    config_manager.save({'audio': {'volume_gain': 1.0}})
+
+    def fail(*args):
+        raise OSError("disk full")
+    monkeypatch.setattr(os, 'replace', fail)
+    with pytest.raises(OSError):
+        config_manager.save({'audio': {'volume_gain': 9.0}})
+
+    assert json.loads(path.read_text()) == {'audio': {'volume_gain': 1.0}}
+    assert os.listdir(tmp_path) == ['config.json']
+
+
+def test_updates_are_coalesced_off_the_caller_thread(tmp_path, monkeypatch):
+    path = tmp_path / 'config.json'
+    config_manager = ConfigManager(str(path), save_delay=0.2)
+    config_manager.save({'audio': {'volume_gain': 1.0}})
+
+    writes = []
+    original_write = config_manager._write
+    monkeypatch.setattr(config_manager, '_write', lambda data: (writes.append(data), original_write(data)))
+
+    start = time.perf_counter()
+    for n in range(100):
+        config_manager.update('audio', volume_gain=1.0 + n / 100)
+    config_manager.update('stats', dictations=100)
+    assert time.perf_counter() - start < 0.05
+    assert config_manager.dirty_sections() == {'audio', 'stats'}
+    assert writes == []
+
+    time.sleep(0.5)
+    assert len(writes) == 1
+    assert config_manager.dirty_sections() == set()
+    saved = json.loads(path.read_text())
+    assert saved == {'audio': {'volume_gain': 1.99}, 'stats': {'dictations': 100}}
+
+
+def test_flush_saves_pending_updates_now(tmp_path):
+    path = tmp_path / 'config.json'
+    config_manager = ConfigManager(str(path), save_delay=60, max_save_delay=60)
+    config_manager.save({'audio': {}})
+    config_manager.update('audio', volume_gain=2.5)
+
+    assert config_manager.flush(2)
+    assert json.loads(path.read_text())['audio']['volume_gain'] == 2.5
+    config_manager.close()
+
+
+def test_updates_from_other_threads_during_saves(tmp_path):
+    """The writer serializes a snapshot taken under the lock, never the live dict"""
+    import threading
+
+    path = tmp_path / 'config.json'
+    config_manager = ConfigManager(str(path), save_delay=0, max_save_delay=0)
+    config_manager.save({'audio': {}})
+    errors = []
+
+    def hammer(thread):
+        try:
+            for n in range(200):
+                config_manager.update('stats', **{f'counter_{thread}_{n}': n})
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=hammer, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for _ in range(20):
+        config_manager.save()
+    for thread in threads:
+        thread.join()
+
+    assert config_manager.flush(2)
+    assert errors == []
+    assert len(json.loads(path.read_text())['stats']) == 4 * 200
+    config_manager.close()
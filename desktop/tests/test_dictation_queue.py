@@ -0,0 +1,128 @@
+"""Test ordered output of concurrently processed takes"""
+import threading
+import time
+
+from src.core.dictation_queue import DictationQueue
+
+
+def wait_until_drained(queue, timeout=5.0):
+    deadline = time.time() + timeout
+    while queue.pending() and time.time() < deadline:
+        time.sleep(0.01)
+    assert queue.pending() == 0
+
+
+def test_outputs_follow_recording_order():
+    """A short take recorded second is pasted after the long first one"""
+    durations = {b"long": 0.3, b"short": 0.0, b"medium": 0.1}
+    outputs = []
+
+    def process(job):
+        time.sleep(durations[job.audio_data])
+        return job.audio_data.decode()
+
+    queue = DictationQueue(process, lambda job: outputs.append(job.result), max_workers=3)
+    for audio in (b"long", b"short", b"medium"):
+        queue.submit(audio)
+
+    wait_until_drained(queue)
+    assert outputs == ["long", "short", "medium"]
+
+
+def test_takes_are_processed_concurrently():
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def process(job):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.1)
+        with lock:
+            active[0] -= 1
+        return ""
+
+    queue = DictationQueue(process, lambda job: None, max_workers=2)
+    for _ in range(4):
+        queue.submit(b"audio")
+
+    wait_until_drained(queue)
+    assert peak[0] == 2
+
+
+def test_failed_take_does_not_block_later_ones():
+    outputs, errors = [], []
+
+    def process(job):
+        if job.seq == 0:
+            time.sleep(0.1)
+            raise Exception("No speech detected")
+        return f"take {job.seq}"
+
+    queue = DictationQueue(
+        process,
+        lambda job: outputs.append(job.result),
+        on_error=lambda job: errors.append((job.seq, str(job.error)))
+    )
+    for _ in range(3):
+        queue.submit(b"audio")
+
+    wait_until_drained(queue)
+    assert errors == [(0, "No speech detected")]
+    assert outputs == ["take 1", "take 2"]
+
+
+def test_outputs_are_serial():
+    """Pastes never overlap, even when takes finish together"""
+    in_output = threading.Lock()
+    overlaps = []
+
+    def output(job):
+        if not in_output.acquire(blocking=False):
+            overlaps.append(job.seq)
+            return
+        time.sleep(0.02)
+        in_output.release()
+
+    queue = DictationQueue(lambda job: "", output, max_workers=4)
+    for _ in range(8):
+        queue.submit(b"audio")
+
+    wait_until_drained(queue)
+    assert overlaps == []
+
+
+def test_context_travels_with_job():
+    seen = []
+    queue = DictationQueue(lambda job: "", lambda job: seen.append(job.context))
+    queue.submit(b"a", context="widget-1")
+    queue.submit(b"b", context="widget-2")
+
+    wait_until_drained(queue)
+    assert seen == ["widget-1", "widget-2"]
+
+
+def test_text_waits_for_earlier_takes():
+    """Text inserted from the history is output after the takes recorded before it"""
+    outputs = []
+
+    def process(job):
+        time.sleep(0.1)
+        return job.audio_data.decode()
+
+    queue = DictationQueue(process, lambda job: outputs.append(job.result))
+    queue.submit(b"take")
+    queue.submit_text("from history", output=lambda job: outputs.append(f"history: {job.result}"))
+    queue.submit(b"later take")
+
+    wait_until_drained(queue)
+    assert outputs == ["take", "history: from history", "later take"]
+
+
+def test_text_alone_is_output():
+    outputs = []
+    queue = DictationQueue(lambda job: "", lambda job: None)
+    queue.submit_text("from history", output=lambda job: outputs.append(job.result))
+
+    wait_until_drained(queue)
+    assert outputs == ["from history"]
@@ -0,0 +1,154 @@
+"""Test the localhost dictation service"""
+import json
+import socket
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from src.core.dictation_service import DictationService
+from src.core.text_processor import TextProcessor
+
+
+class FakeProcessor(TextProcessor):
+    """TextProcessor with fake providers: the service runs the real pipeline"""
+
+    def __init__(self, delay: float = 0.0):
+        self.config = {'transcription': {'provider': 'groq'}, 'llm': {'provider': 'groq'}}
+        self.release = threading.Event()
+        if not delay:
+            self.release.set()
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def transcribe(self, audio_data):
+        return audio_data.decode()
+
+    def post_process(self, text):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        self.release.wait(5)
+        with self._lock:
+            self.active -= 1
+        return text.capitalize() + '.'
+
+
+def post(url, body: bytes, headers=None):
+    request = urllib.request.Request(url, data=body, headers=headers or {}, method='POST')
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_transcribe_and_format():
+    traces = []
+    with DictationService(FakeProcessor(), port=0, on_trace=traces.append) as service:
+        status, data = post(f"{service.url}/transcribe", b'ciao mondo', {'Content-Type': 'audio/wav'})
+        assert status == 200
+        assert data == {'raw_text': 'ciao mondo', 'text': 'Ciao mondo.'}
+
+        status, data = post(f"{service.url}/transcribe?format=0", b'ciao mondo')
+        assert data['text'] == 'ciao mondo'
+
+    assert [trace.attrs['request'] for trace in traces] == ['transcribe', 'transcribe']
+    assert traces[0].attrs['source'] == 'service'
+
+
+def test_format_json_and_plain_text():
+    with DictationService(FakeProcessor(), port=0) as service:
+        status, data = post(f"{service.url}/format", json.dumps({'text': 'come stai'}).encode(),
+                            {'Content-Type': 'application/json'})
+        assert (status, data) == (200, {'text': 'Come stai.'})
+
+        status, data = post(f"{service.url}/format", 'perché no'.encode(), {'Content-Type': 'text/plain'})
+        assert data == {'text': 'Perché no.'}
+
+
+def test_errors():
+    with DictationService(FakeProcessor(), port=0) as service:
+        assert post(f"{service.url}/transcribe", b'   ')[0] == 422
+        assert post(f"{service.url}/format", b'{"text": ""}', {'Content-Type': 'application/json'})[0] == 400
+        assert post(f"{service.url}/nope", b'x')[0] == 404
+        for body in (b'{"text": 123}', b'{"text": null}'):
+            assert post(f"{service.url}/format", body, {'Content-Type': 'application/json'}) == \
+                (400, {'error': "'text' must be a string"})
+        # Web pages can't use the service
+        assert post(f"{service.url}/format", b'ciao', {'Origin': 'https://example.com'})[0] == 403
+
+
+def test_unknown_path_body_is_not_read_as_a_request():
+    """An unread body after a 404 must not be parsed as the next request on the connection"""
+    with DictationService(FakeProcessor(), port=0) as service:
+        smuggled = b'GET /health HTTP/1.1\r\nHost: x\r\n\r\n'
+        with socket.create_connection(service.server.server_address, timeout=5) as sock:
+            sock.sendall(b'POST /nope HTTP/1.1\r\nHost: x\r\nContent-Length: %d\r\n\r\n' % len(smuggled) + smuggled)
+            received = b''
+            while True:
+                chunk = sock.recv(4096)
+                if not chunk:
+                    break
+                received += chunk
+
+    assert received.count(b'HTTP/1.1 ') == 1
+    assert received.startswith(b'HTTP/1.1 404')
+
+
+def test_token_is_required_when_configured():
+    with DictationService(FakeProcessor(), port=0, token='secret') as service:
+        assert post(f"{service.url}/format", b'ciao')[0] == 401
+        assert post(f"{service.url}/format", b'ciao', {'Authorization': 'Bearer secret'})[0] == 200
+
+
+def test_concurrency_limit():
+    processor = FakeProcessor(delay=1)
+    with DictationService(processor, port=0, max_workers=2, max_queued=1) as service:
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(post(f"{service.url}/format", b'ciao')))
+                   for _ in range(3)]
+        for thread in threads:
+            thread.start()
+
+        # Two requests running and one queued: the next one is refused
+        for _ in range(200):
+            if service.status()['queued'] == 1:
+                break
+            threading.Event().wait(0.01)
+        assert service.status() == {'status': 'ok', 'active': 2, 'queued': 1}
+        assert post(f"{service.url}/format", b'ciao')[0] == 503
+
+        processor.release.set()
+        for thread in threads:
+            thread.join(5)
+
+    assert [status for status, _ in results] == [200, 200, 200]
+    assert processor.peak == 2
+
+
+def test_timeout():
+    processor = FakeProcessor(delay=1)
+    with DictationService(processor, port=0, timeout=0.1) as service:
+        status, data = post(f"{service.url}/format", b'ciao')
+        processor.release.set()
+
+    assert status == 504
+    assert 'longer than' in data['error']
+
+
+def test_from_config():
+    service = DictationService.from_config(FakeProcessor(), {'port': 0, 'max_workers': 3, 'token': 't'})
+    try:
+        assert service.token == 't'
+        assert service.executor._max_workers == 3
+    finally:
+        service.server.server_close()
+
+
+def test_port_in_use():
+    with DictationService(FakeProcessor(), port=0) as service:
+        with pytest.raises(OSError):
+            DictationService(FakeProcessor(), port=service.server.server_address[1])
@@ -0,0 +1,107 @@
+"""Test the event dispatcher and the state machine"""
+import threading
+import time
+
+import pytest
+
+from src.core.dispatcher import Dispatcher, StateMachine
+
+
+@pytest.fixture
+def dispatcher():
+    dispatcher = Dispatcher(max_workers=2).start()
+    yield dispatcher
+    dispatcher.stop()
+
+
+def wait_for(dispatcher, timeout=2.0):
+    """Block until every event posted so far has been handled"""
+    done = threading.Event()
+    dispatcher.post(done.set)
+    assert done.wait(timeout)
+
+
+def test_events_run_in_order_on_one_thread(dispatcher):
+    handled, threads = [], set()
+
+    def handle(n):
+        handled.append(n)
+        threads.add(threading.current_thread().name)
+        assert dispatcher.in_dispatcher()
+
+    posters = [threading.Thread(target=lambda n=n: dispatcher.post(handle, n)) for n in range(20)]
+    for poster in posters:
+        poster.start()
+    for poster in posters:
+        poster.join()
+    wait_for(dispatcher)
+
+    assert sorted(handled) == list(range(20))
+    assert threads == {'dispatcher'}
+    assert not dispatcher.in_dispatcher()
+
+
+def test_timers_fire_in_due_order_and_can_be_cancelled(dispatcher):
+    fired = []
+    dispatcher.call_later(0.10, fired.append, 'late')
+    dispatcher.call_later(0.02, fired.append, 'early')
+    dispatcher.call_later(0.05, fired.append, 'cancelled').cancel()
+    dispatcher.post(fired.append, 'now')
+
+    time.sleep(0.2)
+    wait_for(dispatcher)
+    assert fired == ['now', 'early', 'late']
+
+
+def test_failing_event_does_not_stop_the_dispatcher(dispatcher):
+    handled = []
+    dispatcher.post(lambda: 1 / 0)
+    dispatcher.post(handled.append, 'next')
+    wait_for(dispatcher)
+
+    assert handled == ['next']
+
+
+def test_worker_results_come_back_on_the_dispatcher(dispatcher):
+    results = []
+
+    def on_done(future):
+        results.append((future.result(), dispatcher.in_dispatcher()))
+
+    future = dispatcher.run_in_worker(lambda x: x * 2, 21, on_done=on_done)
+    assert future.result(2) == 42
+    wait_for(dispatcher)
+
+    assert results == [(42, True)]
+
+
+def test_worker_pool_is_bounded(dispatcher):
+    running, peak, lock = [0], [0], threading.Lock()
+
+    def task():
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.02)
+        with lock:
+            running[0] -= 1
+
+    futures = [dispatcher.run_in_worker(task) for _ in range(8)]
+    for future in futures:
+        future.result(2)
+    assert peak[0] <= 2
+
+
+def test_state_machine_ignores_events_without_transition():
+    changes = []
+    machine = StateMachine('idle', {('idle', 'start'): 'recording', ('recording', 'stop'): 'idle'},
+                           on_change=lambda *change: changes.append(change))
+
+    assert not machine.fire('stop')
+    assert machine.fire('start')
+    assert not machine.fire('start')
+    assert machine.can('stop') and not machine.can('start')
+    assert machine.fire('stop')
+
+    assert machine.state == 'idle'
+    assert changes == [('idle', 'start', 'recording'), ('recording', 'stop', 'idle')]
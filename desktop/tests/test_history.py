@@ -0,0 +1,90 @@
+"""Test the SQLite dictation history"""
+import time
+
+import pytest
+
+from src.core.history import HistoryStore, fts_query
+
+
+@pytest.fixture
+def history(tmp_path):
+    store = HistoryStore(str(tmp_path / 'history.db'))
+    yield store
+    store.close()
+
+
+def test_fts_query():
+    assert fts_query('conf git') == '"conf"* "git"*'
+    assert fts_query('"; DROP TABLE --') == '"DROP"* "TABLE"*'
+    assert fts_query('  ') == ''
+
+
+def test_add_and_search(history):
+    history.add("ciao come stai", "Ciao, come stai?", transcription_provider='groq', llm_provider='ollama',
+                total_ms=812.5, timings={'transcription': 400.0, 'llm': 300.0}, audio_path='recordings/a.wav.gz')
+    history.add("configurare git sul server", "Configurare Git sul server.")
+    assert history.flush(5)
+
+    [record] = history.search('stai')
+    assert record['text'] == "Ciao, come stai?"
+    assert record['raw_text'] == "ciao come stai"
+    assert record['llm_provider'] == 'ollama'
+    assert record['timings'] == {'transcription': 400.0, 'llm': 300.0}
+    assert record['audio_path'] == 'recordings/a.wav.gz'
+    assert history.get(record['id'])['text'] == "Ciao, come stai?"
+
+    # Prefix match, case and accents ignored, every word required
+    assert [r['text'] for r in history.search('CONF serv')] == ["Configurare Git sul server."]
+    assert history.search('git stai') == []
+
+
+def test_empty_query_lists_recent_first(history):
+    for n in range(3):
+        history.add(f"testo {n}", f"Testo {n}.", created=1000 + n)
+    history.flush(5)
+
+    assert [r['text'] for r in history.search('')] == ["Testo 2.", "Testo 1.", "Testo 0."]
+    assert len(history.search('', limit=2)) == 2
+
+
+def test_batched_writes_are_off_the_caller_thread(tmp_path):
+    store = HistoryStore(str(tmp_path / 'history.db'), flush_interval=0.3)
+    start = time.perf_counter()
+    for n in range(50):
+        store.add(f"frase {n}", f"Frase {n}.")
+    assert time.perf_counter() - start < 0.1
+
+    store.flush(5)
+    assert len(store.search('frase', limit=100)) == 50
+    store.close()
+
+
+def test_retention_keeps_newest(tmp_path):
+    store = HistoryStore(str(tmp_path / 'history.db'), max_entries=3)
+    for n in range(5):
+        store.add(f"numero {n}", f"Numero {n}.")
+    store.flush(5)
+
+    assert [r['text'] for r in store.search('numero')] == ["Numero 4.", "Numero 3.", "Numero 2."]
+    store.close()
+
+
+def test_history_survives_reopen(tmp_path):
+    path = str(tmp_path / 'history.db')
+    store = HistoryStore(path)
+    store.add("da ricordare", "Da ricordare.")
+    store.close()
+
+    reopened = HistoryStore(path)
+    assert [r['text'] for r in reopened.search('ricordare')] == ["Da ricordare."]
+    reopened.close()
+
+
+def test_like_fallback(tmp_path):
+    store = HistoryStore(str(tmp_path / 'history.db'))
+    store.fts = False
+    store.add("perché no", "Perché no?")
+    store.flush(5)
+
+    assert [r['text'] for r in store.search('perch')] == ["Perché no?"]
+    store.close()
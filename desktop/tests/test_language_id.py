@@ -0,0 +1,152 @@
+"""Test local language identification"""
+from benchmarks.bench_language import evaluate
+from benchmarks.fixtures import load_audio
+from src.core.language_id import LanguageIdentifier, wav_duration
+from src.core.text_processor import TextProcessor
+from src.providers.llm.base import LLMProvider
+from src.providers.llm.prompts import FEW_SHOT_EXAMPLES, use_language
+
+ITALIAN = "penso che dovremmo provare con il nuovo modello"
+ENGLISH = "i think that we should try the new model"
+
+
+def test_pins_the_language_of_recent_transcripts():
+    identifier = LanguageIdentifier(window=5, min_agreement=0.8, max_pin_seconds=0)
+    assert identifier.choose(b'') == 'auto'
+
+    identifier.seed([ITALIAN, "ok", ITALIAN])  # "ok" is too short to tell
+    assert identifier.pinned() == 'it'
+    assert identifier.choose(b'') == 'it'
+    assert identifier.choose(b'', configured='en') == 'en'
+
+
+def test_mixed_languages_are_left_to_the_provider():
+    identifier = LanguageIdentifier(window=5, min_agreement=0.8, max_pin_seconds=0)
+    identifier.seed([ITALIAN, ITALIAN, ITALIAN, ENGLISH])
+
+    assert identifier.pinned() is None
+    assert identifier.choose(b'') == 'auto'
+
+    identifier.seed([ENGLISH] * 4)  # The window follows a switch
+    assert identifier.choose(b'') == 'en'
+
+
+def test_long_takes_keep_auto_detection():
+    audio = load_audio('it')
+    duration = wav_duration(audio)
+    assert duration > 1
+    assert wav_duration(b'not a wav') is None
+
+    identifier = LanguageIdentifier(max_pin_seconds=duration - 0.5)
+    identifier.seed([ITALIAN] * 5)
+    assert identifier.choose(audio) == 'auto'
+
+    identifier.max_pin_seconds = duration + 0.5
+    assert identifier.choose(audio) == 'it'
+
+
+def test_text_language_falls_back_to_pinned():
+    identifier = LanguageIdentifier()
+    assert identifier.text_language("grazie mille") is None
+
+    identifier.seed([ENGLISH] * 3)
+    assert identifier.text_language("grazie mille") == 'en'
+    assert identifier.text_language(ITALIAN) == 'it'
+
+
+class PromptLLM(LLMProvider):
+    def process(self, text, max_tokens=None):
+        return self.build_system_prompt(text)
+
+
+def test_language_hint_selects_prompt_examples():
+    english_example = FEW_SHOT_EXAMPLES['en'][0][0]
+    llm = PromptLLM(prompt_variant='compact')
+
+    with use_language('en'):
+        assert english_example in llm.process("grazie mille")
+    assert english_example not in llm.process("grazie mille")
+    with use_language('en'):
+        assert english_example not in PromptLLM(prompt_variant='compact', language='it').process("ok")
+
+
+def test_processor_passes_the_pinned_language():
+    class FakeTranscription:
+        def __init__(self):
+            self.languages = []
+
+        def transcribe(self, audio_data, language="auto"):
+            self.languages.append(language)
+            return ITALIAN
+
+    processor = TextProcessor.__new__(TextProcessor)
+    processor.config = {'transcription': {'options': {'language': 'auto'}}}
+    processor.transcription_provider = FakeTranscription()
+    processor.language_id = LanguageIdentifier(window=3, min_samples=2, max_pin_seconds=0)
+
+    for _ in range(3):
+        processor.transcribe(b'')
+    assert processor.transcription_provider.languages == ['auto', 'auto', 'it']
+
+
+def test_benchmark_on_fixtures():
+    results = evaluate(words=[0, 3], repeat=1, min_time=0.01)
+
+    whole = results['lengths'][0]
+    assert whole['wrong'] == 0
+    assert whole['correct'] + whole['unknown'] == 1
+    assert whole['pinned_correct'] > whole['pinned_wrong']
+    assert results['latency']['detect_language'] > 0
+
+
+class SwitchingSpeaker:
+    """Speaks English after an Italian history; forced to Italian, Whisper may write Italian"""
+
+    def __init__(self, follows_forced_language: bool):
+        self.follows_forced_language = follows_forced_language
+        self.languages = []
+
+    def transcribe(self, audio_data, language="auto"):
+        self.languages.append(language)
+        return ITALIAN if language == 'it' and self.follows_forced_language else ENGLISH
+
+
+def switching_processor(speaker):
+    processor = TextProcessor.__new__(TextProcessor)
+    processor.config = {'transcription': {'options': {'language': 'auto'}}}
+    processor.transcription_provider = speaker
+    processor.language_id = LanguageIdentifier(window=5, min_samples=2, max_pin_seconds=0, probe_every=3)
+    processor.language_id.seed([ITALIAN] * 5)
+    return processor
+
+
+def test_switch_of_short_takes_drops_the_pin():
+    """A pinned transcript in another language drops the pin at once"""
+    speaker = SwitchingSpeaker(follows_forced_language=False)
+    processor = switching_processor(speaker)
+
+    for _ in range(4):
+        processor.transcribe(b'')
+    assert speaker.languages == ['it', 'auto', 'en', 'en']
+
+
+def test_pinned_transcripts_do_not_confirm_their_own_pin():
+    """Even when forced transcripts come back in the pinned language, a probe follows the switch"""
+    speaker = SwitchingSpeaker(follows_forced_language=True)
+    processor = switching_processor(speaker)
+
+    for _ in range(7):
+        processor.transcribe(b'')
+    assert speaker.languages == ['it', 'it', 'it', 'auto', 'auto', 'en', 'en']
+
+
+def test_configured_language_transcripts_are_observed():
+    speaker = SwitchingSpeaker(follows_forced_language=True)
+    processor = switching_processor(speaker)
+    processor.config['transcription']['options']['language'] = 'en'
+
+    processor.transcribe(b'')
+    processor.transcribe(b'')
+
+    assert speaker.languages == ['en', 'en']
+    assert processor.language_id.pinned() == 'en'
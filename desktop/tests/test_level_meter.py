@@ -0,0 +1,26 @@
+"""Test the level meter geometry"""
+import pytest
+
+pytest.importorskip('tkinter')
+
+from src.ui.level_meter import bar_heights, level_fraction  # noqa: E402
+
+
+def test_level_fraction_is_a_db_scale():
+    assert level_fraction(0) == 0.0
+    assert level_fraction(32767) == 1.0
+    assert level_fraction(30) == 0.0  # Below -60 dB
+    assert level_fraction(3277) == pytest.approx(2 / 3, abs=0.01)  # -20 dB
+    assert level_fraction(1000) < level_fraction(3000) < level_fraction(20000)
+
+
+def test_bars_show_newest_blocks_on_the_right():
+    heights = bar_heights([32767, 0, 3277], count=5, height=30)
+
+    assert heights == [1, 1, 30, 1, 20]
+
+
+def test_bars_keep_only_the_last_blocks():
+    peaks = [32767] * 3 + [0] * 4
+    assert bar_heights(peaks, count=4, height=10) == [1, 1, 1, 1]
+    assert len(bar_heights([], count=4, height=10)) == 4
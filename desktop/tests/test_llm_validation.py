@@ -89,6 +89,61 @@ def test_filler_words_normalization():
     assert is_valid, f"Should be valid (filler words normalized) but got: {reason}"
 
 
+def test_no_substring_false_positives():
+    """Test that phrases and fillers only match whole words"""
+    provider = MockLLMProvider()
+
+    test_cases = [
+        # 'run', 'check' and 'open' inside longer words
+        ("the tests are running", "The tests are running."),
+        ("i checked the logs yesterday", "I checked the logs yesterday."),
+        ("the reopened ticket is fine", "The reopened ticket is fine."),
+        # Fillers inside words must not shrink the input word count
+        ("um let's go ahead with them", "Let's go ahead with them."),
+        # Version numbers and dashes are not markdown lists
+        ("la versione 1.5 è uscita", "La versione 1.5 è uscita."),
+        ("questo e quello", "Questo - e quello."),
+    ]
+
+    for input_text, output_text in test_cases:
+        is_valid, reason = provider.validate_output(input_text, output_text)
+        assert is_valid, f"Should be valid for: {output_text} but got: {reason}"
+
+
+def test_dictated_phrases_are_allowed():
+    """Test that instruction words the user actually dictated don't fail validation"""
+    provider = MockLLMProvider()
+
+    is_valid, reason = provider.validate_output("apri il file e controlla i log", "Apri il file e controlla i log.")
+    assert is_valid, f"Should be valid but got: {reason}"
+
+    # A phrase the user didn't say is still an answer
+    is_valid, reason = provider.validate_output("come si avvia il server", "Esegui il server.")
+    assert not is_valid
+    assert "'esegui'" in reason
+
+
+def test_dictated_phrase_inside_a_longer_one():
+    """Test that a phrase dictated as part of a longer one is still allowed"""
+    provider = MockLLMProvider()
+
+    is_valid, reason = provider.validate_output("devi prima fare", "Devi fare.")
+    assert is_valid, f"Should be valid but got: {reason}"
+
+    is_valid, reason = provider.validate_output("devi fare", "Devi prima fare.")
+    assert not is_valid
+    assert "'devi prima'" in reason
+
+
+def test_numbered_list_after_colon():
+    """Test that inline numbered lists are detected as markdown"""
+    provider = MockLLMProvider()
+
+    is_valid, reason = provider.validate_output("come si usa git per fare commit", "Git: 1. add 2. commit")
+    assert not is_valid
+    assert "markdown" in reason.lower()
+
+
 if __name__ == "__main__":
     print("Running LLM validation tests...")
 
@@ -108,6 +163,15 @@ if __name__ == "__main__":
         test_filler_words_normalization()
         print("✓ Filler words normalization test passed")
 
+        test_no_substring_false_positives()
+        print("✓ Substring false positives test passed")
+
+        test_dictated_phrases_are_allowed()
+        print("✓ Dictated phrases test passed")
+
+        test_numbered_list_after_colon()
+        print("✓ Numbered list test passed")
+
         print("\n✅ All tests passed!")
 
     except AssertionError as e:
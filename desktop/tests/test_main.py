@@ -0,0 +1,185 @@
+"""Test the app controller's recording flow with stub components"""
+import queue
+import threading
+import time
+
+import pytest
+
+pytest.importorskip('pystray')
+pytest.importorskip('keyboard')
+
+from src import main  # noqa: E402
+from src.core.dispatcher import Dispatcher, StateMachine  # noqa: E402
+
+
+class StubTray:
+    def __init__(self):
+        self.statuses = []
+        self.notifications = []
+
+    def set_recording(self, recording):
+        pass
+
+    def set_status(self, status):
+        self.statuses.append(status)
+
+    def notify(self, title, message):
+        self.notifications.append((title, message))
+
+
+class StubRecorder:
+    def __init__(self):
+        self.started = False
+        self.stream = None
+
+    def start_recording(self):
+        self.started = True
+
+    def level_history(self):
+        return 0, ()
+
+    def stop_recording(self):
+        self.started = False
+        return b'RIFF take'
+
+
+class StubTextProcessor:
+    def warm_up(self):
+        return True
+
+
+class StubQueue:
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, audio_data, context=None, trace=None):
+        self.submitted.append((audio_data, trace))
+
+
+@pytest.fixture
+def app():
+    """Controller with the pipeline loaded, without tray, hotkeys or audio devices"""
+    app = main.VoiceDictationApp.__new__(main.VoiceDictationApp)
+    app.config = {'transcription': {'provider': 'groq'}, 'llm': {'provider': 'ollama'}}
+    app.system_tray = StubTray()
+    app.audio_recorder = StubRecorder()
+    app.text_processor = StubTextProcessor()
+    app.dictation_queue = StubQueue()
+    app.widget = None
+    app.recording_widget = None
+    app.current_trace = None
+    app._pending_config = None
+    app._start_when_loaded = False
+    app.dictation_service = app.recording_archive = app.history = app.trace_log = None
+    app.history_window = None
+    app.dispatcher = Dispatcher()  # Not started: timers are only queued
+    app.state = StateMachine(main.IDLE, main.TRANSITIONS, on_change=app._on_state_change)
+    yield app
+    app.dispatcher.stop()
+
+
+def test_start_and_stop_recording_queue_the_take(app):
+    app._start_recording(0.0)
+
+    assert app.state.state == main.RECORDING
+    assert app.audio_recorder.started
+    assert app.current_trace is not None
+
+    trace = app.current_trace
+    app._stop_recording()
+
+    assert app.state.state == main.IDLE
+    assert app.dictation_queue.submitted == [(b'RIFF take', trace)]
+    assert 'stream_open' in trace.durations()
+
+
+def test_failed_start_stays_idle(app):
+    def fail():
+        raise OSError("no input device")
+
+    app.audio_recorder.start_recording = fail
+    app.audio_recorder.audio_queue = queue.Queue()
+    app._start_recording(0.0)
+
+    assert app.state.state == main.IDLE
+    assert app.system_tray.statuses[-1].startswith("Error: no input device")
+
+
+class StubHotkeys:
+    def unregister_all(self):
+        pass
+
+
+class StubRoot:
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, delay, function):
+        self.scheduled.append(function)
+
+
+def handled(dispatcher):
+    """Block until every event posted so far has been handled"""
+    done = threading.Event()
+    dispatcher.post(done.set)
+    assert done.wait(2)
+
+
+def test_saving_settings_after_a_failed_load_retries(app):
+    app.state.state = main.FAILED
+    app.hotkey_manager = StubHotkeys()
+    loads = []
+    app._load_pipeline = lambda: loads.append(app.config)
+    app.dispatcher.start()
+
+    new_config = dict(app.config, audio={'device_index': 2})
+    app.dispatcher.post(app._on_config_saved, new_config)
+
+    deadline = time.time() + 2
+    while app.state.state != main.IDLE and time.time() < deadline:
+        time.sleep(0.01)
+    assert app.state.state == main.IDLE
+    assert loads == [new_config]
+
+
+def test_settings_check_runs_on_the_dispatcher(app):
+    app.root = StubRoot()
+    app.dispatcher.start()
+
+    app.state.state = main.RECORDING
+    app._show_settings()
+    handled(app.dispatcher)
+    assert app.root.scheduled == []
+    assert app.system_tray.notifications[-1][0] == "Settings"
+
+    app.state.state = main.IDLE
+    app._show_settings()
+    handled(app.dispatcher)
+    assert len(app.root.scheduled) == 1
+
+
+class Closable:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+    stop = close
+
+    def shutdown(self, wait=True):
+        self.closed = True
+
+
+def test_retry_releases_the_previous_pipeline(app):
+    """A reload stops the old service and queue and closes the stores before rebuilding"""
+    parts = {name: Closable() for name in ('dictation_service', 'dictation_queue', 'recording_archive', 'history', 'trace_log')}
+    for name, part in parts.items():
+        setattr(app, name, part)
+    app.history_window = object()
+
+    app._release_pipeline()
+
+    assert all(part.closed for part in parts.values())
+    assert all(getattr(app, name) is None for name in parts)
+    assert app.history_window is None
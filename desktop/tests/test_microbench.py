@@ -0,0 +1,39 @@
+"""Test the microbenchmark harness"""
+from benchmarks.microbench import BENCHMARKS, measure, run
+
+
+def test_measure_reports_time_and_allocations():
+    result = measure(lambda: [0] * 100_000, repeat=2, min_time=0.01)
+
+    assert result['ns_per_op'] > 0
+    assert result['ops'] >= 1
+    assert result['peak_kib'] > 700  # 100k pointers
+
+
+def test_measure_with_fresh_input_per_call():
+    consumed = []
+
+    def setup():
+        return list(range(1000))
+
+    def drain(items):
+        consumed.append(len(items))
+        items.clear()
+
+    result = measure(drain, setup, repeat=3, min_time=0.01)
+
+    assert result['ops'] >= 3
+    assert set(consumed) == {1000}  # Every call saw a full input
+
+
+def test_hot_paths_are_registered():
+    for name in ('audio_callback', 'to_wav_bytes (10 min)', 'stop_recording (10 min)', 'validate_output (long)'):
+        assert name in BENCHMARKS
+
+
+def test_run_selected_benchmarks():
+    results = run(['validate_output (short)', 'audio_callback'], repeat=1, min_time=0.01)
+
+    assert results['validate_output (short)']['ns_per_op'] > 0
+    # Skipped (not failed) where the audio stack can't be loaded
+    assert 'ns_per_op' in results['audio_callback'] or 'skipped' in results['audio_callback']
@@ -0,0 +1,60 @@
+"""Test Ollama warm-up against a local stand-in that simulates model load latency"""
+import threading
+import time
+
+import pytest
+
+from src.providers.llm import OllamaProvider
+from tests.mock_server import MockServer
+
+
+LOAD_LATENCY = 0.5  # Seconds the stand-in takes to "load" the model
+
+
+@pytest.fixture
+def fake_ollama():
+    with MockServer(load_latency=LOAD_LATENCY) as server:
+        yield server
+
+
+def test_warm_up_loads_model_with_keep_alive(fake_ollama):
+    """Warm-up sends an empty chat request carrying the configured keep_alive"""
+    provider = OllamaProvider(model="llama3.2:3b", ollama_url=fake_ollama.ollama_url, keep_alive="1h")
+
+    assert provider.warm_up()
+    assert fake_ollama.model_loaded
+    assert fake_ollama.requests[0]['json']['messages'] == []
+    assert fake_ollama.requests[0]['json']['keep_alive'] == "1h"
+
+
+def test_process_after_warm_up_skips_load_latency(fake_ollama):
+    """Once warm, the dictation request doesn't pay the cold load"""
+    provider = OllamaProvider(model="llama3.2:3b", ollama_url=fake_ollama.ollama_url)
+    provider.warm_up()
+
+    start = time.time()
+    result = provider.process("penso che dovremmo provare")
+    elapsed = time.time() - start
+
+    assert result == "Penso che dovremmo provare."
+    assert elapsed < LOAD_LATENCY
+    assert fake_ollama.requests[-1]['json']['keep_alive'] == OllamaProvider.DEFAULT_KEEP_ALIVE
+
+
+def test_concurrent_warm_ups_are_collapsed(fake_ollama):
+    """Pressing the hotkey repeatedly during a cold load sends a single warm-up"""
+    provider = OllamaProvider(model="llama3.2:3b", ollama_url=fake_ollama.ollama_url)
+
+    threads = [threading.Thread(target=provider.warm_up) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(fake_ollama.requests) == 1
+
+
+def test_warm_up_failure_is_not_raised():
+    """Warm-up never raises, even if Ollama isn't running"""
+    provider = OllamaProvider(model="llama3.2:3b", ollama_url="http://127.0.0.1:9")
+    assert provider.warm_up() is False
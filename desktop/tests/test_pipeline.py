@@ -0,0 +1,155 @@
+"""Test the dictation stage pipeline"""
+import threading
+
+import pytest
+
+from src.core.pipeline import FunctionStage, Pipeline, Stage
+from src.core.text_processor import TextProcessor
+from src.core.vocabulary import Vocabulary
+
+
+class Upper(Stage):
+    name = 'upper'
+
+    def process(self, items):
+        for item in items:
+            yield item.upper()
+
+
+def test_items_flow_through_stages_in_order():
+    pipeline = Pipeline([Upper(), FunctionStage('exclaim', lambda text: text + '!')])
+
+    assert list(pipeline.run(['a', 'b', 'c'])) == ['A!', 'B!', 'C!']
+
+
+def test_function_stage_drops_none():
+    pipeline = Pipeline([FunctionStage('odd', lambda n: n if n % 2 else None)])
+
+    assert list(pipeline.run(range(6))) == [1, 3, 5]
+
+
+def test_insert_and_remove_stages():
+    pipeline = Pipeline([Upper(), FunctionStage('exclaim', lambda text: text + '!')])
+    pipeline.insert_before('exclaim', FunctionStage('twice', lambda text: text * 2))
+    pipeline.insert_after('exclaim', FunctionStage('wrap', lambda text: f'[{text}]'))
+
+    assert pipeline.stage_names() == ['upper', 'twice', 'exclaim', 'wrap']
+    assert list(pipeline.run(['a'])) == ['[AA!]']
+
+    pipeline.remove('twice').replace('upper', FunctionStage('same', lambda text: text))
+    assert list(pipeline.run(['a'])) == ['[a!]']
+
+    with pytest.raises(ValueError, match="No pipeline stage named 'nope'"):
+        pipeline.remove('nope')
+
+
+def test_stage_error_reaches_consumer():
+    def fail_on_two(n):
+        if n == 2:
+            raise Exception("Transcription failed: boom")
+        return n
+
+    pipeline = Pipeline([FunctionStage('flaky', fail_on_two), FunctionStage('same', lambda n: n)])
+    results = []
+    with pytest.raises(Exception, match="boom"):
+        for n in pipeline.run([0, 1, 2, 3]):
+            results.append(n)
+
+    assert results == [0, 1]
+
+
+def test_stages_run_on_the_callers_thread():
+    threads = set()
+
+    def record_thread(item):
+        threads.add(threading.current_thread())
+        return item
+
+    pipeline = Pipeline([FunctionStage('a', record_thread), FunctionStage('b', record_thread)])
+
+    assert list(pipeline.run(['take', 'other take'])) == ['take', 'other take']
+    assert threads == {threading.current_thread()}
+
+
+def test_stage_must_implement_process():
+    class Incomplete(Stage):
+        name = 'incomplete'
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_single_item_error_reaches_consumer():
+    pipeline = Pipeline([FunctionStage('flaky', lambda n: 1 / n)])
+
+    with pytest.raises(ZeroDivisionError):
+        list(pipeline.run([0]))
+
+
+class FakeTranscription:
+    def transcribe(self, audio_data, language='auto'):
+        return audio_data.decode()
+
+
+class FakeLLM:
+    def process(self, text):
+        return text[0].upper() + text[1:] + '.'
+
+
+def make_processor():
+    processor = TextProcessor.__new__(TextProcessor)
+    processor.config = {}
+    processor.transcription_provider = FakeTranscription()
+    processor.llm_provider = FakeLLM()
+    processor.vocabulary = Vocabulary()
+    processor.language_id = None
+    processor.outputs = []
+    processor.output_text = lambda text, status_callback=None: processor.outputs.append(text)
+    return processor
+
+
+def test_process_audio_runs_through_stages():
+    processor = make_processor()
+    statuses = []
+
+    assert processor.process_audio(b'ciao mondo', statuses.append) == 'Ciao mondo.'
+    assert processor.outputs == ['Ciao mondo.']
+    assert statuses[:2] == ["Transcribing...", "Processing..."]
+
+
+def test_process_audio_without_speech():
+    processor = make_processor()
+
+    with pytest.raises(Exception, match="No speech detected"):
+        processor.process_audio(b'  ')
+    assert processor.outputs == []
+
+
+def test_custom_stage_without_touching_the_processor():
+    processor = make_processor()
+    pipeline = processor.pipeline()
+    pipeline.insert_before('format', FunctionStage('names', lambda text: text.replace('alberto', 'Alberto')))
+
+    assert list(pipeline.run([b'ciao alberto', b'a domani'])) == ['Ciao Alberto.', 'A domani.']
+    assert pipeline.stage_names() == ['transcribe', 'names', 'format', 'output']
+
+
+def test_transcribe_and_format_runs_the_pipeline():
+    """Stages added to TextProcessor.pipeline() apply to the app's takes"""
+    processor = make_processor()
+    build = processor.pipeline
+
+    def pipeline(*args, **kwargs):
+        return build(*args, **kwargs).insert_before(
+            'format', FunctionStage('names', lambda text: text.replace('alberto', 'Alberto'))
+        )
+
+    processor.pipeline = pipeline
+    statuses = []
+
+    assert processor.transcribe_and_format(b'ciao alberto', statuses.append) == ('ciao alberto', 'Ciao Alberto.')
+    assert processor.outputs == []  # Pasted later, in order, by the DictationQueue
+    assert statuses == ["Transcribing...", "Processing..."]
+
+    with pytest.raises(Exception, match="No speech detected"):
+        processor.transcribe_and_format(b'  ')
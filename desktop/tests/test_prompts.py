@@ -0,0 +1,78 @@
+import pytest
+from src.providers.llm import LLMProvider
+from src.providers.llm.prompts import (
+    FULL_PROMPT,
+    count_tokens,
+    detect_language,
+    get_system_prompt
+)
+
+
+class MockLLMProvider(LLMProvider):
+    """Mock LLM provider exposing prompt selection"""
+
+    def process(self, text: str) -> str:
+        pass
+
+
+def test_detect_language():
+    """Test language detection from function words"""
+    assert detect_language("come si configura git per questo progetto") == 'it'
+    assert detect_language("how do i configure git for this project") == 'en'
+    assert detect_language("git docker playwright") is None
+    assert detect_language("git docker playwright", default='it') == 'it'
+
+
+def test_compact_variants_are_smaller():
+    """Test that compact variants cut the system prompt size"""
+    full = count_tokens(get_system_prompt('full'))
+    assert count_tokens(get_system_prompt('compact', 'it')) < full / 3
+    assert count_tokens(get_system_prompt('minimal')) < count_tokens(get_system_prompt('compact', 'it'))
+
+
+def test_few_shot_examples_follow_language():
+    """Test that compact prompt examples match the requested language"""
+    assert "Come si configura git?" in get_system_prompt('compact', 'it')
+    assert "How do I configure git?" in get_system_prompt('compact', 'en')
+    # Unsupported languages fall back to the default examples
+    assert "Come si configura git?" in get_system_prompt('compact', 'de')
+
+
+def test_unknown_variant():
+    """Test that unknown variants are rejected"""
+    with pytest.raises(ValueError):
+        get_system_prompt('tiny')
+
+
+def test_provider_prompt_selection():
+    """Test per-request prompt selection and token accounting"""
+    assert MockLLMProvider().build_system_prompt("come si fa questo") == FULL_PROMPT
+
+    provider = MockLLMProvider(prompt_variant='compact')
+    assert "How do I configure git?" in provider.build_system_prompt("how do we do this")
+
+    pinned = MockLLMProvider(prompt_variant='compact', language='it')
+    assert "Come si configura git?" in pinned.build_system_prompt("how do we do this")
+
+    system_prompt = provider.build_system_prompt("how do we do this")
+    usage = provider.record_usage(system_prompt, "how do we do this", "How do we do this?")
+    assert usage['estimated']
+    assert usage['prompt_tokens'] > usage['system_tokens']
+
+    provider.record_usage(system_prompt, "how", "How?", prompt_tokens=80, completion_tokens=3)
+    assert provider.last_usage['prompt_tokens'] == 80
+    assert provider.total_usage['requests'] == 2
+
+
+def test_full_prompt_follows_language():
+    """The default 'full' variant uses the examples of the dictation language"""
+    from src.providers.llm.prompts import use_language
+
+    assert get_system_prompt('full', 'it') == FULL_PROMPT
+    assert "How do I configure git?" in get_system_prompt('full', 'en')
+    assert get_system_prompt('full', 'de') == FULL_PROMPT
+
+    provider = MockLLMProvider()
+    assert "How do I configure git?" in provider.build_system_prompt("how do we do this")
+    with use_language('en'):
+        assert "How do I configure git?" in provider.build_system_prompt("grazie mille")
@@ -0,0 +1,140 @@
+"""Exercise the providers' HTTP paths against the local API stand-in"""
+import json
+import time
+
+import pytest
+import requests
+
+from src.providers.http_client import ProviderError
+from src.providers.llm import GroqLLMProvider, OllamaProvider, OpenAILLMProvider
+from src.providers.transcription import DeepgramProvider, GroqWhisperProvider, OpenAIWhisperProvider
+from tests.mock_server import MockServer
+
+
+AUDIO = b"RIFF" + b"\x00" * 64
+
+
+@pytest.fixture
+def server():
+    with MockServer(transcript="penso che dovremmo provare") as server:
+        yield server
+
+
+def test_groq_whisper_transcription(server):
+    """Multipart upload carries the model and language fields"""
+    provider = GroqWhisperProvider(api_key="test_key", base_url=server.groq_base_url)
+
+    assert provider.transcribe(AUDIO, language="it") == "penso che dovremmo provare"
+
+    request = server.requests_to('transcription')[0]
+    assert request['path'] == '/openai/v1/audio/transcriptions'
+    assert request['headers']['Authorization'] == 'Bearer test_key'
+    assert request['fields'] == {'model': b'whisper-large-v3', 'language': b'it'}
+
+
+def test_openai_whisper_receives_audio(server):
+    """The transcript callable sees the uploaded audio"""
+    server.transcript = lambda audio, fields: f"{len(audio)} bytes"
+    provider = OpenAIWhisperProvider(api_key="test_key", base_url=server.openai_base_url)
+
+    assert provider.transcribe(AUDIO) == f"{len(AUDIO)} bytes"
+
+
+def test_deepgram_listen(server):
+    """Raw audio body with query parameters and Token auth"""
+    provider = DeepgramProvider(api_key="test_key", base_url=server.deepgram_base_url)
+
+    assert provider.transcribe(AUDIO, language="en") == "penso che dovremmo provare"
+
+    request = server.requests_to('listen')[0]
+    assert request['headers']['Authorization'] == 'Token test_key'
+    assert request['params']['language'] == 'en'
+    assert request['size'] == len(AUDIO)
+
+
+def test_chat_completion_records_usage(server):
+    provider = GroqLLMProvider(api_key="test_key", base_url=server.groq_base_url)
+
+    assert provider.process("penso che dovremmo provare") == "Penso che dovremmo provare."
+    assert provider.last_usage['completion_tokens'] == 4
+
+    payload = server.requests_to('chat')[0]['json']
+    assert payload['model'] == GroqLLMProvider.DEFAULT_MODEL
+    assert payload['messages'][-1]['content'] == "penso che dovremmo provare"
+
+
+def test_ollama_chat(server):
+    provider = OllamaProvider(model="llama3.2:3b", ollama_url=server.ollama_url)
+
+    assert provider.process("penso che dovremmo provare") == "Penso che dovremmo provare."
+
+
+@pytest.mark.parametrize("status,message", [
+    (401, "Invalid OpenAI API key"),
+    (429, "OpenAI rate limit exceeded"),
+    (500, "OpenAI API error: 500"),
+])
+def test_injected_errors_are_mapped(server, status, message):
+    provider = OpenAILLMProvider(api_key="test_key", base_url=server.openai_base_url)
+    server.fail_next(status)
+
+    with pytest.raises(ProviderError, match=message):
+        provider.process("penso che dovremmo provare")
+
+    # Only the next request fails
+    assert provider.process("penso che dovremmo provare") == "Penso che dovremmo provare."
+
+
+def test_rate_limit(server):
+    """Requests beyond the window get 429 with Retry-After"""
+    server.rate_limit = (2, 60)
+    url = f"{server.openai_base_url}/chat/completions"
+    payload = {"model": "m", "messages": [{"role": "user", "content": "ciao"}]}
+
+    statuses = [requests.post(url, json=payload).status_code for _ in range(3)]
+    assert statuses == [200, 200, 429]
+
+    response = requests.post(url, json=payload)
+    assert response.headers['Retry-After'] == '1'
+
+
+def test_latency_injection(server):
+    server.latency = {'transcription': 0.3}
+    provider = GroqWhisperProvider(api_key="test_key", base_url=server.groq_base_url)
+
+    start = time.perf_counter()
+    provider.transcribe(AUDIO)
+    assert time.perf_counter() - start >= 0.3
+
+    # Other endpoints are unaffected
+    start = time.perf_counter()
+    GroqLLMProvider(api_key="test_key", base_url=server.groq_base_url).process("ciao a tutti")
+    assert time.perf_counter() - start < 0.3
+
+
+def test_chat_completion_streaming(server):
+    """SSE stream of deltas ending with usage and [DONE]"""
+    response = requests.post(
+        f"{server.openai_base_url}/chat/completions",
+        json={"model": "m", "stream": True, "messages": [{"role": "user", "content": "ciao a tutti"}]},
+        stream=True
+    )
+    events = [line[len("data: "):] for line in response.iter_lines(decode_unicode=True) if line]
+
+    assert events[-1] == "[DONE]"
+    chunks = [json.loads(event) for event in events[:-1]]
+    assert ''.join(c['choices'][0]['delta'].get('content', '') for c in chunks) == "Ciao a tutti."
+    assert chunks[-1]['usage']['completion_tokens'] == 3
+
+
+def test_ollama_streaming(server):
+    """NDJSON stream ending with a done message carrying eval counts"""
+    response = requests.post(
+        f"{server.ollama_url}/api/chat",
+        json={"model": "m", "messages": [{"role": "user", "content": "ciao a tutti"}]},
+        stream=True
+    )
+    messages = [json.loads(line) for line in response.iter_lines() if line]
+
+    assert ''.join(m['message']['content'] for m in messages if not m['done']) == "Ciao a tutti."
+    assert messages[-1]['done'] and messages[-1]['eval_count'] == 3
@@ -1,6 +1,7 @@
 import pytest
-from src.providers.transcription import GroqWhisperProvider, OpenAIWhisperProvider
-from src.providers.llm import OllamaProvider, OpenAILLMProvider
+from src.providers.transcription import GroqWhisperProvider, OpenAIWhisperProvider, OpenAICompatibleWhisperProvider
+from src.providers.llm import OllamaProvider, OpenAILLMProvider, GroqLLMProvider, OpenAICompatibleLLMProvider
+from src.providers.http_client import HTTPClient, ProviderError
 
 
 def test_groq_whisper_init():
@@ -31,6 +32,40 @@ def test_openai_llm_init():
     assert provider.model == "gpt-4o-mini"
 
 
+def test_openai_compatible_init():
+    """Test generic OpenAI-compatible providers for local servers"""
+    llm = OpenAICompatibleLLMProvider(model="qwen2.5-1.5b", base_url="http://localhost:8080/v1/")
+    assert llm.client.url("/chat/completions") == "http://localhost:8080/v1/chat/completions"
+    assert "Authorization" not in llm.client.headers
+
+    whisper = OpenAICompatibleWhisperProvider(base_url="http://localhost:8080/v1", model="base.en", timeout=30)
+    assert whisper.model == "base.en"
+    assert whisper.client.timeout[1] == 30
+
+    with pytest.raises(ValueError):
+        OpenAICompatibleLLMProvider(model="qwen2.5-1.5b")
+
+
+def test_providers_share_pooled_session():
+    """Test that providers talking to the same host reuse one connection pool"""
+    whisper = GroqWhisperProvider(api_key="test_key")
+    llm = GroqLLMProvider(api_key="test_key")
+    assert whisper.client.session is llm.client.session
+    assert llm.client.headers["Authorization"] == "Bearer test_key"
+    assert llm.model == "llama-3.1-8b-instant"
+
+
+def test_connection_error_mapping():
+    """Test that connection failures are mapped to provider errors"""
+    client = HTTPClient("http://127.0.0.1:9", "Local", timeout=1)
+    with pytest.raises(ProviderError, match="Cannot connect to Local"):
+        client.post_json("/chat/completions", {})
+
+    provider = OllamaProvider(model="llama3.2:3b", ollama_url="http://127.0.0.1:9")
+    with pytest.raises(ProviderError, match="is it running"):
+        provider.process("ciao")
+
+
 def test_llm_system_prompt():
     """Test that all LLM providers have the same system prompt"""
     from src.providers.llm import LLMProvider
@@ -0,0 +1,80 @@
+"""Test the punctuation model's label application"""
+import pytest
+
+from src.providers.llm import punct
+from src.providers.llm.punct import apply_labels, strip_punctuation
+
+
+def test_strip_punctuation():
+    assert strip_punctuation("ciao,") == "ciao"
+    assert strip_punctuation("«dice»") == "dice"
+    assert strip_punctuation("l'altro.") == "l'altro"
+    assert strip_punctuation("3.5") == "3.5"
+
+
+def test_apply_labels_punctuates_and_capitalizes():
+    words = "ciao come stai io bene".split()
+    labels = [',', '0', '?', '0', '.']
+
+    assert apply_labels(words, labels) == "Ciao, come stai? Io bene."
+
+
+def test_apply_labels_replaces_transcription_punctuation():
+    """Sentence breaks the model removes no longer force a capital"""
+    words = "Penso di sì. Però domani vediamo".split()
+    labels = ['0', '0', ',', '0', '0', '.']
+
+    assert apply_labels(words, labels) == "Penso di sì, però domani vediamo."
+
+
+def test_apply_labels_keeps_names_and_acronyms():
+    words = "ho sentito Marco della NASA".split()
+    labels = ['0', '0', '0', '0', '0']
+
+    assert apply_labels(words, labels) == "Ho sentito Marco della NASA."
+
+
+def test_apply_labels_dash():
+    assert apply_labels(["uno", "due"], ['-', '.']) == "Uno - due."
+
+
+def test_provider_requires_onnxruntime(monkeypatch):
+    monkeypatch.setattr(punct, 'ONNX_AVAILABLE', False)
+    with pytest.raises(Exception, match="onnxruntime"):
+        punct.PunctuationProvider(model_path="models/punct")
+
+
+def test_missing_model_reports_path(tmp_path):
+    pytest.importorskip('onnxruntime')
+    pytest.importorskip('tokenizers')
+
+    provider = punct.PunctuationProvider(model_path=tmp_path)
+    assert provider.warm_up() is False
+    with pytest.raises(Exception, match="not found"):
+        provider.process("ciao come stai")
+
+
+def test_token_windows_respect_the_budget():
+    """Words are windowed by sub-tokens, not by word count"""
+    assert punct.token_windows([1, 1, 1], budget=10) == [(0, 3)]
+    assert punct.token_windows([4, 4, 4, 1], budget=8) == [(0, 2), (2, 4)]
+    assert punct.token_windows([3, 12, 2], budget=8) == [(0, 1), (1, 2), (2, 3)]  # Oversized word alone
+    assert punct.token_windows([], budget=8) == []
+
+
+def test_long_italian_text_fits_the_model_input():
+    counts = [3] * 400  # Long, subword-heavy words
+    windows = punct.token_windows(counts, budget=510)
+
+    assert all(sum(counts[start:end]) <= 510 for start, end in windows)
+    assert [end for _, end in windows][-1] == 400
+
+
+def test_relative_model_path_is_resolved_against_app_dir(monkeypatch, tmp_path):
+    monkeypatch.setattr(punct, 'ONNX_AVAILABLE', True)
+
+    relative = punct.PunctuationProvider(model_path="models/punct")
+    absolute = punct.PunctuationProvider(model_path=tmp_path)
+
+    assert relative.model_path == punct.app_dir() / "models" / "punct"
+    assert absolute.model_path == tmp_path
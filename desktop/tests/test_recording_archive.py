@@ -0,0 +1,96 @@
+"""Test the background recording archive"""
+import gzip
+import os
+import threading
+import time
+
+from src.core.recording_archive import RecordingArchive
+
+WAV = b'RIFF' + b'\x00' * 4000
+
+
+def names(archive):
+    return [os.path.basename(path) for path, _, _ in archive.entries()]
+
+
+def test_takes_are_written_compressed(tmp_path):
+    archive = RecordingArchive(str(tmp_path), max_files=5)
+    saved_path = archive.save(WAV)
+    assert archive.flush(5)
+
+    [(path, size, _)] = archive.entries()
+    assert path == saved_path
+    assert path.endswith('.wav.gz')
+    assert size < len(WAV)
+    assert RecordingArchive.load(path) == WAV
+    with gzip.open(path) as f:
+        assert f.read() == WAV
+    archive.close()
+
+
+def test_uncompressed(tmp_path):
+    archive = RecordingArchive(str(tmp_path), compress=False)
+    archive.save(WAV)
+    archive.flush(5)
+
+    [(path, size, _)] = archive.entries()
+    assert path.endswith('.wav') and size == len(WAV)
+    archive.close()
+
+
+def test_retention_by_count(tmp_path):
+    archive = RecordingArchive(str(tmp_path), max_files=3)
+    for _ in range(5):
+        archive.save(WAV)
+        archive.flush(5)
+
+    assert len(archive.entries()) == 3
+    assert sorted(os.listdir(tmp_path)) == sorted(names(archive))
+    archive.close()
+
+
+def test_retention_by_size(tmp_path):
+    archive = RecordingArchive(str(tmp_path), max_files=0, max_bytes=2500, compress=False)
+    for _ in range(3):
+        archive.save(WAV[:1000])
+        archive.flush(5)
+
+    assert [size for _, size, _ in archive.entries()] == [1000, 1000]
+    archive.close()
+
+
+def test_existing_takes_are_indexed_and_aged_out(tmp_path):
+    old = tmp_path / 'recording_20200101_000000_000000.wav'
+    recent = tmp_path / 'recording_20990101_000000_000000.wav'
+    other = tmp_path / 'notes.txt'
+    for path in (old, recent, other):
+        path.write_bytes(WAV)
+    os.utime(old, (time.time() - 30 * 86400,) * 2)
+
+    archive = RecordingArchive(str(tmp_path), max_age_days=7)
+    archive.flush(5)
+
+    assert names(archive) == [recent.name]
+    assert not old.exists()
+    assert other.exists()
+    archive.close()
+
+
+def test_save_never_blocks_when_writer_is_behind(tmp_path, monkeypatch):
+    release = threading.Event()
+    archive = RecordingArchive(str(tmp_path), queue_size=1)
+    original_write = archive._write
+    monkeypatch.setattr(archive, '_write', lambda *args: (release.wait(5), original_write(*args)))
+
+    archive.save(WAV)  # Taken by the writer, which blocks
+    time.sleep(0.1)
+    archive.save(WAV)  # Fills the queue
+
+    start = time.perf_counter()
+    assert archive.save(WAV) is None
+    assert time.perf_counter() - start < 0.1
+
+    release.set()
+    archive.flush(5)
+    assert len(archive.entries()) == 2
+    archive.close()
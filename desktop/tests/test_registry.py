@@ -0,0 +1,96 @@
+"""Test the lazy provider registry"""
+import copy
+import subprocess
+import sys
+
+import pytest
+
+from src.providers.llm import GroqLLMProvider, OllamaProvider
+from src.providers.registry import ProviderRegistry
+
+
+CONFIG = {
+    'transcription': {'provider': 'groq', 'api_key_encrypted': 'enc-trans', 'options': {'language': 'it'}},
+    'llm': {'provider': 'groq', 'api_key_encrypted': 'enc-llm', 'model': 'llama-3.1-8b-instant', 'chunk_words': 120},
+}
+
+
+class CountingDecrypt:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, encrypted):
+        self.calls.append(encrypted)
+        return encrypted.replace('enc-', 'key-')
+
+
+def test_providers_are_built_with_decrypted_keys():
+    registry = ProviderRegistry(decrypt=CountingDecrypt())
+
+    llm = registry.llm_provider(CONFIG)
+    assert isinstance(llm, GroqLLMProvider)
+    assert llm.api_key == 'key-llm'
+    assert llm.config['language'] == 'it'
+    assert registry.transcription_provider(CONFIG).api_key == 'key-trans'
+
+
+def test_unchanged_slice_reuses_instances():
+    decrypt = CountingDecrypt()
+    registry = ProviderRegistry(decrypt=decrypt)
+    transcription = registry.transcription_provider(CONFIG)
+    llm = registry.llm_provider(CONFIG)
+
+    # Runtime-only settings don't rebuild the provider
+    config = copy.deepcopy(CONFIG)
+    config['llm']['chunk_words'] = 60
+    config['behavior'] = {'auto_paste': False}
+
+    assert registry.transcription_provider(config) is transcription
+    assert registry.llm_provider(config) is llm
+    assert decrypt.calls == ['enc-trans', 'enc-llm']
+
+
+def test_only_changed_provider_is_rebuilt():
+    registry = ProviderRegistry(decrypt=CountingDecrypt())
+    transcription = registry.transcription_provider(CONFIG)
+    llm = registry.llm_provider(CONFIG)
+
+    config = copy.deepcopy(CONFIG)
+    config['llm'] = {'provider': 'ollama', 'model': 'llama3.2:3b'}
+
+    assert registry.transcription_provider(config) is transcription
+    new_llm = registry.llm_provider(config)
+    assert new_llm is not llm
+    assert isinstance(new_llm, OllamaProvider)
+
+
+def test_decrypted_keys_are_reused_across_rebuilds():
+    decrypt = CountingDecrypt()
+    registry = ProviderRegistry(decrypt=decrypt)
+    registry.llm_provider(CONFIG)
+
+    config = copy.deepcopy(CONFIG)
+    config['llm']['temperature'] = 0.1
+    registry.llm_provider(config)
+
+    assert decrypt.calls == ['enc-llm']
+
+
+def test_unknown_provider():
+    registry = ProviderRegistry(decrypt=CountingDecrypt())
+    with pytest.raises(ValueError, match="Unknown llm provider: nope"):
+        registry.llm_provider({'llm': {'provider': 'nope'}})
+
+
+def test_unused_provider_modules_are_not_imported():
+    code = (
+        "import sys\n"
+        "from src.providers.registry import ProviderRegistry\n"
+        "registry = ProviderRegistry(decrypt=lambda key: key)\n"
+        "registry.llm_provider({'llm': {'provider': 'groq', 'api_key_encrypted': 'k'}})\n"
+        "loaded = [m for m in ('src.providers.llm.ollama', 'src.providers.llm.punct',\n"
+        "                      'src.providers.transcription.deepgram') if m in sys.modules]\n"
+        "print('loaded:' + ','.join(loaded))\n"
+    )
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip().splitlines()[-1] == 'loaded:'
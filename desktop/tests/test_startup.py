@@ -0,0 +1,21 @@
+"""Guard against heavy imports creeping back into startup"""
+import pytest
+
+from benchmarks.bench_startup import HEAVY_MODULES, import_profile, imported_modules
+
+
+def test_main_import_defers_heavy_modules():
+    pytest.importorskip('pystray')
+    pytest.importorskip('keyboard')
+
+    loaded = imported_modules(import_profile('src.main'))
+    assert sorted(m for m in HEAVY_MODULES if m in loaded) == []
+
+
+def test_text_processor_defers_unused_providers():
+    """Loading the pipeline doesn't import provider modules nobody selected"""
+    loaded = imported_modules(import_profile('src.core.text_processor'))
+
+    assert 'src.providers.llm.punct' not in loaded
+    assert 'src.providers.llm.ollama' not in loaded
+    assert 'numpy' not in loaded
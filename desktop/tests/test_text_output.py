@@ -0,0 +1,148 @@
+"""Test the text injection engine with a fake clipboard and keyboard"""
+import threading
+import time
+
+import pytest
+
+from src.core.text_output import TextOutput
+
+
+class FakeClipboard:
+    """Clipboard whose writes become visible after `delay` seconds, like async X11 backends"""
+
+    def __init__(self, text=None, delay=0.0):
+        self.text = text
+        self.delay = delay
+        self.sequence = 0
+        self.lock = threading.Lock()
+
+    def get_text(self):
+        return self.text
+
+    def set_text(self, text):
+        def apply():
+            with self.lock:
+                self.text = text
+                self.sequence += 1
+        if self.delay:
+            threading.Timer(self.delay, apply).start()
+        else:
+            apply()
+
+    def sequence_number(self):
+        return self.sequence
+
+
+class FakeKeyboard:
+    def __init__(self, clipboard=None, fail_send=False, fail_write_at=None):
+        self.clipboard = clipboard
+        self.fail_send = fail_send
+        self.fail_write_at = fail_write_at
+        self.sent = []
+        self.written = []
+        self.pasted = []
+
+    def send(self, hotkey):
+        if self.fail_send:
+            raise OSError("no keyboard hook")
+        self.sent.append(hotkey)
+        self.pasted.append(self.clipboard.get_text())
+
+    def write(self, text):
+        if len(''.join(self.written)) == self.fail_write_at:
+            raise OSError("cannot type character")
+        self.written.append(text)
+
+
+def make_output(clipboard, keyboard, **kwargs):
+    options = dict(restore_delay=0.05)
+    options.update(kwargs)
+    return TextOutput(clipboard=clipboard, keyboard_backend=keyboard, **options)
+
+
+def test_short_text_is_typed():
+    clipboard = FakeClipboard("previous")
+    keyboard = FakeKeyboard(clipboard)
+
+    assert make_output(clipboard, keyboard).output("Sì.") == 'typed'
+    assert ''.join(keyboard.written) == "Sì."
+    assert clipboard.text == "previous"
+
+
+def test_long_text_is_pasted_once_clipboard_is_ready():
+    """Paste waits for the clipboard to serve the new text instead of a fixed sleep"""
+    clipboard = FakeClipboard("previous", delay=0.03)
+    keyboard = FakeKeyboard(clipboard)
+    text = "Penso che dovremmo provare il nuovo approccio."
+
+    start = time.perf_counter()
+    assert make_output(clipboard, keyboard).output(text) == 'pasted'
+    elapsed = time.perf_counter() - start
+
+    assert keyboard.sent == ['ctrl+v']
+    assert keyboard.pasted == [text]
+    assert elapsed < 0.1
+
+
+def test_previous_clipboard_is_restored():
+    clipboard = FakeClipboard("previous")
+    keyboard = FakeKeyboard(clipboard)
+
+    make_output(clipboard, keyboard).output("Un testo abbastanza lungo da incollare.")
+    time.sleep(0.15)
+
+    assert clipboard.text == "previous"
+
+
+def test_restore_skipped_if_user_copied_something():
+    clipboard = FakeClipboard("previous")
+    keyboard = FakeKeyboard(clipboard)
+
+    make_output(clipboard, keyboard).output("Un testo abbastanza lungo da incollare.")
+    clipboard.set_text("copied by the user")
+    time.sleep(0.15)
+
+    assert clipboard.text == "copied by the user"
+
+
+def test_back_to_back_takes_restore_original_clipboard():
+    clipboard = FakeClipboard("previous")
+    keyboard = FakeKeyboard(clipboard)
+    output = make_output(clipboard, keyboard)
+
+    output.output("Prima dettatura abbastanza lunga.")
+    output.output("Seconda dettatura abbastanza lunga.")
+    time.sleep(0.15)
+
+    assert keyboard.pasted == ["Prima dettatura abbastanza lunga.", "Seconda dettatura abbastanza lunga."]
+    assert clipboard.text == "previous"
+
+
+def test_copy_only_when_auto_paste_disabled():
+    clipboard = FakeClipboard("previous")
+    keyboard = FakeKeyboard(clipboard)
+
+    assert make_output(clipboard, keyboard, auto_paste=False).output("Ok.") == 'copied'
+    time.sleep(0.1)
+
+    assert keyboard.sent == [] and keyboard.written == []
+    assert clipboard.text == "Ok."
+
+
+def test_typing_failure_pastes_only_the_rest():
+    """Text typed before a failure is not pasted again"""
+    clipboard = FakeClipboard()
+    keyboard = FakeKeyboard(clipboard, fail_write_at=3)
+
+    assert make_output(clipboard, keyboard, restore_clipboard=False).output("Sì, va bene.") == 'pasted'
+    assert ''.join(keyboard.written) == "Sì,"
+    assert keyboard.pasted == [" va bene."]
+
+
+def test_paste_failure_is_reported():
+    clipboard = FakeClipboard()
+    keyboard = FakeKeyboard(clipboard, fail_send=True)
+
+    with pytest.raises(Exception, match="Paste failed.*in the clipboard"):
+        make_output(clipboard, keyboard).output("Un testo abbastanza lungo da incollare.")
+    assert clipboard.text == "Un testo abbastanza lungo da incollare."
@@ -0,0 +1,104 @@
+import threading
+import time
+
+from src.core.chunking import chunk_text
+from src.core.text_processor import TextProcessor
+from src.providers.llm import LLMProvider
+
+
+class SlowLLMProvider(LLMProvider):
+    """Fake LLM that uppercases text after a delay and records budgets and concurrency"""
+
+    def __init__(self, delay: float = 0.2, **kwargs):
+        super().__init__(**kwargs)
+        self.delay = delay
+        self.budgets = []
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def process(self, text: str, max_tokens: int = None) -> str:
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            self.budgets.append(max_tokens or self.output_budget(text))
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+        return text.upper()
+
+
+def make_processor(**llm_options) -> TextProcessor:
+    config = {
+        'transcription': {'provider': 'groq', 'options': {'language': 'auto'}},
+        'llm': dict({'provider': 'groq', 'model': 'llama-3.1-8b-instant'}, **llm_options),
+    }
+    return TextProcessor(config)
+
+
+def test_chunk_text_sentence_boundaries():
+    """Test that chunks end at sentence boundaries and respect the word limit"""
+    text = "Uno due tre. Quattro cinque sei. Sette otto nove dieci. Undici."
+    assert chunk_text(text, 0) == [text]
+    assert chunk_text(text, 100) == [text]
+    assert chunk_text(text, 7) == ["Uno due tre. Quattro cinque sei.", "Sette otto nove dieci. Undici."]
+
+
+def test_chunk_text_long_sentence():
+    """Test that an unpunctuated run is split by word count"""
+    words = [f"w{i}" for i in range(25)]
+    chunks = chunk_text(' '.join(words), 10)
+    assert [len(chunk.split()) for chunk in chunks] == [10, 10, 5]
+    assert ' '.join(chunks) == ' '.join(words)
+
+
+def test_format_text_concurrent_chunks():
+    """Test that long transcripts are formatted concurrently and reassembled in order"""
+    processor = make_processor(chunk_words=5, max_concurrency=3)
+    provider = SlowLLMProvider(delay=0.2, max_tokens=500)
+    processor.llm_provider = provider
+
+    sentences = [f"frase numero {i} del testo." for i in range(6)]
+    start = time.time()
+    result = processor.format_text(' '.join(sentences))
+    elapsed = time.time() - start
+
+    assert result == ' '.join(sentences).upper()
+    assert provider.max_active == 3
+    assert elapsed < 6 * 0.2
+    # Budgets follow the chunk length, not the configured max_tokens
+    assert all(budget < 500 for budget in provider.budgets)
+
+
+def test_format_text_short_transcript():
+    """Test that short transcripts are sent as a single request"""
+    processor = make_processor()
+    provider = SlowLLMProvider(delay=0)
+    processor.llm_provider = provider
+
+    assert processor.format_text("ciao a tutti") == "CIAO A TUTTI"
+    assert len(provider.budgets) == 1
+
+
+def test_llm_pool_is_shared_and_resized_safely():
+    """Test that concurrent takes get one pool and a resize leaves the old one usable"""
+    processor = make_processor()
+    barrier = threading.Barrier(8)
+    pools = []
+
+    def get_pool():
+        barrier.wait()
+        pools.append(processor._get_llm_pool(3))
+
+    threads = [threading.Thread(target=get_pool) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len({id(pool) for pool in pools}) == 1
+
+    old_pool = pools[0]
+    new_pool = processor._get_llm_pool(2)
+    assert new_pool is not old_pool
+    # A take that fetched the old pool before the resize can still submit to it
+    assert old_pool.submit(lambda: 'ok').result(timeout=2) == 'ok'
@@ -0,0 +1,104 @@
+"""Test per-stage latency tracing"""
+import threading
+
+import pytest
+
+from src.core.tracing import Trace, TraceLog, load_traces, percentile, span, summarize, use_trace
+from src.providers.llm import GroqLLMProvider
+from src.providers.transcription import GroqWhisperProvider
+from tests.mock_server import MockServer
+
+
+def test_span_without_trace_is_noop():
+    with span('transcription'):
+        pass
+
+
+def test_spans_go_to_active_trace():
+    trace = Trace(llm_provider='groq')
+    with use_trace(trace):
+        with span('transcription'):
+            pass
+        with pytest.raises(ValueError):
+            with span('llm'):
+                raise ValueError("boom")
+
+    names = [record['name'] for record in trace.spans]
+    assert names == ['transcription', 'llm']
+    assert trace.spans[1]['attrs']['error'] == 'ValueError'
+
+
+def test_traces_are_isolated_per_thread():
+    """Concurrent takes each record into their own trace"""
+    traces = [Trace(), Trace()]
+
+    def run(trace, name):
+        with use_trace(trace):
+            with span(name):
+                pass
+
+    threads = [threading.Thread(target=run, args=(trace, f"stage{i}")) for i, trace in enumerate(traces)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert [r['name'] for r in traces[0].spans] == ['stage0']
+    assert [r['name'] for r in traces[1].spans] == ['stage1']
+
+
+def test_percentile():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == pytest.approx(50.5)
+    assert percentile(values, 99) == pytest.approx(99.01)
+    assert percentile([7], 95) == 7
+
+
+def test_summarize_groups_by_provider():
+    traces = [
+        {'attrs': {'transcription_provider': 'groq', 'llm_provider': 'ollama'}, 'total_ms': 1000,
+         'spans': [{'name': 'llm', 'duration_ms': 300}, {'name': 'llm', 'duration_ms': 200}]},
+        {'attrs': {'transcription_provider': 'groq', 'llm_provider': 'groq'}, 'total_ms': 400,
+         'spans': [{'name': 'llm', 'duration_ms': 100}]},
+    ]
+
+    summary = summarize(traces)
+    assert summary['groq+ollama']['llm']['p50'] == 500  # Chunks of one take are summed
+    assert summary['groq+groq']['total']['count'] == 1
+    assert set(summarize(traces, by='llm_provider')) == {'ollama', 'groq'}
+
+
+def test_trace_log_rotates_and_loads_in_order(tmp_path):
+    path = tmp_path / 'traces.jsonl'
+    log = TraceLog(path, max_bytes=400, backup_count=10)
+    ids = []
+    for _ in range(10):
+        trace = Trace(llm_provider='groq')
+        trace.add_span('llm', trace.start, trace.start + 0.1)
+        log.write(trace)
+        ids.append(trace.id)
+    log.close()
+
+    assert (tmp_path / 'traces.jsonl.1').exists()
+    assert [trace['id'] for trace in load_traces(path)] == ids
+
+
+def test_http_spans_measure_upload_and_first_byte():
+    with MockServer(latency={'transcription': 0.2}) as server:
+        whisper = GroqWhisperProvider(api_key="test_key", base_url=server.groq_base_url)
+        llm = GroqLLMProvider(api_key="test_key", base_url=server.groq_base_url)
+
+        trace = Trace()
+        with use_trace(trace):
+            assert whisper.transcribe(b"RIFF" + b"\x00" * 4096, language="it") == "this is a test"
+            llm.process("ciao a tutti")
+
+        # The instrumented multipart body still carries the form fields
+        assert server.requests_to('transcription')[0]['fields']['language'] == b'it'
+
+    spans = {(r['name'], r['attrs']['path']): r for r in trace.spans}
+    upload = spans[('upload', '/audio/transcriptions')]
+    assert upload['attrs']['bytes'] > 4096
+    assert spans[('ttfb', '/audio/transcriptions')]['duration_ms'] >= 200
+    assert spans[('ttfb', '/chat/completions')]['duration_ms'] < 200
+    assert ('upload', '/chat/completions') not in spans  # JSON bodies are not wrapped
@@ -0,0 +1,89 @@
+"""Test the personal vocabulary stage"""
+from src.core.text_processor import TextProcessor
+from src.core.vocabulary import Vocabulary
+from src.providers.registry import transcription_options
+from src.providers.transcription import DeepgramProvider, GroqWhisperProvider
+from tests.mock_server import MockServer
+
+VOCABULARY = Vocabulary(
+    terms=["Playwright", "MailerLite", "GitHub Actions"],
+    replacements={"play right": "Playwright", "mailer light": "MailerLite", "git hub": "GitHub"}
+)
+
+
+def test_terms_get_canonical_spelling():
+    assert VOCABULARY.apply("i test con playwright su github actions") == \
+        "i test con Playwright su GitHub Actions"
+    assert VOCABULARY.apply("MAILERLITE, mailerlite.") == "MailerLite, MailerLite."
+
+
+def test_replacements_of_misheard_phrases():
+    assert VOCABULARY.apply("usiamo play right e mailer light") == "usiamo Playwright e MailerLite"
+    assert VOCABULARY.apply("play-right") == "Playwright"
+
+
+def test_longest_match_wins():
+    vocabulary = Vocabulary(replacements={"git hub": "GitHub", "git hub actions": "GitHub Actions", "git": "Git"})
+
+    assert vocabulary.apply("git hub actions e git hub e git") == "GitHub Actions e GitHub e Git"
+
+
+def test_no_match_across_punctuation_or_inside_words():
+    assert VOCABULARY.apply("play. Right now") == "play. Right now"
+    assert VOCABULARY.apply("playwrights") == "playwrights"
+    assert VOCABULARY.apply("display right") == "display right"
+
+
+def test_empty_vocabulary_is_a_no_op():
+    assert not Vocabulary()
+    assert Vocabulary().apply("play right") == "play right"
+
+
+def test_hint_terms_are_deduplicated():
+    assert VOCABULARY.hint_terms() == ["Playwright", "MailerLite", "GitHub Actions", "GitHub"]
+
+
+def test_registry_passes_terms_to_transcription():
+    config = {'transcription': {'provider': 'groq'}, 'vocabulary': {'terms': ["Playwright"]}}
+    assert transcription_options(config)[1]['vocabulary'] == ["Playwright"]
+
+    config['vocabulary']['prompt_hint'] = False
+    assert 'vocabulary' not in transcription_options(config)[1]
+    assert 'vocabulary' not in transcription_options({'transcription': {'provider': 'groq'}})[1]
+
+
+def test_whisper_prompt_and_deepgram_keywords():
+    with MockServer() as server:
+        GroqWhisperProvider(api_key='k', base_url=server.groq_base_url,
+                            vocabulary=["Playwright", "MailerLite"]).transcribe(b'RIFF')
+        DeepgramProvider(api_key='k', base_url=server.deepgram_base_url,
+                         vocabulary=["Playwright"]).transcribe(b'RIFF')
+
+    [whisper] = server.requests_to('transcription')
+    assert whisper['fields']['prompt'] == b"Playwright, MailerLite"
+    [listen] = server.requests_to('listen')
+    assert listen['params']['keywords'] == "Playwright:2"
+
+
+def test_whisper_prompt_is_capped():
+    provider = GroqWhisperProvider(api_key='k', vocabulary=[f"Term{n:04d}" for n in range(500)])
+    prompt = provider.vocabulary_prompt()
+
+    assert len(prompt) <= provider.PROMPT_MAX_CHARS
+    assert prompt.startswith("Term0000, Term0001")
+
+
+def test_vocabulary_runs_before_the_llm():
+    class EchoLLM:
+        def process(self, text):
+            self.received = text
+            return text
+
+    processor = TextProcessor.__new__(TextProcessor)
+    processor.config = {}
+    processor.llm_provider = EchoLLM()
+    processor.vocabulary = VOCABULARY
+    processor.language_id = None
+
+    assert processor.post_process("provo play right") == "provo Playwright"
+    assert processor.llm_provider.received == "provo Playwright"